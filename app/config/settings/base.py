@@ -44,6 +44,30 @@ AWS_S3_FILE_OVERWRITE = SECRETS['AWS_S3_FILE_OVERWRITE']
 AWS_STORAGE_BUCKET_NAME = SECRETS['AWS_STORAGE_BUCKET_NAME']
 DATABASES = SECRETS['DATABASES']
 
+# Read replica
+# DATABASES에서 'replica'로 시작하는 alias를 읽기 전용 replica로 사용 (없으면 모든 쿼리가 default에서 처리됨)
+# 로컬/테스트에서는 같은 DB를 가리키는 alias로 대체 가능
+#   'replica': {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica')]
+DATABASE_ROUTERS = ['utils.db.routers.PrimaryReplicaRouter']
+# 데이터를 변경한 user의 읽기를 primary로 고정하는 시간(초)
+# 여러 프로세스가 같은 값을 보도록 공유되는 CACHES를 사용해야 함
+DATABASE_REPLICA_PIN_SECONDS = 5
+
+# Study 상세 응답(StudyDetailSerializer)을 cache에 보관하는 시간(초), 0이면 사용하지 않음 (study.cache)
+# 여러 프로세스에서 무효화가 반영되도록 공유되는 CACHES를 사용해야 함
+STUDY_DETAIL_CACHE_TIMEOUT = 60 * 5
+
+# Token인증의 Token -> User 조회 결과를 보관하는 시간(초) (members.authentication.CachedTokenAuthentication)
+#   공유 cache(CACHES): Token/User의 변경시 무효화
+#   프로세스 메모리: 다른 프로세스의 무효화가 반영되지 않으므로 짧게 설정
+AUTH_TOKEN_CACHE_TIMEOUT = 60
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = 5
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 1024
+# Basic인증에서 확인된 인증정보를 기억하는 시간(초) (members.authentication.CachedBasicAuthentication)
+# 비밀번호가 변경되면 즉시 사용하지 않음
+AUTH_BASIC_CACHE_TIMEOUT = 60
+
 # django-dbbackup
 DBBACKUP_STORAGE = 'config.storages.DBStorage'
 DBBACKUP_STORAGE_OPTIONS = {
@@ -82,21 +106,23 @@ DEFAULT_USERS = {
 # DRF
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.BasicAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'members.authentication.CachedBasicAuthentication',
+        'members.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
+        'utils.drf.renderers.CamelCaseORJSONRenderer',
         'utils.drf.renderers.BrowsableAPIRendererWithoutForms',
     ),
     'DEFAULT_PARSER_CLASSES': (
-        'djangorestframework_camel_case.parser.CamelCaseFormParser',
-        'djangorestframework_camel_case.parser.CamelCaseMultiPartParser',
-        'djangorestframework_camel_case.parser.CamelCaseJSONParser',
+        'utils.drf.renderers.CamelCaseFormParser',
+        'utils.drf.renderers.CamelCaseMultiPartParser',
+        'utils.drf.renderers.CamelCaseORJSONParser',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'utils.drf.pagination.CursorPagination',
+    'PAGE_SIZE': 20,
     'JSON_UNDERSCOREIZE': {
         'no_underscore_before_number': True,
     },
@@ -184,6 +210,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.db.middleware.PrimaryPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -26,6 +26,7 @@ from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
 from members.urls import members_patterns, auth_patterns
+from utils.drf.batch import BatchAPIView
 from . import views
 
 admin.site.site_title = 'StudyWatson'
@@ -72,6 +73,7 @@ urlpatterns_apis_v1 = [
     path('auth/', include(auth_patterns)),
     path('members/', include(members_patterns)),
     path('study/', include('study.urls')),
+    path('batch/', BatchAPIView.as_view(), name='batch'),
 ]
 urlpatterns_apis = [
     path('v1/', include(urlpatterns_apis_v1)),
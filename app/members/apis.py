@@ -5,6 +5,8 @@ from rest_auth.views import LoginView
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 
+from utils.drf.replica import ReplicaReadMixin
+from utils.drf.sparse import SparseFieldsMixin
 from .models import User
 from .permissions import IsUserSelf, IsUserSelfOrReadOnly
 from .serializers import (
@@ -95,7 +97,7 @@ class UserCreateAPIView(generics.CreateAPIView):
         operation_description='사용자 삭제(탈퇴)',
     ),
 )
-class UserRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class UserRetrieveUpdateDestroyAPIView(ReplicaReadMixin, SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     permission_classes = (IsUserSelfOrReadOnly,)
 
@@ -116,7 +118,7 @@ class UserRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         operation_description='사용자 프로필 (Token인증시 자신의 정보)'
     )
 )
-class UserProfileAPIView(generics.RetrieveAPIView):
+class UserProfileAPIView(ReplicaReadMixin, SparseFieldsMixin, generics.RetrieveAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated,)
@@ -0,0 +1,123 @@
+import pickle
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
+
+from utils.cache import LocalCache
+
+__all__ = (
+    'CachedBasicAuthentication',
+    'CachedTokenAuthentication',
+    'invalidate_tokens',
+)
+
+User = get_user_model()
+
+TOKEN_CACHE_KEY = 'auth:token:{key}'
+BASIC_CACHE_KEY = 'auth:basic:{digest}'
+
+# 프로세스별 Token(key) -> 직렬화된 Token(User 포함)
+token_local_cache = LocalCache(
+    settings.AUTH_TOKEN_LOCAL_CACHE_SIZE, timeout=lambda: settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT)
+
+
+def invalidate_tokens(*keys):
+    """
+    Token(key)들의 cache를 삭제 (transaction 내에서는 commit된 후에도 한 번 더 삭제)
+    다른 프로세스의 LocalCache에는 최대 AUTH_TOKEN_LOCAL_CACHE_TIMEOUT동안 남아있음
+    """
+    if not keys:
+        return
+
+    def invalidate():
+        cache.delete_many([TOKEN_CACHE_KEY.format(key=key) for key in keys])
+        for key in keys:
+            token_local_cache.delete(key)
+
+    invalidate()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(invalidate)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication의 Token -> User 조회 결과를
+    프로세스 메모리(LocalCache) -> 공유 cache(CACHES) -> DB 순서로 찾아 인증된 요청마다의 쿼리를 생략
+    Token의 변경/삭제, User의 변경/삭제시 무효화 (members.signals)
+
+    조회 결과별 횟수는 stats에 기록 (local: 프로세스 메모리, shared: 공유 cache, miss: DB)
+    """
+    stats = Counter()
+    _stats_lock = threading.Lock()
+
+    def authenticate_credentials(self, key):
+        token = self.get_token(key)
+        if not token.user.is_active or token.user.is_deleted:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+    def get_token(self, key):
+        # 요청마다 새 객체를 사용하도록 직렬화된 값을 저장
+        data = token_local_cache.get(key)
+        source = 'local'
+        if data is None:
+            cache_key = TOKEN_CACHE_KEY.format(key=key)
+            data = cache.get(cache_key)
+            source = 'shared'
+            if data is None:
+                source = 'miss'
+                model = self.get_model()
+                try:
+                    token = model.objects.select_related('user').get(key=key)
+                except model.DoesNotExist:
+                    self.count(source)
+                    raise exceptions.AuthenticationFailed(_('Invalid token.'))
+                data = pickle.dumps(token, pickle.HIGHEST_PROTOCOL)
+                cache.set(cache_key, data, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+            token_local_cache.set(key, data)
+        self.count(source)
+        return pickle.loads(data)
+
+    @classmethod
+    def count(cls, source):
+        with cls._stats_lock:
+            cls.stats[source] += 1
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    BasicAuthentication에서 확인된 인증정보를 AUTH_BASIC_CACHE_TIMEOUT동안 기억해
+    같은 인증정보를 사용하는 요청마다 비밀번호 hash(PBKDF2)를 다시 계산하지 않음
+
+    cache에는 SECRET_KEY를 사용한 HMAC만 저장 (key: 인증정보, 값: User의 pk와 인증 당시의 password hash)
+    비밀번호가 변경되면 password hash가 달라지므로 즉시 사용하지 않으며, 실패한 인증정보는 저장하지 않음
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        cache_key = BASIC_CACHE_KEY.format(digest=self.get_digest(userid, password))
+        user = self.get_cached_user(cache.get(cache_key))
+        if user is None:
+            user, auth = super().authenticate_credentials(userid, password, request)
+            cache.set(cache_key, (user.pk, self.get_digest(user.password)), settings.AUTH_BASIC_CACHE_TIMEOUT)
+        return (user, None)
+
+    def get_digest(self, *values):
+        return salted_hmac(self.__class__.__qualname__, ':'.join(values)).hexdigest()
+
+    def get_cached_user(self, value):
+        if value is None:
+            return None
+        user_pk, password_digest = value
+        # ModelBackend와 같이 삭제된(DeleteModelManager) User, 비활성화된 User는 제외
+        user = User._default_manager.filter(pk=user_pk, is_active=True).first()
+        if user is None or not constant_time_compare(self.get_digest(user.password), password_digest):
+            return None
+        return user
@@ -11,11 +11,12 @@ __all__ = (
 
 class SettingsBackend:
     def authenticate(self, request, username=None, password=None):
-        email_valid = username in settings.DEFAULT_USERS.keys()
-        user_dict = settings.DEFAULT_USERS.get(username, {})
+        # DEFAULT_USERS에 없는 username은 비밀번호 hash를 계산하지 않음
+        if username not in settings.DEFAULT_USERS:
+            return None
+        user_dict = settings.DEFAULT_USERS[username]
 
-        password_valid = check_password(password, user_dict.get('password', ''))
-        if email_valid and password_valid:
+        if check_password(password, user_dict.get('password', '')):
             try:
                 user = User.objects.get(email=username)
             except User.DoesNotExist:
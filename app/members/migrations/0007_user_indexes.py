@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0006_auto_20190825_1905'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(is_deleted=False), fields=['nickname'], name='user_active_nickname_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ import string
 from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.utils.crypto import get_random_string
 from django_extensions.db.models import TimeStampedModel
 from django_fields import DefaultStaticImageField
@@ -51,6 +52,10 @@ class User(AbstractUser, TimeStampedModel, DeleteModel):
     class Meta:
         verbose_name = '사용자'
         verbose_name_plural = f'{verbose_name} 목록'
+        indexes = [
+            # DeleteModelManager(is_deleted=False)를 사용하는 nickname 중복 체크 (UserAttributeAvailableAPIView)
+            models.Index(fields=['nickname'], name='user_active_nickname_idx', condition=Q(is_deleted=False)),
+        ]
 
     def save(self, *args, **kwargs):
         if self.type == self.TYPE_EMAIL and not self.is_deleted:
@@ -6,6 +6,13 @@ from rest_framework.authtoken.models import Token
 from .models import User
 
 
+def _phone_number_representation(phone_number):
+    try:
+        return phone_number.as_national
+    except AttributeError:
+        return str(phone_number)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -19,9 +26,15 @@ class UserSerializer(serializers.ModelSerializer):
             'email',
             'phone_number',
         )
+        # ValuesPlan, SerializerPlan에서 to_representation()과 같은 결과를 만들기 위해 사용
+        representations = {
+            'phone_number': _phone_number_representation,
+        }
 
     def to_representation(self, instance):
         ret = super().to_representation(instance)
+        if 'phone_number' not in ret:
+            return ret
         try:
             ret['phone_number'] = instance.phone_number.as_national
         except AttributeError:
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_tokens
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=Token)
+def token_changed(sender, instance, **kwargs):
+    invalidate_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw, update_fields, **kwargs):
+    # 로그인시의 last_login 갱신은 인증에 영향을 주지 않음
+    if created or raw or (update_fields and set(update_fields) == {'last_login'}):
+        return
+    # User.delete()(perform_delete)는 is_deleted를 저장하므로 여기서 처리됨
+    invalidate_tokens(*Token.objects.filter(user=instance).values_list('key', flat=True))
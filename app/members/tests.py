@@ -1,3 +1,124 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .authentication import CachedTokenAuthentication, token_local_cache
+from .backends import SettingsBackend
+from .models import User
+
+
+class UserIndexTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            User.objects.create_user(
+                email=f'user{index}@test.com', password='password', type=User.TYPE_EMAIL, nickname=f'닉네임{index}')
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def test_active_nickname(self):
+        plan = User.objects.filter(nickname='닉네임1').explain()
+        self.assertIn('user_active_nickname_idx', plan)
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='user@test.com', password='password', type=User.TYPE_EMAIL, nickname='닉네임')
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        token_local_cache.clear()
+        CachedTokenAuthentication.stats.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def get_profile(self, num_queries=None):
+        if num_queries is None:
+            return self.client.get('/api/v1/members/profile/')
+        with self.assertNumQueries(num_queries):
+            return self.client.get('/api/v1/members/profile/')
+
+    def test_cache(self):
+        self.assertEqual(self.get_profile(1).status_code, 200)
+        self.assertEqual(self.get_profile(0).data['nickname'], '닉네임')
+        token_local_cache.clear()
+        self.assertEqual(self.get_profile(0).status_code, 200)
+        self.assertEqual(CachedTokenAuthentication.stats, {'miss': 1, 'local': 1, 'shared': 1})
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        for _ in range(2):
+            self.assertEqual(self.get_profile(1).status_code, 401)
+
+    def test_update_user(self):
+        self.get_profile()
+        user = User.objects.get(pk=self.user.pk)
+        user.nickname = '새닉네임'
+        user.save()
+        self.assertEqual(self.get_profile(1).data['nickname'], '새닉네임')
+
+    def test_delete_user(self):
+        self.get_profile()
+        User.objects.get(pk=self.user.pk).delete()
+        self.assertEqual(self.get_profile().status_code, 401)
+
+    def test_delete_token(self):
+        self.get_profile()
+        Token.objects.get(key=self.token.key).delete()
+        self.assertEqual(self.get_profile().status_code, 401)
+
+
+class CachedBasicAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@test.com', password='password', type=User.TYPE_EMAIL)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_profile(self, password='password'):
+        credentials = base64.b64encode(f'user@test.com:{password}'.encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        return self.client.get('/api/v1/members/profile/')
+
+    def test_cache(self):
+        with mock.patch('rest_framework.authentication.authenticate', wraps=authenticate) as mock_authenticate:
+            for _ in range(2):
+                self.assertEqual(self.get_profile().status_code, 200)
+            self.assertEqual(mock_authenticate.call_count, 1)
+
+            # 실패한 인증정보는 저장하지 않음
+            for _ in range(2):
+                self.assertEqual(self.get_profile('invalid').status_code, 401)
+            self.assertEqual(mock_authenticate.call_count, 3)
+
+    def test_change_password(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('new-password')
+        user.save()
+        self.assertEqual(self.get_profile().status_code, 401)
+        self.assertEqual(self.get_profile('new-password').status_code, 200)
+
+    def test_delete_user(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        User.objects.get(pk=self.user.pk).delete()
+        self.assertEqual(self.get_profile().status_code, 401)
 
-# Create your tests here.
+    def test_settings_backend_skips_other_users(self):
+        with mock.patch('members.backends.check_password') as mock_check_password:
+            self.assertIsNone(SettingsBackend().authenticate(None, 'user@test.com', 'password'))
+        mock_check_password.assert_not_called()
@@ -7,6 +7,7 @@ from .models import (
     StudyMembership,
     Schedule,
     Attendance,
+    StudyMembershipStats,
 )
 
 
@@ -52,3 +53,10 @@ class AttendanceAdmin(admin.ModelAdmin):
     list_display = ('user', 'schedule', 'vote', 'att', 'pk')
     list_filter = ('schedule',)
     search_fields = ('user', 'schedule')
+
+
+@admin.register(StudyMembershipStats)
+class StudyMembershipStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'membership', 'attend_count', 'late_count', 'absent_count', 'unvoted_count', 'vote_match_rate', 'pk',
+    )
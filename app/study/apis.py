@@ -1,13 +1,27 @@
+from collections import defaultdict
+
+from django.db.models import F
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status, permissions
 from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
 
+from utils.db.routers import use_replica
 from utils.drf import errors
+from utils.drf.conditional import related_state, ConditionalGetMixin
 from utils.drf.exceptions import ValidationError
+from utils.drf.prefetch import QueryPlanMixin, plan_queryset
+from utils.drf.replica import ReplicaReadMixin
+from utils.drf.sparse import SparseFieldsMixin
+from utils.drf.streaming import STREAM_PARAMETER, StreamingListMixin
+from utils.drf.values import ValuesPlanMixin
+from .cache import study_detail_cache, get_study_detail_variant
 from .filters import (
     ScheduleFilter,
     StudyMembershipListFilter,
+    StudyMembershipStatsFilter,
     AttendanceFilter,
 )
 from .models import (
@@ -18,6 +32,7 @@ from .models import (
     Schedule,
     Attendance,
     StudyInviteToken,
+    StudyMembershipStats,
 )
 from .serializers import (
     StudyCategorySerializer,
@@ -28,8 +43,13 @@ from .serializers import (
     StudyUpdateSerializer,
     StudyMembershipSerializer,
     StudyMembershipCreateSerializer,
+    StudyMembershipBulkCreateSerializer,
+    StudyMembershipBulkCreateResultSerializer,
     StudyMembershipDetailSerializer,
     StudyMembershipUpdateSerializer,
+    StudyMembershipStatsSerializer,
+    DashboardMembershipSerializer,
+    DashboardSerializer,
     ScheduleSerializer,
     ScheduleCreateSerializer,
     ScheduleDetailSerializer,
@@ -38,11 +58,36 @@ from .serializers import (
     AttendanceCreateSerializer,
     AttendanceDetailSerializer,
     AttendanceUpdateSerializer,
+    AttendanceBulkUpdateSerializer,
     StudyInviteTokenCreateSerializer,
     StudyMembershipCreateByInviteTokenSerializer,
 )
 
 
+def _study_conditional_annotations(outer=''):
+    """
+    Study(StudySerializer)의 표현에 영향을 주는 값 (outer: 바깥 쿼리에서 Study까지의 lookup)
+    """
+    prefix = f'{outer}__' if outer else ''
+    return {
+        'study_modified': F(f'{prefix}modified'),
+        'study_author_modified': F(f'{prefix}author__modified'),
+        'study_category': F(f'{prefix}category__name'),
+        'study_icon': F(f'{prefix}icon__name'),
+        'study_icon_image': F(f'{prefix}icon__image'),
+    }
+
+
+def _self_attendance_state(request, link, outer='pk'):
+    """
+    Schedule.self_attendance (인증된 user의 Attendance)의 최대 modified와 개수
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return {}
+    return related_state('self_attendance', Attendance.objects.filter(user=user), link, outer)
+
+
 @method_decorator(
     name='get',
     decorator=swagger_auto_schema(
@@ -60,7 +105,7 @@ from .serializers import (
         }
     )
 )
-class StudyCategoryListCreateAPIView(generics.ListCreateAPIView):
+class StudyCategoryListCreateAPIView(ReplicaReadMixin, SparseFieldsMixin, generics.ListCreateAPIView):
     queryset = StudyCategory.objects.all()
     serializer_class = StudyCategorySerializer
 
@@ -72,7 +117,7 @@ class StudyCategoryListCreateAPIView(generics.ListCreateAPIView):
         operation_description='스터디 아이콘 목록'
     )
 )
-class StudyIconListAPIView(generics.ListAPIView):
+class StudyIconListAPIView(ReplicaReadMixin, SparseFieldsMixin, generics.ListAPIView):
     queryset = StudyIcon.objects.all()
     serializer_class = StudyIconSerializer
 
@@ -94,17 +139,12 @@ class StudyIconListAPIView(generics.ListAPIView):
         }
     )
 )
-class StudyListCreateAPIView(generics.ListCreateAPIView):
+class StudyListCreateAPIView(ReplicaReadMixin, SparseFieldsMixin, QueryPlanMixin, generics.ListCreateAPIView):
+    queryset = Study.objects.all()
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
     )
 
-    def get_queryset(self):
-        user = self.request.user
-        if user.is_authenticated:
-            return Study.objects.user_queryset(user)
-        return Study.objects.all()
-
     def perform_create(self, serializer):
         study = serializer.save(author=self.request.user)
         # Study생성시 해당 유저가 관리자인 StudyMember생성
@@ -146,18 +186,38 @@ class StudyListCreateAPIView(generics.ListCreateAPIView):
         operation_description='스터디 삭제',
     ),
 )
-class StudyRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
-    def get_queryset(self):
-        user = self.request.user
-        if user.is_authenticated:
-            return Study.objects.user_queryset(user)
-        return Study.objects.all()
+class StudyRetrieveUpdateDestroyAPIView(
+        ReplicaReadMixin, ConditionalGetMixin, SparseFieldsMixin, QueryPlanMixin,
+        generics.RetrieveUpdateDestroyAPIView):
+    queryset = Study.objects.all()
+
+    def get_conditional_annotations(self):
+        memberships = StudyMembership.objects.all()
+        return {
+            **_study_conditional_annotations(),
+            **related_state('membership', memberships, 'study'),
+            **related_state('member', memberships, 'study', field='user__modified'),
+            **related_state('schedule', Schedule.objects.all(), 'study'),
+            **related_state('attendance', Attendance.objects.all(), 'schedule__study'),
+        }
 
     def get_serializer_class(self):
         if self.request.method == 'PATCH':
             return StudyUpdateSerializer
         return StudyDetailSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        # Serializer의 결과(data)를 cache하며, 렌더링은 요청의 응답 형식에 따라 매번 처리
+        pk = self.kwargs['pk']
+
+        def compute():
+            # replica의 복제 지연으로 변경 전의 표현이 cache되지 않도록 primary에서 불러옴
+            with use_replica(False):
+                return super(StudyRetrieveUpdateDestroyAPIView, self).retrieve(request, *args, **kwargs).data
+
+        variant = get_study_detail_variant(pk, request, (self.get_expand(), self.get_sparse_fields()))
+        return Response(study_detail_cache.get_or_set(pk, variant, compute))
+
     @swagger_auto_schema(auto_schema=None)
     def put(self, request, *args, **kwargs):
         super().put(request, *args, **kwargs)
@@ -171,7 +231,7 @@ class StudyRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
         operation_description='초대 토큰값을 사용한 스터디 정보'
     )
 )
-class StudyRetrieveByInviteTokenAPIView(generics.RetrieveAPIView):
+class StudyRetrieveByInviteTokenAPIView(ReplicaReadMixin, SparseFieldsMixin, QueryPlanMixin, generics.RetrieveAPIView):
     queryset = Study.objects.all()
     serializer_class = StudyDetailSerializer
     permission_classes = (
@@ -184,7 +244,7 @@ class StudyRetrieveByInviteTokenAPIView(generics.RetrieveAPIView):
             token = StudyInviteToken.objects.get(key=token_key)
         except StudyInviteToken.DoesNotExist:
             raise ValidationError(errors.STUDY_INVITE_TOKEN_INVALID)
-        obj = get_object_or_404(self.queryset, token_set=token)
+        obj = get_object_or_404(self.get_queryset(), token_set=token)
         return obj
 
 
@@ -198,6 +258,7 @@ STUDY_MEMBER_LIST_DESCRIPTION = '''
     decorator=swagger_auto_schema(
         operation_summary='StudyMembership List',
         operation_description=STUDY_MEMBER_LIST_DESCRIPTION,
+        manual_parameters=[STREAM_PARAMETER],
     )
 )
 @method_decorator(
@@ -210,19 +271,30 @@ STUDY_MEMBER_LIST_DESCRIPTION = '''
         }
     )
 )
-class StudyMembershipListCreateAPIView(generics.ListCreateAPIView):
+class StudyMembershipListCreateAPIView(
+        ReplicaReadMixin, ConditionalGetMixin, SparseFieldsMixin, StreamingListMixin, ValuesPlanMixin, QueryPlanMixin,
+        generics.ListCreateAPIView):
+    queryset = StudyMembership.objects.all()
     filterset_class = StudyMembershipListFilter
 
-    def get_queryset(self):
-        return StudyMembership.objects.select_related(
-            'user',
-            'study__category',
-            'study__author',
-        ).prefetch_related(
-            'study__membership_set',
-            'study__membership_set__user',
-            'study__schedule_set',
-        )
+    def get_conditional_annotations(self):
+        # StudyMembershipSerializer: user와 ?expand=로 지정한 study, study_memberships, study_schedules(self_attendance 포함)
+        expand = dict(self.get_expand() or ())
+        memberships = StudyMembership.objects.all()
+        annotations = {'user_modified': F('user__modified')}
+        if 'study' in expand:
+            annotations.update(_study_conditional_annotations('study'))
+        if 'study_memberships' in expand:
+            annotations.update({
+                **related_state('study_membership', memberships, 'study', 'study'),
+                **related_state('study_member', memberships, 'study', 'study', field='user__modified'),
+            })
+        if 'study_schedules' in expand:
+            annotations.update({
+                **related_state('study_schedule', Schedule.objects.all(), 'study', 'study'),
+                **_self_attendance_state(self.request, 'schedule__study', 'study'),
+            })
+        return annotations
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -233,6 +305,21 @@ class StudyMembershipListCreateAPIView(generics.ListCreateAPIView):
         instance = serializer.save()
 
 
+@method_decorator(
+    name='post',
+    decorator=swagger_auto_schema(
+        operation_summary='StudyMembership Bulk Create',
+        operation_description='여러 사용자(pk, email 또는 username)의 스터디멤버십 일괄 생성',
+        responses={
+            status.HTTP_201_CREATED: StudyMembershipBulkCreateResultSerializer(),
+        }
+    )
+)
+class StudyMembershipBulkCreateAPIView(generics.CreateAPIView):
+    queryset = StudyMembership.objects.all()
+    serializer_class = StudyMembershipBulkCreateSerializer
+
+
 @method_decorator(
     name='get',
     decorator=swagger_auto_schema(
@@ -257,7 +344,8 @@ class StudyMembershipListCreateAPIView(generics.ListCreateAPIView):
         operation_description='스터디멤버십 탈퇴',
     ),
 )
-class StudyMembershipRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class StudyMembershipRetrieveUpdateDestroyAPIView(
+        ReplicaReadMixin, SparseFieldsMixin, QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = StudyMembership.objects.all()
 
     def get_serializer_class(self):
@@ -265,6 +353,12 @@ class StudyMembershipRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroy
             return StudyMembershipUpdateSerializer
         return StudyMembershipDetailSerializer
 
+    def get_plan_serializer_class(self):
+        # StudyMembershipUpdateSerializer는 StudyMembershipSerializer로 표현됨
+        if self.request.method == 'PATCH':
+            return StudyMembershipSerializer
+        return super().get_plan_serializer_class()
+
     @swagger_auto_schema(auto_schema=None)
     def put(self, request, *args, **kwargs):
         super().put(request, *args, **kwargs)
@@ -273,11 +367,90 @@ class StudyMembershipRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroy
         instance.withdraw()
 
 
+@method_decorator(
+    name='get',
+    decorator=swagger_auto_schema(
+        operation_summary='StudyMembershipStats List',
+        operation_description='스터디멤버십 출석 통계 목록',
+    )
+)
+class StudyMembershipStatsListAPIView(ReplicaReadMixin, SparseFieldsMixin, generics.ListAPIView):
+    queryset = StudyMembershipStats.objects.all()
+    serializer_class = StudyMembershipStatsSerializer
+    filterset_class = StudyMembershipStatsFilter
+
+
+@method_decorator(
+    name='get',
+    decorator=swagger_auto_schema(
+        operation_summary='Dashboard',
+        operation_description='인증된 사용자의 정보, 참여중인 스터디멤버십과 스터디별 다가오는 일정(자신의 출석 포함)',
+    )
+)
+class DashboardAPIView(ReplicaReadMixin, ConditionalGetMixin, SparseFieldsMixin, generics.RetrieveAPIView):
+    serializer_class = DashboardSerializer
+    permission_classes = (
+        permissions.IsAuthenticated,
+    )
+    # 스터디별 다가오는 일정의 최대 수
+    upcoming_schedule_count = 3
+
+    def get_membership_serializer_class(self):
+        """
+        memberships를 표현할 Serializer (?fields=로 선택된 필드만 불러오기 위해 사용)
+        """
+        memberships = self.get_serializer().fields.get('memberships')
+        return type(memberships.child) if memberships is not None else DashboardMembershipSerializer
+
+    def get_queryset(self):
+        queryset = StudyMembership.objects.filter(user=self.request.user, is_withdraw=False)
+        return plan_queryset(queryset, self.get_membership_serializer_class(), self.request)
+
+    def get_conditional_state(self, request):
+        # 다가오는 일정은 현재 시각에 따라 달라지므로, 현재 이후의 일정만으로 validator를 만듦
+        upcoming_schedules = Schedule.objects.filter(start_at__gte=timezone.now())
+        annotations = {
+            **_study_conditional_annotations('study'),
+            **related_state('study_schedule', upcoming_schedules, 'study', 'study'),
+            **_self_attendance_state(request, 'schedule__study', 'study'),
+        }
+        rows = self.get_queryset().prefetch_related(None).annotate(**annotations).values_list(
+            'pk', 'modified', *annotations)
+        return [(request.user.pk, request.user.modified), *rows]
+
+    def get_object(self):
+        """
+        멤버십(Study 포함), 다가오는 일정, 일정별 자신의 출석을 각각 한 번의 쿼리로 불러옴
+        """
+        memberships = self.get_queryset()
+        # ?fields=로 upcoming_schedules를 제외한 경우에는 불러오지 않음
+        if 'upcoming_schedules' not in self.get_membership_serializer_class()().fields:
+            return {
+                'user': self.request.user,
+                'memberships': list(memberships),
+            }
+
+        memberships = list(memberships.select_related('study'))
+        schedules = Schedule.objects.upcoming(self.upcoming_schedule_count).filter(
+            study_id__in=[membership.study_id for membership in memberships],
+        ).select_related(None).prefetch_related(Schedule.objects.self_attendance_prefetch(self.request.user))
+        schedule_dict = defaultdict(list)
+        for schedule in schedules:
+            schedule_dict[schedule.study_id].append(schedule)
+        for membership in memberships:
+            membership.study.upcoming_schedule_list = schedule_dict[membership.study_id]
+        return {
+            'user': self.request.user,
+            'memberships': memberships,
+        }
+
+
 @method_decorator(
     name='get',
     decorator=swagger_auto_schema(
         operation_summary='Schedule List',
-        operation_description='스터디 일정 목록'
+        operation_description='스터디 일정 목록',
+        manual_parameters=[STREAM_PARAMETER],
     )
 )
 @method_decorator(
@@ -290,14 +463,14 @@ class StudyMembershipRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroy
         }
     )
 )
-class ScheduleListCreateAPIView(generics.ListCreateAPIView):
+class ScheduleListCreateAPIView(
+        ReplicaReadMixin, ConditionalGetMixin, SparseFieldsMixin, StreamingListMixin, ValuesPlanMixin, QueryPlanMixin,
+        generics.ListCreateAPIView):
+    queryset = Schedule.objects.all()
     filterset_class = ScheduleFilter
 
-    def get_queryset(self):
-        user = self.request.user
-        if user.is_authenticated:
-            return Schedule.objects.user_queryset(user)
-        return Schedule.objects.all()
+    def get_conditional_annotations(self):
+        return _self_attendance_state(self.request, 'schedule')
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -329,12 +502,18 @@ class ScheduleListCreateAPIView(generics.ListCreateAPIView):
         operation_description='스터디 일정 삭제',
     ),
 )
-class ScheduleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
-    def get_queryset(self):
-        user = self.request.user
-        if user:
-            return Schedule.objects.user_queryset(user)
-        return Schedule.objects.all()
+class ScheduleRetrieveUpdateDestroyAPIView(
+        ReplicaReadMixin, ConditionalGetMixin, SparseFieldsMixin, QueryPlanMixin,
+        generics.RetrieveUpdateDestroyAPIView):
+    queryset = Schedule.objects.all()
+
+    def get_conditional_annotations(self):
+        # self_attendance는 attendance_set에 포함됨
+        attendances = Attendance.objects.all()
+        return {
+            **related_state('attendance', attendances, 'schedule'),
+            **related_state('attendance_user', attendances, 'schedule', field='user__modified'),
+        }
 
     def get_serializer_class(self):
         if self.request.method == 'PATCH':
@@ -350,7 +529,8 @@ class ScheduleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
     name='get',
     decorator=swagger_auto_schema(
         operation_summary='Attendance List',
-        operation_description='스터디 참여내역 목록'
+        operation_description='스터디 참여내역 목록',
+        manual_parameters=[STREAM_PARAMETER],
     )
 )
 @method_decorator(
@@ -363,7 +543,9 @@ class ScheduleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
         }
     )
 )
-class AttendanceListCreateAPIView(generics.ListCreateAPIView):
+class AttendanceListCreateAPIView(
+        ReplicaReadMixin, SparseFieldsMixin, StreamingListMixin, ValuesPlanMixin, QueryPlanMixin,
+        generics.ListCreateAPIView):
     queryset = Attendance.objects.all()
     filterset_class = AttendanceFilter
 
@@ -397,7 +579,8 @@ class AttendanceListCreateAPIView(generics.ListCreateAPIView):
         operation_description='스터디 참여내역 삭제',
     ),
 )
-class AttendanceRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class AttendanceRetrieveUpdateDestroyAPIView(
+        ReplicaReadMixin, SparseFieldsMixin, QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Attendance.objects.all()
 
     def get_serializer_class(self):
@@ -410,6 +593,27 @@ class AttendanceRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVi
         super().put(request, *args, **kwargs)
 
 
+@method_decorator(
+    name='patch',
+    decorator=swagger_auto_schema(
+        operation_summary='Attendance Bulk Update',
+        operation_description='스터디 일정의 참여내역 일괄 수정 (수정된 일정 정보와 참여내역 목록을 리턴)',
+        responses={
+            status.HTTP_200_OK: ScheduleDetailSerializer(),
+        },
+    ),
+)
+class ScheduleAttendanceBulkUpdateAPIView(generics.GenericAPIView):
+    queryset = Schedule.objects.all()
+    serializer_class = AttendanceBulkUpdateSerializer
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object(), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
 @method_decorator(
     name='post',
     decorator=swagger_auto_schema(
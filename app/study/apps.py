@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StudyConfig(AppConfig):
     name = 'study'
     verbose_name = '스터디'
+
+    def ready(self):
+        from . import signals
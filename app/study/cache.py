@@ -0,0 +1,31 @@
+import hashlib
+
+from django.conf import settings
+
+from utils.cache import VersionedCache
+from .models import StudyMembership
+
+__all__ = (
+    'study_detail_cache',
+    'get_study_detail_variant',
+)
+
+# Study의 pk별 StudyDetailSerializer의 표현 (study.signals에서 무효화)
+study_detail_cache = VersionedCache('study-detail', timeout=lambda: settings.STUDY_DETAIL_CACHE_TIMEOUT)
+
+
+def get_study_detail_variant(study_pk, request, selection=None):
+    """
+    StudyDetailSerializer의 표현 중 요청한 user에 따라 달라지는 부분은 schedule_set의 self_attendance뿐이므로
+    Study의 멤버십이 없는(Attendance가 없는) user는 인증되지 않은 요청과 같은 표현을 사용
+    ?expand=, ?fields=로 선택한 필드(utils.drf.sparse.parse_fields()의 결과 tuple)가 있으면 필드별로 구분
+    이미지 등의 URL은 request.build_absolute_uri()로 만들어지므로 요청의 scheme, host별로 구분
+    """
+    user = request.user
+    if user.is_authenticated and StudyMembership.objects.filter(study_id=study_pk, user=user).exists():
+        variant = f'user:{user.pk}'
+    else:
+        variant = 'public'
+    if selection and any(selection):
+        variant += ':fields:' + hashlib.md5(repr(selection).encode()).hexdigest()
+    return f'{request.scheme}://{request.get_host()}:{variant}'
@@ -1,6 +1,6 @@
 from django_filters import rest_framework as filters
 
-from .models import Schedule, StudyMembership, Attendance
+from .models import Schedule, StudyMembership, Attendance, StudyMembershipStats
 
 
 class ScheduleFilter(filters.FilterSet):
@@ -24,6 +24,20 @@ class StudyMembershipListFilter(filters.FilterSet):
         )
 
 
+class StudyMembershipStatsFilter(filters.FilterSet):
+    user = filters.NumberFilter(field_name='membership__user', help_text='User의 pk(id)')
+    study = filters.NumberFilter(field_name='membership__study', help_text='Study의 pk(id)')
+    is_withdraw = filters.BooleanFilter(field_name='membership__is_withdraw', help_text='탈퇴여부')
+
+    class Meta:
+        model = StudyMembershipStats
+        fields = (
+            'is_withdraw',
+            'user',
+            'study',
+        )
+
+
 class AttendanceFilter(filters.FilterSet):
     class Meta:
         model = Attendance
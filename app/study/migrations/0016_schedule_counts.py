@@ -0,0 +1,63 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def refresh_schedule_counts(apps, schema_editor):
+    Schedule = apps.get_model('study', 'Schedule')
+    Attendance = apps.get_model('study', 'Attendance')
+
+    def count_subquery(name, value):
+        attendances = Attendance.objects.filter(
+            schedule=OuterRef('pk'), **{name: value},
+        ).order_by().values('schedule').annotate(count=Count('pk')).values('count')
+        return Coalesce(Subquery(attendances), 0)
+
+    Schedule.objects.update(**{
+        f'{name}_{value}_count': count_subquery(name, value)
+        for name in ('vote', 'att')
+        for value in ('attend', 'late', 'absent')
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0015_auto_20190825_1905'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='att_absent_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='실제 결석 수'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='att_attend_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='실제 참석 수'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='att_late_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='실제 지각 수'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='vote_absent_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='사전 투표 결석 수'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='vote_attend_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='사전 투표 참석 수'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='vote_late_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='사전 투표 지각 수'),
+        ),
+        migrations.RunPython(refresh_schedule_counts, migrations.RunPython.noop),
+    ]
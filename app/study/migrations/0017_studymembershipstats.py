@@ -0,0 +1,63 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:14
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+def create_membership_stats(apps, schema_editor):
+    StudyMembership = apps.get_model('study', 'StudyMembership')
+    StudyMembershipStats = apps.get_model('study', 'StudyMembershipStats')
+    Attendance = apps.get_model('study', 'Attendance')
+
+    voted, att = ~Q(vote=''), ~Q(att='')
+    attendances = Attendance.objects.order_by().values('user_id', 'schedule__study_id').annotate(
+        attend_count=Count('pk', filter=Q(att='attend')),
+        late_count=Count('pk', filter=Q(att='late')),
+        absent_count=Count('pk', filter=Q(att='absent')),
+        unvoted_count=Count('pk', filter=~voted),
+        vote_compared_count=Count('pk', filter=voted & att),
+        vote_match_count=Count('pk', filter=voted & Q(att=F('vote'))),
+    )
+    counts_dict = {}
+    for counts in attendances:
+        counts_dict[(counts.pop('user_id'), counts.pop('schedule__study_id'))] = counts
+
+    StudyMembershipStats.objects.bulk_create(
+        [
+            StudyMembershipStats(membership_id=pk, **counts_dict.get((user_id, study_id), {}))
+            for pk, user_id, study_id in StudyMembership.objects.values_list('pk', 'user_id', 'study_id')
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0016_schedule_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudyMembershipStats',
+            fields=[
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('membership', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='study.StudyMembership', verbose_name='스터디 멤버십')),
+                ('attend_count', models.PositiveIntegerField(default=0, verbose_name='참석 수')),
+                ('late_count', models.PositiveIntegerField(default=0, verbose_name='지각 수')),
+                ('absent_count', models.PositiveIntegerField(default=0, verbose_name='결석 수')),
+                ('unvoted_count', models.PositiveIntegerField(default=0, verbose_name='사전 투표하지 않은 수')),
+                ('vote_compared_count', models.PositiveIntegerField(default=0, verbose_name='사전 투표와 실제 참석 결과가 모두 있는 수')),
+                ('vote_match_count', models.PositiveIntegerField(default=0, verbose_name='사전 투표와 실제 참석 결과가 일치한 수')),
+            ],
+            options={
+                'verbose_name': '스터디 멤버십 출석 통계',
+                'verbose_name_plural': '스터디 멤버십 출석 통계 목록',
+                'ordering': ('-pk',),
+            },
+        ),
+        migrations.RunPython(create_membership_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study', '0017_studymembershipstats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schedule',
+            name='study',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='schedule_set', to='study.Study', verbose_name='스터디'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['schedule', 'vote', '-id'], name='attendance_schedule_vote_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['schedule', 'att', '-id'], name='attendance_schedule_att_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['study', '-id'], name='schedule_study_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studymembership',
+            index=models.Index(condition=models.Q(is_withdraw=False), fields=['user', '-id'], name='membership_active_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studymembership',
+            index=models.Index(condition=models.Q(is_withdraw=False), fields=['study', '-id'], name='membership_active_study_idx'),
+        ),
+    ]
@@ -1,9 +1,11 @@
+from collections import defaultdict
 from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models import Prefetch
+from django.db import models, transaction
+from django.db.models import Prefetch, F, Q, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django_extensions.db.models import TimeStampedModel
@@ -28,22 +30,6 @@ class StudyManager(models.Manager):
             'category',
             'icon',
             'author',
-        ).prefetch_related(
-            'schedule_set',
-            'schedule_set__attendance_set',
-            'schedule_set__attendance_set__user',
-            'membership_set',
-            'membership_set__user',
-        )
-
-    def user_queryset(self, user):
-        attendances = Attendance.objects.filter(user=user)
-        return self.get_queryset().prefetch_related(
-            Prefetch(
-                'schedule_set__attendance_set',
-                queryset=attendances,
-                to_attr='self_attendance_list',
-            )
         )
 
 
@@ -90,6 +76,18 @@ class Study(TimeStampedModel):
     def __str__(self):
         return f'{self.category.name} | {self.name} (pk: {self.pk})'
 
+    def set_membership_attendances(self):
+        """
+        membership_set의 각 StudyMembership.attendance_set에 사용될 출석(Attendance)목록을
+        한 번의 쿼리로 불러와 User별로 나누어 지정
+        (membership_set이 prefetch되어 있어야 serializer에서 같은 객체를 사용함)
+        """
+        attendance_dict = defaultdict(list)
+        for attendance in Attendance.objects.filter(schedule__study=self):
+            attendance_dict[attendance.user_id].append(attendance)
+        for membership in self.membership_set.all():
+            membership.study_attendance_list = attendance_dict[membership.user_id]
+
 
 class ScheduleManager(models.Manager):
     def get_queryset(self):
@@ -98,28 +96,75 @@ class ScheduleManager(models.Manager):
             'study__category',
         )
 
-    def user_queryset(self, user):
+    def self_attendance_prefetch(self, user):
         """
-        request.user가 주어질 경우 필요한
-            self_attendance (인증된 유저의 출석(Attendance) pk)
-        를 annotate로 추가시켜주는 QuerySet
-        :param user:
-        :return:
+        Schedule.self_attendance에 사용될 user의 출석(Attendance)을 불러오는 Prefetch
+        인증되지 않은 유저일 경우 None
         """
-        self_attendances = Attendance.objects.filter(user=user)
-        return self.get_queryset().prefetch_related(
-            Prefetch(
-                'attendance_set',
-                queryset=self_attendances,
-                to_attr='self_attendance_list',
-            )
+        queryset = self.self_attendance_queryset(user)
+        if queryset is None:
+            return None
+        return Prefetch(
+            'attendance_set',
+            queryset=queryset,
+            to_attr='self_attendance_list',
         )
 
+    def self_attendance_queryset(self, user):
+        if user is None or not user.is_authenticated:
+            return None
+        return Attendance.objects.filter(user=user)
+
+    def upcoming(self, count, now=None):
+        """
+        Study별로 시작 일시가 now 이후인 Schedule을 시작 일시 순서로 최대 count개 (쿼리 1회)
+        각 Schedule보다 먼저 시작하는 같은 Study의 Schedule 수(upcoming_rank)로 제한
+        """
+        now = now or timezone.now()
+        earlier = Schedule.objects.filter(
+            Q(start_at__lt=OuterRef('start_at')) | Q(start_at=OuterRef('start_at'), pk__lt=OuterRef('pk')),
+            study=OuterRef('study'),
+            start_at__gte=now,
+        ).order_by().values('study').annotate(count=Count('pk')).values('count')
+        return self.filter(start_at__gte=now).annotate(
+            upcoming_rank=Coalesce(Subquery(earlier, output_field=models.IntegerField()), 0),
+        ).filter(upcoming_rank__lt=count).order_by('start_at', 'pk')
+
+    def update_attendance_counts(self, counter):
+        """
+        {(schedule_id, 출석 수 필드명): 증감값} 형태의 counter를 각 Schedule의 출석 수에 반영
+        """
+        schedule_dict = defaultdict(dict)
+        for (schedule_id, field_name), value in counter.items():
+            if value:
+                schedule_dict[schedule_id][field_name] = F(field_name) + value
+        # update()는 modified를 갱신하지 않으므로 직접 지정 (ETag에 사용됨)
+        now = timezone.now()
+        for schedule_id, update_kwargs in schedule_dict.items():
+            super().get_queryset().filter(pk=schedule_id).update(modified=now, **update_kwargs)
+
+    def refresh_attendance_counts(self, **filters):
+        """
+        출석(Attendance)목록으로부터 Schedule의 출석 수를 다시 계산 (UPDATE 1회)
+        """
+        def count_subquery(name, value):
+            attendances = Attendance.objects.filter(
+                schedule=OuterRef('pk'), **{name: value},
+            ).order_by().values('schedule').annotate(count=Count('pk')).values('count')
+            return Coalesce(Subquery(attendances), 0)
+
+        return super().get_queryset().filter(**filters).update(modified=timezone.now(), **{
+            Schedule.get_count_field_name(name, value): count_subquery(name, value)
+            for name in Schedule.COUNT_NAMES
+            for value, display in Attendance.CHOICES_VOTE
+        })
+
 
 class Schedule(TimeStampedModel):
+    # study로 시작하는 schedule_study_idx가 FK index를 대신함
     study = models.ForeignKey(
         Study, verbose_name='스터디', on_delete=models.CASCADE,
-        related_name='schedule_set',
+        related_name='schedule_set', db_index=False,
     )
     location = models.CharField('장소', max_length=50, blank=True)
     subject = models.CharField('주제', max_length=50, blank=True)
@@ -128,25 +173,56 @@ class Schedule(TimeStampedModel):
     start_at = models.DateTimeField('스터디 시작 일시', blank=True, null=True)
     studying_time = models.DurationField('스터디 시간', blank=True, null=True)
 
+    # Attendance.CHOICES_VOTE의 값별 사전 투표(vote), 실제 참석 결과(att) 수
+    # Attendance의 생성/수정/삭제시 갱신됨 (study.signals)
+    vote_attend_count = models.PositiveIntegerField('사전 투표 참석 수', default=0, editable=False)
+    vote_late_count = models.PositiveIntegerField('사전 투표 지각 수', default=0, editable=False)
+    vote_absent_count = models.PositiveIntegerField('사전 투표 결석 수', default=0, editable=False)
+    att_attend_count = models.PositiveIntegerField('실제 참석 수', default=0, editable=False)
+    att_late_count = models.PositiveIntegerField('실제 지각 수', default=0, editable=False)
+    att_absent_count = models.PositiveIntegerField('실제 결석 수', default=0, editable=False)
+
+    COUNT_NAMES = ('vote', 'att')
+
     objects = ScheduleManager()
 
     class Meta:
         verbose_name = '스터디 일정'
         verbose_name_plural = f'{verbose_name} 목록'
         ordering = ('-pk',)
+        indexes = [
+            # ScheduleFilter(study) + ordering
+            models.Index(fields=['study', '-id'], name='schedule_study_idx'),
+        ]
 
     def __str__(self):
         return f'{self.study.category.name} | {self.study.name} | {self.start_at} (pk: {self.pk})'
 
     def save(self, **kwargs):
+        adding = self._state.adding
         super().save(**kwargs)
-        # Schedule생성 시, Schedule의 생성보다 먼저 Study에 참여한 User들의 출석정보를 일괄 저장
-        for memberhsip in self.study.membership_set.filter(
-                created__lte=self.created):
-            Attendance.objects.get_or_create(
-                user=memberhsip.user,
-                schedule=self,
-            )
+        # Schedule생성 시, Study에 참여중인(탈퇴하지 않은) User들의 출석정보를 일괄 저장
+        if adding:
+            self.create_attendances()
+
+    @staticmethod
+    def get_count_field_name(name, value):
+        return f'{name}_{value}_count'
+
+    def create_attendances(self):
+        user_pk_list = list(StudyMembership.objects.filter(
+            study_id=self.study_id,
+            is_withdraw=False,
+        ).values_list('user_id', flat=True))
+        Attendance.objects.bulk_create(
+            [Attendance(user_id=user_pk, schedule=self) for user_pk in user_pk_list],
+            ignore_conflicts=True,
+        )
+        # bulk_create는 post_save가 발생하지 않으므로, 투표하지 않은 출석 수를 직접 반영
+        StudyMembershipStats.objects.filter(
+            membership__study_id=self.study_id,
+            membership__user_id__in=user_pk_list,
+        ).update(unvoted_count=F('unvoted_count') + 1, modified=timezone.now())
 
     @property
     def self_attendance(self):
@@ -183,6 +259,17 @@ class StudyMembership(TimeStampedModel):
         unique_together = (
             ('user', 'study'),
         )
+        indexes = [
+            # StudyMembershipListFilter(user/study + is_withdraw=False) + ordering
+            models.Index(
+                fields=['user', '-id'], name='membership_active_user_idx',
+                condition=Q(is_withdraw=False),
+            ),
+            models.Index(
+                fields=['study', '-id'], name='membership_active_study_idx',
+                condition=Q(is_withdraw=False),
+            ),
+        ]
 
     def __str__(self):
         return f'{self.study.name} | {self.user.name} ({self.get_role_display()} (pk: {self.pk})'
@@ -193,6 +280,8 @@ class StudyMembership(TimeStampedModel):
 
     @property
     def attendance_set(self):
+        if hasattr(self, 'study_attendance_list'):
+            return self.study_attendance_list
         return self.user.attendance_set.filter(schedule__study=self.study)
 
 
@@ -224,6 +313,9 @@ class Attendance(TimeStampedModel):
 
     objects = AttendanceManager()
 
+    # 값이 바뀔 때 Schedule의 출석 수, StudyMembershipStats에 반영되는 필드
+    TRACKED_FIELDS = ('user_id', 'schedule_id', 'vote', 'att')
+
     class Meta:
         verbose_name = '스터디 일정 참가'
         verbose_name_plural = f'{verbose_name} 목록'
@@ -231,12 +323,152 @@ class Attendance(TimeStampedModel):
         unique_together = (
             ('user', 'schedule'),
         )
+        indexes = [
+            # AttendanceFilter(schedule + vote/att) + ordering
+            models.Index(fields=['schedule', 'vote', '-id'], name='attendance_schedule_vote_idx'),
+            models.Index(fields=['schedule', 'att', '-id'], name='attendance_schedule_att_idx'),
+        ]
 
     def __str__(self):
         return f'{self.schedule.__str__()} | {self.user.name} ' \
             f'(사전: {self.get_vote_display()}, 실제: {self.get_att_display()}) ' \
             f'(pk: {self.pk})'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 수정/삭제시 Schedule의 출석 수, StudyMembershipStats를 갱신하기 위해 불러온 시점의 값을 기록
+        if set(cls.TRACKED_FIELDS) <= instance.__dict__.keys():
+            instance.loaded_values = instance.get_tracked_values()
+        return instance
+
+    def get_tracked_values(self):
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+    @staticmethod
+    def get_count_keys(values):
+        """
+        출석값(get_tracked_values())이 반영되는 Schedule의 출석 수 목록 [(schedule_id, 출석 수 필드명), ...]
+        """
+        return [
+            (values['schedule_id'], Schedule.get_count_field_name(name, values[name]))
+            for name in Schedule.COUNT_NAMES
+            if values[name]
+        ]
+
+
+class StudyMembershipStatsManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'membership',
+        )
+
+    def update_counts(self, counter, rebuild=True):
+        """
+        {(user_id, study_id, 통계 필드명): 증감값} 형태의 counter를 각 StudyMembershipStats에 반영
+        통계가 존재하지 않는 멤버십은 전체를 다시 계산 (rebuild가 False면 생략)
+        """
+        membership_dict = defaultdict(dict)
+        for (user_id, study_id, field_name), value in counter.items():
+            if value:
+                membership_dict[(user_id, study_id)][field_name] = F(field_name) + value
+        now = timezone.now()
+        for (user_id, study_id), update_kwargs in membership_dict.items():
+            updated = super().get_queryset().filter(
+                membership__user_id=user_id,
+                membership__study_id=study_id,
+            ).update(modified=now, **update_kwargs)
+            if not updated and rebuild:
+                self.rebuild(user_id=user_id, study_id=study_id)
+
+    def rebuild(self, batch_size=1000, **filters):
+        """
+        filters에 해당하는 StudyMembership들의 통계를 출석(Attendance)목록으로부터 다시 생성
+        """
+        memberships = StudyMembership.objects.filter(**filters).values_list('pk', 'user_id', 'study_id')
+        membership_dict = {(user_id, study_id): pk for pk, user_id, study_id in memberships}
+
+        attendances = Attendance.objects.order_by().values('user_id', 'schedule__study_id')
+        if filters:
+            attendances = attendances.filter(
+                user_id__in={user_id for user_id, study_id in membership_dict},
+                schedule__study_id__in={study_id for user_id, study_id in membership_dict},
+            )
+        voted, att = ~Q(vote=''), ~Q(att='')
+        attendances = attendances.annotate(
+            attend_count=Count('pk', filter=Q(att=Attendance.VOTE_ATTEND)),
+            late_count=Count('pk', filter=Q(att=Attendance.VOTE_LATE)),
+            absent_count=Count('pk', filter=Q(att=Attendance.VOTE_ABSENT)),
+            unvoted_count=Count('pk', filter=~voted),
+            vote_compared_count=Count('pk', filter=voted & att),
+            vote_match_count=Count('pk', filter=voted & Q(att=F('vote'))),
+        )
+        counts_dict = {}
+        for counts in attendances:
+            key = (counts.pop('user_id'), counts.pop('schedule__study_id'))
+            counts_dict[key] = counts
+
+        with transaction.atomic():
+            super().get_queryset().filter(membership_id__in=membership_dict.values()).delete()
+            self.bulk_create(
+                [
+                    StudyMembershipStats(membership_id=pk, **counts_dict.get(key, {}))
+                    for key, pk in membership_dict.items()
+                ],
+                batch_size=batch_size,
+            )
+        return len(membership_dict)
+
+
+class StudyMembershipStats(TimeStampedModel):
+    """
+    StudyMembership별 출석 통계
+    Attendance의 생성/수정/삭제시 갱신됨 (study.signals)
+    """
+    membership = models.OneToOneField(
+        StudyMembership, verbose_name='스터디 멤버십', on_delete=models.CASCADE,
+        related_name='stats', primary_key=True,
+    )
+    attend_count = models.PositiveIntegerField('참석 수', default=0)
+    late_count = models.PositiveIntegerField('지각 수', default=0)
+    absent_count = models.PositiveIntegerField('결석 수', default=0)
+    unvoted_count = models.PositiveIntegerField('사전 투표하지 않은 수', default=0)
+    vote_compared_count = models.PositiveIntegerField('사전 투표와 실제 참석 결과가 모두 있는 수', default=0)
+    vote_match_count = models.PositiveIntegerField('사전 투표와 실제 참석 결과가 일치한 수', default=0)
+
+    objects = StudyMembershipStatsManager()
+
+    class Meta:
+        verbose_name = '스터디 멤버십 출석 통계'
+        verbose_name_plural = f'{verbose_name} 목록'
+        ordering = ('-pk',)
+
+    def __str__(self):
+        return f'{self.membership_id} | 참석: {self.attend_count}, 지각: {self.late_count}, 결석: {self.absent_count}'
+
+    @property
+    def vote_match_rate(self):
+        if not self.vote_compared_count:
+            return None
+        return self.vote_match_count / self.vote_compared_count
+
+    @staticmethod
+    def get_count_field_names(values):
+        """
+        출석값(Attendance.get_tracked_values())이 반영되는 통계 필드명 목록
+        """
+        vote, att = values['vote'], values['att']
+        field_names = []
+        if att:
+            field_names.append(f'{att}_count')
+        if not vote:
+            field_names.append('unvoted_count')
+        elif att:
+            field_names.append('vote_compared_count')
+            if vote == att:
+                field_names.append('vote_match_count')
+        return field_names
+
 
 class StudyInviteToken(TimeStampedModel):
     study = models.ForeignKey(
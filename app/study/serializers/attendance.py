@@ -1,10 +1,19 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
 from members.serializers import UserSerializer
+from utils.drf import errors
+from utils.drf.compiled import CompiledSerializerMixin
+from utils.drf.exceptions import ValidationError
+from utils.drf.prefetch import refetch_instance
+from ..cache import study_detail_cache
 from ..models import (
     Attendance,
+    Schedule,
+    StudyMembershipStats,
 )
-from .schedule import ScheduleSerializer
+from .schedule import ScheduleSerializer, ScheduleDetailSerializer
 from .study import StudySerializer
 
 ATTENDANCE_FIELDS = (
@@ -18,7 +27,7 @@ ATTENDANCE_FIELDS = (
 )
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer()
     schedule = ScheduleSerializer()
     vote_display = serializers.CharField(source='get_vote_display')
@@ -30,8 +39,10 @@ class AttendanceSerializer(serializers.ModelSerializer):
 
 
 class AttendanceDetailSerializer(AttendanceSerializer):
-    study = StudySerializer(source='schedule.study')
-    schedule = ScheduleSerializer()
+    study = serializers.PrimaryKeyRelatedField(
+        source='schedule.study', read_only=True, help_text='Study의 pk (expand=study이면 Study 정보)')
+    schedule = serializers.PrimaryKeyRelatedField(
+        read_only=True, help_text='Schedule의 pk (expand=schedule이면 Schedule 정보)')
 
     class Meta:
         model = Attendance
@@ -39,6 +50,11 @@ class AttendanceDetailSerializer(AttendanceSerializer):
             'study',
             'schedule',
         )
+        # ?expand=로 nested serializer로 표현할 관계 (utils.drf.sparse)
+        expandable_fields = {
+            'study': (StudySerializer, {'source': 'schedule.study'}),
+            'schedule': (ScheduleSerializer, {}),
+        }
 
 
 class AttendanceCreateSerializer(serializers.ModelSerializer):
@@ -66,3 +82,72 @@ class AttendanceUpdateSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return AttendanceSerializer(instance).data
+
+
+class AttendanceBulkUpdateItemSerializer(serializers.Serializer):
+    pk = serializers.IntegerField(required=False, help_text='Attendance의 pk (pk, user 중 하나를 지정)')
+    user = serializers.IntegerField(required=False, help_text='User의 pk (pk, user 중 하나를 지정)')
+    vote = serializers.ChoiceField(Attendance.CHOICES_VOTE, allow_blank=True, required=False)
+    att = serializers.ChoiceField(Attendance.CHOICES_VOTE, allow_blank=True, required=False)
+
+    def validate(self, data):
+        if ('pk' in data) == ('user' in data):
+            raise serializers.ValidationError('pk, user 중 하나만 지정해야 합니다')
+        return data
+
+
+class AttendanceBulkUpdateSerializer(serializers.Serializer):
+    """
+    한 Schedule(instance)의 출석 여러 개를 한 번에 수정
+    """
+    attendances = AttendanceBulkUpdateItemSerializer(many=True, allow_empty=False)
+
+    def validate_attendances(self, items):
+        """
+        :return: [(Attendance, 수정할 값), ...]
+        """
+        attendances = list(Attendance.objects.filter(schedule=self.instance).select_related(None))
+        pk_dict = {attendance.pk: attendance for attendance in attendances}
+        user_dict = {attendance.user_id: attendance for attendance in attendances}
+
+        changes = []
+        for item in items:
+            if 'pk' in item:
+                attendance = pk_dict.get(item.pop('pk'))
+            else:
+                attendance = user_dict.get(item.pop('user'))
+            if attendance is None:
+                raise ValidationError(errors.ATTENDANCE_NOT_IN_SCHEDULE)
+            changes.append((attendance, item))
+        if len({attendance.pk for attendance, item in changes}) != len(changes):
+            raise ValidationError(errors.ATTENDANCE_DUPLICATED)
+        return changes
+
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        changed = []
+        for attendance, values in validated_data['attendances']:
+            if all(getattr(attendance, name) == value for name, value in values.items()):
+                continue
+            for name, value in values.items():
+                setattr(attendance, name, value)
+            attendance.modified = now
+            changed.append(attendance)
+        if not changed:
+            return instance
+
+        # bulk_update는 post_save가 발생하지 않으므로 (study.signals)
+        # Schedule의 출석 수, StudyMembershipStats, Study 상세의 cache를 직접 갱신
+        with transaction.atomic():
+            Attendance.objects.bulk_update(changed, ['vote', 'att', 'modified'])
+            Schedule.objects.refresh_attendance_counts(pk=instance.pk)
+            StudyMembershipStats.objects.rebuild(
+                study_id=instance.study_id,
+                user_id__in=[attendance.user_id for attendance in changed],
+            )
+            study_detail_cache.invalidate(instance.study_id)
+        return instance
+
+    def to_representation(self, instance):
+        instance = refetch_instance(instance, ScheduleDetailSerializer, self.context.get('request'))
+        return ScheduleDetailSerializer(instance, context=self.context).data
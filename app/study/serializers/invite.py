@@ -3,14 +3,16 @@ from rest_framework.exceptions import MethodNotAllowed
 from rest_framework.generics import get_object_or_404
 
 from utils.drf import errors
+from utils.drf.compiled import CompiledSerializerMixin
 from utils.drf.exceptions import ValidationError
+from utils.drf.prefetch import refetch_instance
 from .membership import StudyMembershipSerializer
 from ..models import (
     StudyInviteToken,
 )
 
 
-class StudyInviteTokenSerializer(serializers.ModelSerializer):
+class StudyInviteTokenSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = StudyInviteToken
         fields = (
@@ -53,4 +55,6 @@ class StudyMembershipCreateByInviteTokenSerializer(serializers.Serializer):
         raise MethodNotAllowed('update는 허용하지 않습니다')
 
     def to_representation(self, instance):
+        instance = refetch_instance(
+            instance, StudyMembershipSerializer, self.context.get('request'))
         return StudyMembershipSerializer(instance).data
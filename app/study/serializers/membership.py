@@ -1,9 +1,22 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import MethodNotAllowed
 
 from members.serializers import UserSerializer
+from utils.drf.compiled import CompiledSerializerMixin
+from utils.drf.prefetch import refetch_instance
+from ..cache import study_detail_cache
 from ..models import (
+    Study,
     StudyMembership,
+    Schedule,
     Attendance,
+    StudyMembershipStats,
 )
 from .schedule import ScheduleSerializer
 from .study import StudySerializer
@@ -27,9 +40,135 @@ class StudyMembershipCreateSerializer(serializers.ModelSerializer):
         )
 
     def to_representation(self, instance):
+        instance = refetch_instance(
+            instance, StudyMembershipDetailSerializer, self.context.get('request'))
         return StudyMembershipDetailSerializer(instance).data
 
 
+class StudyMembershipBulkCreateSerializer(serializers.Serializer):
+    """
+    한 Study에 여러 User의 멤버십을 한 번에 생성
+        없는 멤버십은 생성(bulk_create), 탈퇴한 멤버십은 다시 참여 상태로 변경(update 1회)
+        생성/재참여한 User의 출석정보를 Study의 기존 일정에 일괄 저장
+    """
+    max_users = 1000
+    # 멤버십 생성이 다른 요청과 충돌했을 때 다시 조회해 생성하는 최대 횟수
+    create_attempts = 3
+
+    study = serializers.PrimaryKeyRelatedField(queryset=Study.objects.all())
+    user_pks = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=max_users, help_text='User의 pk 목록',
+    )
+    user_identifiers = serializers.ListField(
+        child=serializers.CharField(), required=False, max_length=max_users, help_text='User의 email 또는 username 목록',
+    )
+    role = serializers.ChoiceField(StudyMembership.CHOICES_ROLE, default=StudyMembership.ROLE_NORMAL)
+
+    def validate(self, attrs):
+        """
+        user_pks와 user_identifiers를 한 번의 쿼리로 User의 pk 목록(users)으로 변환
+        """
+        pks, identifiers = attrs.pop('user_pks', []), attrs.pop('user_identifiers', [])
+        if not pks and not identifiers:
+            raise serializers.ValidationError('user_pks 또는 user_identifiers에 User를 지정해야 합니다')
+        if len(pks) + len(identifiers) > self.max_users:
+            raise serializers.ValidationError(f'한 번에 최대 {self.max_users}명의 User를 지정할 수 있습니다')
+
+        users = get_user_model().objects.filter(
+            Q(pk__in=pks) | Q(email__in=identifiers) | Q(username__in=identifiers),
+        ).values_list('pk', 'email', 'username')
+        user_pks = set()
+        # identifier: {해당하는 User의 pk} (한 User의 email이 다른 User의 username일 수 있음)
+        identifier_dict = defaultdict(set)
+        for pk, email, username in users:
+            user_pks.add(pk)
+            identifier_dict[email].add(pk)
+            identifier_dict[username].add(pk)
+
+        errors = {}
+        not_found = [str(pk) for pk in pks if pk not in user_pks]
+        if not_found:
+            errors['user_pks'] = f'존재하지 않는 사용자가 있습니다: {", ".join(not_found)}'
+        not_found = [identifier for identifier in identifiers if not identifier_dict.get(identifier)]
+        ambiguous = [identifier for identifier in identifiers if len(identifier_dict.get(identifier, ())) > 1]
+        if not_found:
+            errors['user_identifiers'] = f'존재하지 않는 사용자가 있습니다: {", ".join(not_found)}'
+        elif ambiguous:
+            errors['user_identifiers'] = f'여러 사용자에 해당합니다: {", ".join(ambiguous)}'
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        user_ids = pks + [next(iter(identifier_dict[identifier])) for identifier in identifiers]
+        return {**attrs, 'users': list(dict.fromkeys(user_ids))}
+
+    def create(self, validated_data):
+        study, user_ids, role = validated_data['study'], validated_data['users'], validated_data['role']
+        with transaction.atomic():
+            for attempt in range(self.create_attempts):
+                memberships = dict(StudyMembership.objects.filter(
+                    study=study, user_id__in=user_ids,
+                ).values_list('user_id', 'is_withdraw'))
+                created = [user_id for user_id in user_ids if user_id not in memberships]
+                reactivated = [user_id for user_id in user_ids if memberships.get(user_id)]
+                existing = [user_id for user_id in user_ids if memberships.get(user_id) is False]
+                try:
+                    # 조회 후 다른 요청이 같은 멤버십을 생성했다면 충돌(IntegrityError)하므로
+                    # 충돌을 무시하지 않고 다시 조회해, created에는 이 요청에서 생성한 멤버십만 포함
+                    with transaction.atomic():
+                        StudyMembership.objects.bulk_create(
+                            [StudyMembership(study=study, user_id=user_id, role=role) for user_id in created],
+                        )
+                    break
+                except IntegrityError:
+                    if attempt == self.create_attempts - 1:
+                        raise
+            if reactivated:
+                StudyMembership.objects.filter(study=study, user_id__in=reactivated, is_withdraw=True).update(
+                    is_withdraw=False, role=role, modified=timezone.now(),
+                )
+
+            # bulk_create/update는 post_save가 발생하지 않으므로 (study.signals)
+            # 출석정보, StudyMembershipStats, Study 상세의 cache를 직접 갱신
+            joined = created + reactivated
+            if joined:
+                schedule_pks = list(Schedule.objects.filter(study=study).values_list('pk', flat=True))
+                Attendance.objects.bulk_create(
+                    [
+                        Attendance(user_id=user_id, schedule_id=schedule_pk)
+                        for user_id in joined
+                        for schedule_pk in schedule_pks
+                    ],
+                    batch_size=1000,
+                    ignore_conflicts=True,
+                )
+                StudyMembershipStats.objects.rebuild(study=study, user_id__in=joined)
+                study_detail_cache.invalidate(study.pk)
+        return {
+            'study': study.pk,
+            'created': created,
+            'reactivated': reactivated,
+            'existing': existing,
+        }
+
+    def update(self, instance, validated_data):
+        raise MethodNotAllowed('update는 허용하지 않습니다')
+
+    def to_representation(self, instance):
+        return instance
+
+
+class StudyMembershipBulkCreateResultSerializer(serializers.Serializer):
+    """
+    StudyMembershipBulkCreateSerializer의 응답 (문서화용)
+    """
+    study = serializers.IntegerField(help_text='Study의 pk')
+    created = serializers.ListField(child=serializers.IntegerField(), help_text='멤버십이 생성된 User의 pk 목록')
+    reactivated = serializers.ListField(
+        child=serializers.IntegerField(), help_text='탈퇴한 멤버십이 다시 참여 상태가 된 User의 pk 목록')
+    existing = serializers.ListField(
+        child=serializers.IntegerField(), help_text='이미 참여중이어서 변경되지 않은 User의 pk 목록')
+
+
 class StudyMembershipUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudyMembership
@@ -41,7 +180,7 @@ class StudyMembershipUpdateSerializer(serializers.ModelSerializer):
         return StudyMembershipSerializer(instance).data
 
 
-class StudyMembershipAttendanceSerializer(serializers.ModelSerializer):
+class StudyMembershipAttendanceSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     vote_display = serializers.CharField(source='get_vote_display')
     att_display = serializers.CharField(source='get_att_display')
     schedule = ScheduleSerializer()
@@ -58,7 +197,7 @@ class StudyMembershipAttendanceSerializer(serializers.ModelSerializer):
         )
 
 
-class StudyMembershipSimpleSerializer(serializers.ModelSerializer):
+class StudyMembershipSimpleSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer()
     role_display = serializers.CharField(source='get_role_display')
 
@@ -67,18 +206,24 @@ class StudyMembershipSimpleSerializer(serializers.ModelSerializer):
         fields = STUDY_MEMBER_FIELDS
 
 
+# ?expand=로 nested serializer로 표현할 관계 (utils.drf.sparse)
+# study는 확장하지 않으면 pk, study_memberships와 study_schedules는 확장하지 않으면 제외
+STUDY_MEMBERSHIP_EXPANDABLE_FIELDS = {
+    'study': (StudySerializer, {}),
+    'study_memberships': (StudyMembershipSimpleSerializer, {'source': 'study.membership_set', 'many': True}),
+    'study_schedules': (ScheduleSerializer, {'source': 'study.schedule_set', 'many': True}),
+}
+
+
 class StudyMembershipSerializer(StudyMembershipSimpleSerializer):
-    study = StudySerializer()
-    study_memberships = StudyMembershipSimpleSerializer(source='study.membership_set', many=True)
-    study_schedules = ScheduleSerializer(source='study.schedule_set', many=True)
+    study = serializers.PrimaryKeyRelatedField(read_only=True, help_text='Study의 pk (expand=study이면 Study 정보)')
 
     class Meta:
         model = StudyMembership
         fields = STUDY_MEMBER_FIELDS + (
             'study',
-            'study_memberships',
-            'study_schedules',
         )
+        expandable_fields = STUDY_MEMBERSHIP_EXPANDABLE_FIELDS
 
 
 class StudyMembershipDetailSerializer(StudyMembershipSerializer):
@@ -88,7 +233,56 @@ class StudyMembershipDetailSerializer(StudyMembershipSerializer):
         model = StudyMembership
         fields = STUDY_MEMBER_FIELDS + (
             'study',
-            'study_memberships',
-            'study_schedules',
             'attendance_set',
         )
+        expandable_fields = STUDY_MEMBERSHIP_EXPANDABLE_FIELDS
+
+
+class StudyMembershipStatsSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
+    user = serializers.IntegerField(source='membership.user_id', help_text='User의 pk(id)')
+    study = serializers.IntegerField(source='membership.study_id', help_text='Study의 pk(id)')
+    vote_match_rate = serializers.FloatField(
+        help_text='사전 투표와 실제 참석 결과가 일치한 비율 (비교할 출석이 없을 경우 null)', read_only=True,
+    )
+
+    class Meta:
+        model = StudyMembershipStats
+        fields = (
+            'membership',
+            'user',
+            'study',
+            'attend_count',
+            'late_count',
+            'absent_count',
+            'unvoted_count',
+            'vote_compared_count',
+            'vote_match_count',
+            'vote_match_rate',
+        )
+
+
+class DashboardMembershipSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
+    """
+    대시보드에서 인증된 User의 멤버십을 나타내기 위한 Serializer
+    """
+    role_display = serializers.CharField(source='get_role_display')
+    study = StudySerializer()
+    upcoming_schedules = ScheduleSerializer(
+        source='study.upcoming_schedule_list', many=True,
+        help_text='시작 일시가 현재 이후인 일정 (시작 일시 순서)',
+    )
+
+    class Meta:
+        model = StudyMembership
+        fields = (
+            'pk',
+            'role',
+            'role_display',
+            'study',
+            'upcoming_schedules',
+        )
+
+
+class DashboardSerializer(serializers.Serializer):
+    user = UserSerializer()
+    memberships = DashboardMembershipSerializer(many=True, help_text='탈퇴하지 않은 스터디멤버십 목록')
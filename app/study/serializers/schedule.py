@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from members.serializers import UserSerializer
+from utils.drf.compiled import CompiledSerializerMixin
 from ..models import (
     Attendance,
     Schedule,
@@ -18,9 +19,39 @@ SCHEDULE_FIELDS = (
 
     'self_attendance',
 )
+# Attendance의 사전 투표(vote), 실제 참석 결과(att)별 수
+SCHEDULE_COUNT_FIELDS = (
+    'vote_attend_count',
+    'vote_late_count',
+    'vote_absent_count',
+    'att_attend_count',
+    'att_late_count',
+    'att_absent_count',
+)
+
+
+def _self_attendance_prefetch(request):
+    return Schedule.objects.self_attendance_prefetch(getattr(request, 'user', None))
+
 
+def _self_attendance_values(request):
+    queryset = Schedule.objects.self_attendance_queryset(getattr(request, 'user', None))
+    if queryset is None:
+        return None
+    return queryset, 'schedule'
 
-class ScheduleAttendanceSerializer(serializers.ModelSerializer):
+
+# QueryPlan에서 self_attendance property에 필요한 Prefetch
+SCHEDULE_PREFETCH_HOOKS = {
+    'self_attendance': _self_attendance_prefetch,
+}
+# ValuesPlan에서 self_attendance property를 불러올 queryset
+SCHEDULE_VALUES_HOOKS = {
+    'self_attendance': _self_attendance_values,
+}
+
+
+class ScheduleAttendanceSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """
     Schedule detail에서 해당 Schedule에 속한 attendance_set을 나타내기 위한 Serializer
     """
@@ -40,7 +71,7 @@ class ScheduleAttendanceSerializer(serializers.ModelSerializer):
         )
 
 
-class ScheduleSelfAttendanceSerializer(serializers.ModelSerializer):
+class ScheduleSelfAttendanceSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     """
     Schedule list/detail에서 request.user가 존재할 경우,
     해당 User의 출석(Attendance)상태를 보여주기 위한 Serializer
@@ -59,14 +90,20 @@ class ScheduleSelfAttendanceSerializer(serializers.ModelSerializer):
         )
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     self_attendance = ScheduleSelfAttendanceSerializer(
         help_text='인증된 사용자의 출석 객체, 인증되지 않았거나 없는경우 null', read_only=True,
     )
 
     class Meta:
         model = Schedule
-        fields = SCHEDULE_FIELDS
+        fields = SCHEDULE_FIELDS + SCHEDULE_COUNT_FIELDS
+        prefetch_hooks = SCHEDULE_PREFETCH_HOOKS
+        values_hooks = SCHEDULE_VALUES_HOOKS
+        # ?expand=study (study.serializers.study는 이 모듈을 import하므로 경로로 지정)
+        expandable_fields = {
+            'study': ('study.serializers.study.StudySerializer', {}),
+        }
 
 
 class ScheduleCreateSerializer(serializers.ModelSerializer):
@@ -83,15 +120,17 @@ class ScheduleDetailSerializer(ScheduleSerializer):
 
     class Meta:
         model = Schedule
-        fields = SCHEDULE_FIELDS + (
+        fields = SCHEDULE_FIELDS + SCHEDULE_COUNT_FIELDS + (
             'attendance_set',
         )
+        prefetch_hooks = SCHEDULE_PREFETCH_HOOKS
 
 
 class ScheduleUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Schedule
         fields = SCHEDULE_FIELDS
+        prefetch_hooks = SCHEDULE_PREFETCH_HOOKS
 
     def to_representation(self, instance):
         return ScheduleSerializer(instance).data
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from members.serializers import UserSerializer
+from utils.drf.compiled import CompiledSerializerMixin
 from ..models import (
     StudyCategory,
     StudyIcon,
@@ -36,7 +37,7 @@ __all__ = (
 )
 
 
-class StudyCategorySerializer(serializers.ModelSerializer):
+class StudyCategorySerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = StudyCategory
         fields = (
@@ -45,7 +46,7 @@ class StudyCategorySerializer(serializers.ModelSerializer):
         )
 
 
-class StudyIconSerializer(serializers.ModelSerializer):
+class StudyIconSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = StudyIcon
         fields = (
@@ -55,7 +56,7 @@ class StudyIconSerializer(serializers.ModelSerializer):
         )
 
 
-class StudySerializer(serializers.ModelSerializer):
+class StudySerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     category = StudyCategorySerializer()
     icon = StudyIconSerializer()
     author = UserSerializer()
@@ -94,7 +95,7 @@ class StudyUpdateSerializer(serializers.ModelSerializer):
         return StudySerializer(instance).data
 
 
-class _StudyDetailMembershipSerializer(serializers.ModelSerializer):
+class _StudyDetailMembershipSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     from .membership import StudyMembershipAttendanceSerializer
     """
     StudyDetailSerializer에서, membership_set을 표현하기 위한 Serializer
@@ -120,3 +121,10 @@ class StudyDetailSerializer(StudySerializer):
             'membership_set',
             'schedule_set',
         )
+
+    def to_representation(self, instance):
+        # ?fields=로 membership_set의 attendance_set을 제외한 경우에는 불러오지 않음
+        membership_set = self.fields.get('membership_set')
+        if membership_set is not None and 'attendance_set' in membership_set.child.fields:
+            instance.set_membership_attendances()
+        return super().to_representation(instance)
@@ -0,0 +1,152 @@
+import threading
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from members.serializers import UserSerializer
+from .cache import study_detail_cache
+from .models import Study, Schedule, StudyMembership, Attendance, StudyMembershipStats
+
+User = get_user_model()
+
+# Study 상세에 표현되는 User의 필드 (이 필드들이 변경될 때만 cache를 무효화)
+USER_PROFILE_FIELDS = frozenset(UserSerializer.Meta.fields)
+
+_state = threading.local()
+
+
+def get_deleting_instances(model):
+    """
+    현재 thread에서 삭제중인(pre_delete ~ post_delete) model의 {pk: instance}
+    삭제되는 Schedule에 속한 Attendance들은 개별 처리를 생략하고, Schedule 삭제 후 한 번에 처리
+    """
+    if not hasattr(_state, 'deleting'):
+        _state.deleting = defaultdict(dict)
+    return _state.deleting[model]
+
+
+def is_study_deleting(study_id):
+    return study_id in get_deleting_instances(Study)
+
+
+def is_schedule_deleting(schedule_id):
+    return schedule_id in get_deleting_instances(Schedule)
+
+
+def _get_study_id(attendance, schedule_id):
+    if attendance.schedule_id == schedule_id:
+        return attendance.schedule.study_id
+    return Schedule._base_manager.filter(pk=schedule_id).values_list('study_id', flat=True).first()
+
+
+def update_attendance_counts(attendance, old_values, new_values):
+    """
+    출석값의 변경(old_values -> new_values)을 Schedule의 출석 수와 StudyMembershipStats에 반영
+    """
+    if old_values == new_values:
+        return
+    schedule_counter = Counter()
+    stats_counter = Counter()
+    for values, value in ((new_values, 1), (old_values, -1)):
+        if values is None:
+            continue
+        for key in Attendance.get_count_keys(values):
+            schedule_counter[key] += value
+        field_names = StudyMembershipStats.get_count_field_names(values)
+        if field_names:
+            study_id = _get_study_id(attendance, values['schedule_id'])
+            for field_name in field_names:
+                stats_counter[(values['user_id'], study_id, field_name)] += value
+    Schedule.objects.update_attendance_counts(schedule_counter)
+    # 삭제시에는 통계가 없는(함께 삭제되는 중인) 멤버십의 통계를 다시 생성하지 않음
+    StudyMembershipStats.objects.update_counts(stats_counter, rebuild=new_values is not None)
+
+
+def invalidate_attendance_study_detail(attendance, *values_list):
+    """
+    출석값(Attendance.get_tracked_values())들의 Schedule이 속한 Study의 상세 cache를 무효화
+    """
+    schedule_ids = {values['schedule_id'] for values in values_list if values}
+    invalidate_study_detail(*(_get_study_id(attendance, schedule_id) for schedule_id in schedule_ids))
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, raw, **kwargs):
+    values = instance.get_tracked_values()
+    loaded_values = getattr(instance, 'loaded_values', None)
+    if not raw:
+        update_attendance_counts(instance, loaded_values, values)
+        instance.loaded_values = values
+    # 다른 Schedule로 옮겨진 경우, 이전 Schedule의 Study도 무효화
+    invalidate_attendance_study_detail(instance, loaded_values, values)
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, **kwargs):
+    # 삭제되는 Schedule의 출석은 Schedule의 post_delete에서 한 번에 반영, 무효화
+    if is_schedule_deleting(instance.schedule_id):
+        return
+    values = getattr(instance, 'loaded_values', None) or instance.get_tracked_values()
+    update_attendance_counts(instance, values, None)
+    invalidate_attendance_study_detail(instance, values, instance.get_tracked_values())
+
+
+@receiver(pre_delete, sender=Study)
+@receiver(pre_delete, sender=Schedule)
+def instance_deleting(sender, instance, **kwargs):
+    get_deleting_instances(sender)[instance.pk] = instance
+
+
+@receiver(post_delete, sender=Study)
+def study_deleted(sender, instance, **kwargs):
+    get_deleting_instances(sender).pop(instance.pk, None)
+
+
+@receiver(post_delete, sender=Schedule)
+def schedule_deleted(sender, instance, **kwargs):
+    deleting_schedules = get_deleting_instances(sender)
+    deleting_schedules.pop(instance.pk, None)
+    # Study와 함께 삭제되는 경우, 멤버십과 통계도 함께 삭제되므로 다시 생성하지 않음
+    if is_study_deleting(instance.study_id):
+        return
+    # 같은 Study의 Schedule들이 모두 삭제된 후, 삭제된 출석들을 StudyMembershipStats에 한 번에 반영
+    if not any(schedule.study_id == instance.study_id for schedule in deleting_schedules.values()):
+        StudyMembershipStats.objects.rebuild(study_id=instance.study_id)
+
+
+@receiver(post_save, sender=StudyMembership)
+def membership_saved(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        StudyMembershipStats.objects.rebuild(pk=instance.pk)
+
+
+def invalidate_study_detail(*study_ids):
+    for study_id in set(study_ids):
+        if study_id is not None:
+            study_detail_cache.invalidate(study_id)
+
+
+@receiver([post_save, post_delete], sender=Study)
+def study_changed(sender, instance, **kwargs):
+    invalidate_study_detail(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Schedule)
+@receiver([post_save, post_delete], sender=StudyMembership)
+def study_relation_changed(sender, instance, **kwargs):
+    # 삭제되는 Study는 Study의 post_delete에서 무효화
+    if is_study_deleting(instance.study_id):
+        return
+    invalidate_study_detail(instance.study_id)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw, update_fields, **kwargs):
+    # 로그인시의 last_login 갱신 등, Study 상세에 표현되지 않는 필드만 변경된 경우는 제외
+    if created or raw or (update_fields and not USER_PROFILE_FIELDS & set(update_fields)):
+        return
+    study_ids = list(StudyMembership.objects.filter(user=instance).values_list('study_id', flat=True))
+    study_ids += Study.objects.filter(author=instance).values_list('pk', flat=True)
+    invalidate_study_detail(*study_ids)
@@ -1,3 +1,1030 @@
-from django.test import TestCase
+import copy
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.forms import model_to_dict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from members.models import User
+from utils.drf.compiled import CompiledSerializerMixin
+from .apis import (
+    StudyCategoryListCreateAPIView,
+    StudyIconListAPIView,
+    StudyListCreateAPIView,
+    StudyRetrieveUpdateDestroyAPIView,
+    StudyRetrieveByInviteTokenAPIView,
+    StudyMembershipListCreateAPIView,
+    StudyMembershipRetrieveUpdateDestroyAPIView,
+    StudyMembershipStatsListAPIView,
+    ScheduleListCreateAPIView,
+    ScheduleRetrieveUpdateDestroyAPIView,
+    AttendanceListCreateAPIView,
+    AttendanceRetrieveUpdateDestroyAPIView,
+    DashboardAPIView,
+)
+from .cache import study_detail_cache
+from .filters import ScheduleFilter, StudyMembershipListFilter, AttendanceFilter
+from .models import (
+    StudyCategory,
+    StudyIcon,
+    Study,
+    StudyMembership,
+    Schedule,
+    Attendance,
+    StudyInviteToken,
+    StudyMembershipStats,
+)
+from .serializers.schedule import SCHEDULE_COUNT_FIELDS
+
+STATS_COUNT_FIELDS = (
+    'attend_count', 'late_count', 'absent_count', 'unvoted_count', 'vote_compared_count', 'vote_match_count',
+)
+
+
+class FilterIndexTest(TestCase):
+    """
+    각 Filter가 사용하는 조건+정렬에 해당하는 index를 실제로 사용하는지 EXPLAIN으로 확인
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = StudyCategory.objects.create(name='카테고리')
+        users = [
+            User.objects.create_user(email=f'user{index}@test.com', password='password', type=User.TYPE_EMAIL)
+            for index in range(5)
+        ]
+        for study_index in range(5):
+            study = Study.objects.create(category=category, name=f'스터디{study_index}')
+            for user in users:
+                StudyMembership.objects.create(user=user, study=study, is_withdraw=user == users[0])
+            for schedule_index in range(5):
+                Schedule.objects.create(study=study)
+        cls.user = users[1]
+        cls.study = study
+        cls.schedule = Schedule.objects.first()
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # 데이터가 적은 테스트 DB에서도 index 사용 가능여부를 확인하기 위해 sequential scan을 사용하지 않음
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_schedule_filter(self):
+        queryset = ScheduleFilter({'study': self.study.pk}, queryset=Schedule.objects.all()).qs
+        self.assertUsesIndex(queryset, 'schedule_study_idx')
+
+    def test_membership_filter_active_user(self):
+        queryset = StudyMembershipListFilter(
+            {'user': self.user.pk, 'is_withdraw': False}, queryset=StudyMembership.objects.all()).qs
+        self.assertUsesIndex(queryset, 'membership_active_user_idx')
+
+    def test_membership_filter_active_study(self):
+        queryset = StudyMembershipListFilter(
+            {'study': self.study.pk, 'is_withdraw': False}, queryset=StudyMembership.objects.all()).qs
+        self.assertUsesIndex(queryset, 'membership_active_study_idx')
+
+    def test_attendance_filter_vote(self):
+        queryset = AttendanceFilter(
+            {'schedule': self.schedule.pk, 'vote': Attendance.VOTE_ATTEND}, queryset=Attendance.objects.all()).qs
+        self.assertUsesIndex(queryset, 'attendance_schedule_vote_idx')
+
+    def test_attendance_filter_att(self):
+        queryset = AttendanceFilter(
+            {'schedule': self.schedule.pk, 'att': Attendance.VOTE_ATTEND}, queryset=Attendance.objects.all()).qs
+        self.assertUsesIndex(queryset, 'attendance_schedule_att_idx')
+
+
+@override_settings(STUDY_DETAIL_CACHE_TIMEOUT=0)
+class RepresentationParityTest(TestCase):
+    """
+    응답이 DRF ModelSerializer만을 사용한 응답과 byte단위로 같은지 확인하기 위한 TestCase
+    (Study 상세의 cache는 사용하지 않음)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = StudyCategory.objects.create(name='카테고리')
+        icon = StudyIcon.objects.create(name='아이콘')
+        users = [
+            User.objects.create_user(
+                email=f'user{index}@test.com', password='password', type=User.TYPE_EMAIL,
+                name=f'유저{index}', nickname=f'닉네임{index}' if index % 2 else None,
+                phone_number='010-1234-5678' if index % 3 else '',
+            )
+            for index in range(6)
+        ]
+        users[-1].delete()
+        start_at = timezone.now()
+        for study_index in range(3):
+            # icon이 없는 Study 포함
+            study = Study.objects.create(
+                category=category, icon=icon if study_index else None, author=users[study_index],
+                name=f'스터디{study_index}',
+            )
+            for index, user in enumerate(users):
+                StudyMembership.objects.create(
+                    user=user, study=study, is_withdraw=index == 4,
+                    role=StudyMembership.ROLE_MAIN_MANAGER if index == 0 else StudyMembership.ROLE_NORMAL,
+                )
+            for schedule_index in range(3):
+                Schedule.objects.create(
+                    study=study, subject=f'일정{schedule_index}', location='강남역',
+                    start_at=start_at + timedelta(days=schedule_index), studying_time=timedelta(hours=2),
+                )
+        choices = [value for value, display in Attendance.CHOICES_VOTE] + ['']
+        for index, attendance in enumerate(Attendance.objects.all()):
+            attendance.vote = choices[index % 4]
+            attendance.att = choices[index % 3]
+            attendance.save()
+        cls.user = users[1]
+        cls.study = study
+        cls.schedule = Schedule.objects.filter(study=study).first()
+        cls.membership = StudyMembership.objects.filter(study=study, user=cls.user).first()
+        cls.attendance = Attendance.objects.filter(schedule=cls.schedule).first()
+        cls.invite_token = StudyInviteToken.objects.create(study=study)
+
+    def render(self, view_class, path, user=None, view_kwargs=None, **initkwargs):
+        request = APIRequestFactory().get(path)
+        if user:
+            force_authenticate(request, user=user)
+        response = view_class.as_view(**initkwargs)(request, **(view_kwargs or {}))
+        return response.status_code, response.render().content
+
+    def render_drf(self, view_class, path, user=None, view_kwargs=None):
+        initkwargs = {'values_plan': False} if hasattr(view_class, 'values_plan') else {}
+        with mock.patch.object(
+                CompiledSerializerMixin, 'to_representation', serializers.ModelSerializer.to_representation):
+            return self.render(view_class, path, user, view_kwargs, **initkwargs)
+
+    def assertParity(self, view_class, path, view_kwargs=None, **initkwargs):
+        for user in (None, self.user):
+            with self.subTest(path=path, user=user):
+                expected = self.render_drf(view_class, path, user, view_kwargs)
+                if user:
+                    self.assertEqual(expected[0], 200)
+                self.assertEqual(self.render(view_class, path, user, view_kwargs, **initkwargs), expected)
+
+
+class ValuesPlanParityTest(RepresentationParityTest):
+    """
+    ValuesPlanMixin을 사용한 목록 API
+    """
+
+    def assertParity(self, view_class, path, view_kwargs=None, **initkwargs):
+        super().assertParity(view_class, path, view_kwargs, values_plan=True)
+
+    def test_attendance_list(self):
+        self.assertParity(AttendanceListCreateAPIView, '/api/v1/study/attendances/')
+        self.assertParity(AttendanceListCreateAPIView, f'/api/v1/study/attendances/?schedule={self.schedule.pk}')
+        self.assertParity(AttendanceListCreateAPIView, '/api/v1/study/attendances/?page_size=5')
+
+    def test_schedule_list(self):
+        self.assertParity(ScheduleListCreateAPIView, '/api/v1/study/schedules/')
+        self.assertParity(ScheduleListCreateAPIView, f'/api/v1/study/schedules/?study={self.study.pk}')
+
+    def test_membership_list(self):
+        self.assertParity(StudyMembershipListCreateAPIView, '/api/v1/study/memberships/')
+        self.assertParity(StudyMembershipListCreateAPIView, f'/api/v1/study/memberships/?user={self.user.pk}')
+        self.assertParity(StudyMembershipListCreateAPIView, '/api/v1/study/memberships/?page_size=4')
+        self.assertParity(
+            StudyMembershipListCreateAPIView, '/api/v1/study/memberships/?expand=study,studyMemberships,studySchedules')
+
+
+class CompiledSerializerParityTest(RepresentationParityTest):
+    """
+    CompiledSerializerMixin(SerializerPlan)을 사용한 API
+    """
+
+    def test_lists(self):
+        self.assertParity(StudyCategoryListCreateAPIView, '/api/v1/study/category/')
+        self.assertParity(StudyIconListAPIView, '/api/v1/study/icons/')
+        self.assertParity(StudyListCreateAPIView, '/api/v1/study/')
+        self.assertParity(StudyMembershipStatsListAPIView, '/api/v1/study/memberships/stats/')
+        self.assertParity(AttendanceListCreateAPIView, '/api/v1/study/attendances/', values_plan=False)
+        self.assertParity(ScheduleListCreateAPIView, '/api/v1/study/schedules/', values_plan=False)
+        self.assertParity(StudyMembershipListCreateAPIView, '/api/v1/study/memberships/', values_plan=False)
+
+    def test_details(self):
+        self.assertParity(StudyRetrieveUpdateDestroyAPIView, '/', {'pk': self.study.pk})
+        self.assertParity(StudyRetrieveByInviteTokenAPIView, '/', {'token': self.invite_token.key})
+        self.assertParity(StudyMembershipRetrieveUpdateDestroyAPIView, '/', {'pk': self.membership.pk})
+        self.assertParity(ScheduleRetrieveUpdateDestroyAPIView, '/', {'pk': self.schedule.pk})
+        self.assertParity(AttendanceRetrieveUpdateDestroyAPIView, '/', {'pk': self.attendance.pk})
+        self.assertParity(AttendanceRetrieveUpdateDestroyAPIView, '/?expand=study,schedule.study', {
+            'pk': self.attendance.pk})
+        self.assertParity(StudyMembershipRetrieveUpdateDestroyAPIView, '/?expand=study,studyMemberships', {
+            'pk': self.membership.pk})
+
+
+class StreamingListTest(RepresentationParityTest):
+    """
+    ?stream=true 목록이 페이지를 나눈 목록의 결과를 모두 이은 것과 같은지 확인
+    """
+
+    def stream(self, view_class, path, **initkwargs):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=self.user)
+        response = view_class.as_view(stream_chunk_size=4, **initkwargs)(request)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def assertStreamParity(self, view_class, path):
+        separator = '&' if '?' in path else '?'
+        status_code, content = self.render(view_class, f'{path}{separator}page_size=100', self.user)
+        expected = json.loads(content)['results']
+        self.assertTrue(expected)
+        for values_plan in (True, False):
+            with self.subTest(path=path, values_plan=values_plan):
+                streamed = self.stream(view_class, f'{path}{separator}stream=true', values_plan=values_plan)
+                self.assertEqual(streamed, expected)
+
+    def test_stream(self):
+        self.assertStreamParity(AttendanceListCreateAPIView, '/api/v1/study/attendances/')
+        self.assertStreamParity(AttendanceListCreateAPIView, f'/api/v1/study/attendances/?schedule={self.schedule.pk}')
+        self.assertStreamParity(ScheduleListCreateAPIView, '/api/v1/study/schedules/')
+        self.assertStreamParity(StudyMembershipListCreateAPIView, '/api/v1/study/memberships/')
+        self.assertStreamParity(StudyMembershipListCreateAPIView, '/api/v1/study/memberships/?expand=studySchedules')
+
+    def test_stream_empty(self):
+        study = Study.objects.create(category=self.study.category, author=self.user, name='멤버가 없는 스터디')
+        path = f'/api/v1/study/schedules/?study={study.pk}&stream=true'
+        self.assertEqual(self.stream(ScheduleListCreateAPIView, path), [])
+
+
+class ConditionalTestMixin:
+    """
+    ETag를 사용한 조건부 GET
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertChanged(self, path, etag, changed=True):
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200 if changed else 304)
+        return response['ETag']
+
+    def assertConditional(self, path, *changes, num_queries=1):
+        """
+        changes의 각 함수를 실행한 후 ETag가 바뀌는지 확인
+        """
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        for change in changes:
+            with self.subTest(path=path, change=change.__name__):
+                change()
+                etag = self.assertChanged(path, etag)
+                self.assertChanged(path, etag, changed=False)
+
+    def vote(self):
+        attendance = Attendance.objects.filter(schedule__study=self.study, user=self.user).first()
+        attendance.vote = Attendance.VOTE_LATE if attendance.vote != Attendance.VOTE_LATE else Attendance.VOTE_ATTEND
+        attendance.save()
+
+    def update_user(self):
+        self.user.nickname = f'{self.user.nickname}!'
+        self.user.save()
+
+    def delete_schedule(self):
+        Schedule.objects.filter(study=self.study).last().delete()
+
+
+class ConditionalGetTest(ConditionalTestMixin, RepresentationParityTest):
+    def test_study_detail(self):
+        self.assertConditional(f'/api/v1/study/{self.study.pk}/', self.vote, self.update_user, self.delete_schedule)
+
+    def test_schedule_detail(self):
+        self.assertConditional(f'/api/v1/study/schedules/{self.schedule.pk}/', self.vote, self.update_user)
+
+    def test_schedule_list(self):
+        # study filter의 값 검증(Study 조회)을 포함
+        self.assertConditional(
+            f'/api/v1/study/schedules/?study={self.study.pk}', self.vote, self.delete_schedule, num_queries=2)
+        # 존재하지 않는 Study는 오류
+        self.assertEqual(self.client.get('/api/v1/study/schedules/?study=0').status_code, 400)
+
+    def test_membership_list(self):
+        path = f'/api/v1/study/memberships/?user={self.user.pk}'
+        self.assertConditional(f'{path}&expand=study,studyMemberships,studySchedules', self.vote, self.delete_schedule)
+        self.assertConditional(path, self.update_user)
+        # 확장하지 않은 관계의 변경은 반영하지 않음
+        etag = self.client.get(path)['ETag']
+        self.vote()
+        self.assertChanged(path, etag, changed=False)
+
+    def test_if_modified_since(self):
+        # 삭제된 행은 최대 modified에 반영되지 않으므로, If-Modified-Since만 보낸 요청은 항상 새로 응답
+        paths = {
+            f'/api/v1/study/{self.study.pk}/': lambda data: data['membership_set'],
+            f'/api/v1/study/memberships/?study={self.study.pk}': lambda data: data['results'],
+        }
+        for path in paths:
+            self.assertEqual(self.client.get(path, HTTP_IF_MODIFIED_SINCE=http_date()).status_code, 200)
+        membership = StudyMembership.objects.filter(study=self.study).exclude(user=self.user).last()
+        membership.delete()
+        for path, get_memberships in paths.items():
+            with self.subTest(path=path):
+                response = self.client.get(path, HTTP_IF_MODIFIED_SINCE=http_date())
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn(membership.pk, [item['pk'] for item in get_memberships(response.data)])
+
+    def test_etag_per_user(self):
+        path = f'/api/v1/study/{self.study.pk}/'
+        etag = self.client.get(path)['ETag']
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@override_settings(STUDY_DETAIL_CACHE_TIMEOUT=60)
+class StudyDetailCacheTest(ConditionalGetTest):
+    """
+    Study 상세 응답의 cache와 signal을 사용한 무효화
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.path = f'/api/v1/study/{self.study.pk}/'
+
+    def assertCached(self, client=None, num_queries=2):
+        """
+        cache된 응답에서는 조건부 GET의 validator와 variant(멤버십 여부)를 구하는 쿼리만 실행
+        """
+        client = client or self.client
+        expected = client.get(self.path).content
+        with self.assertNumQueries(num_queries):
+            content = client.get(self.path).content
+        self.assertEqual(content, expected)
+        return content
+
+    def test_cached(self):
+        content = self.assertCached()
+        with override_settings(STUDY_DETAIL_CACHE_TIMEOUT=0):
+            self.assertEqual(self.client.get(self.path).content, content)
+
+    def test_invalidate(self):
+        for change in (self.vote, self.update_user, self.delete_schedule):
+            with self.subTest(change=change.__name__):
+                content = self.assertCached()
+                change()
+                self.assertNotEqual(self.client.get(self.path).content, content)
+
+    def test_invalidate_moved_attendance(self):
+        # 다른 Study의 Schedule로 옮긴 경우, 이전/이후 Study를 모두 무효화
+        attendance = Attendance.objects.filter(user=self.user).exclude(schedule__study=self.study).first()
+        study_pk_list = (self.study.pk, attendance.schedule.study_id)
+        Attendance.objects.filter(schedule=self.schedule, user=self.user).delete()
+        versions = [study_detail_cache.get_version(pk) for pk in study_pk_list]
+        attendance.schedule = self.schedule
+        attendance.save()
+        self.assertNotEqual(versions[0], study_detail_cache.get_version(study_pk_list[0]))
+        self.assertNotEqual(versions[1], study_detail_cache.get_version(study_pk_list[1]))
+
+    def test_update_last_login(self):
+        content = self.assertCached()
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.path).content, content)
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'api.example.com'])
+    def test_variant_per_host(self):
+        # 이미지의 URL은 요청의 scheme, host를 포함한 절대 URL
+        StudyIcon.objects.filter(pk=self.study.icon_id).update(image='study/icons/icon.png')
+        content = self.assertCached()
+        self.assertIn(b'http://testserver/', content)
+        content = self.client.get(self.path, HTTP_HOST='api.example.com', secure=True).content
+        self.assertIn(b'https://api.example.com/', content)
+        self.assertNotIn(b'http://testserver/', content)
+
+    def test_variant_per_user(self):
+        member_content = self.assertCached()
+        anonymous = APIClient()
+        outsider = APIClient()
+        outsider.force_authenticate(User.objects.create_user(
+            email='outsider@test.com', password='password', type=User.TYPE_EMAIL, name='외부인'))
+        self.assertEqual(self.assertCached(anonymous, num_queries=1), self.assertCached(outsider))
+        self.assertNotEqual(anonymous.get(self.path).content, member_content)
+
+
+class DashboardTest(ConditionalTestMixin, RepresentationParityTest):
+    path = '/api/v1/study/dashboard/'
+
+    def test_dashboard(self):
+        withdrawn = StudyMembership.objects.filter(user=self.user).first()
+        withdrawn.withdraw()
+        with self.assertNumQueries(4):
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user']['pk'], self.user.pk)
+
+        memberships = StudyMembership.objects.filter(user=self.user, is_withdraw=False)
+        self.assertEqual([item['pk'] for item in response.data['memberships']], [item.pk for item in memberships])
+        now = timezone.now()
+        for item in response.data['memberships']:
+            schedules = Schedule.objects.filter(study=item['study']['pk'], start_at__gte=now).order_by('start_at')
+            expected = schedules[:DashboardAPIView.upcoming_schedule_count]
+            self.assertEqual([schedule['pk'] for schedule in item['upcoming_schedules']], [s.pk for s in expected])
+            for schedule in item['upcoming_schedules']:
+                attendance = Attendance.objects.get(schedule=schedule['pk'], user=self.user)
+                self.assertEqual(schedule['self_attendance']['pk'], attendance.pk)
+
+    def test_upcoming_schedule_count(self):
+        for index in range(DashboardAPIView.upcoming_schedule_count + 1):
+            Schedule.objects.create(study=self.study, start_at=timezone.now() + timedelta(hours=index + 1))
+        response = self.client.get(self.path)
+        item = next(item for item in response.data['memberships'] if item['study']['pk'] == self.study.pk)
+        self.assertEqual(len(item['upcoming_schedules']), DashboardAPIView.upcoming_schedule_count)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.path).status_code, 401)
+
+    def create_schedule(self):
+        Schedule.objects.create(study=self.study, start_at=timezone.now() + timedelta(minutes=10))
+
+    def test_conditional(self):
+        self.assertConditional(self.path, self.vote, self.update_user, self.create_schedule)
+
+
+class AttendanceCountsTestMixin:
+    """
+    Schedule의 출석 수, StudyMembershipStats가 출석 목록과 일치하는지 확인하기 위한 Mixin
+    """
+
+    def get_counts(self):
+        """
+        Schedule의 출석 수, StudyMembershipStats의 현재 값
+        """
+        schedules = list(Schedule.objects.filter(study=self.study).values('pk', *SCHEDULE_COUNT_FIELDS))
+        stats = list(StudyMembershipStats.objects.filter(membership__study=self.study).values())
+        for item in stats:
+            item.pop('created')
+            item.pop('modified')
+        return schedules, stats
+
+    def assertCountsConsistent(self):
+        # 출석 목록으로부터 다시 계산한 값과 같은지 확인
+        counts = self.get_counts()
+        Schedule.objects.refresh_attendance_counts(study=self.study)
+        StudyMembershipStats.objects.rebuild(study=self.study)
+        self.assertEqual(counts, self.get_counts())
+
+
+class ScheduleCreateTest(AttendanceCountsTestMixin, RepresentationParityTest):
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_schedule(self, study):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/v1/study/schedules/', {'study': study.pk, 'subject': '일정'})
+        self.assertEqual(response.status_code, 201, response.data)
+        return Schedule.objects.get(pk=response.data['pk']), context
+
+    def test_attendances(self):
+        schedule, context = self.create_schedule(self.study)
+        # 탈퇴한 멤버를 제외한 멤버의 출석정보만 생성
+        self.assertEqual(
+            set(schedule.attendance_set.values_list('user_id', flat=True)),
+            set(StudyMembership.objects.filter(
+                study=self.study, is_withdraw=False).values_list('user_id', flat=True)),
+        )
+        withdrawn = StudyMembership.objects.filter(study=self.study, is_withdraw=True).values('user_id')
+        self.assertTrue(withdrawn.exists())
+        self.assertFalse(schedule.attendance_set.filter(user_id__in=withdrawn).exists())
+        self.assertEqual(schedule.attendance_set.filter(vote='').count(), schedule.attendance_set.count())
+        self.assertCountsConsistent()
+
+    def test_query_count(self):
+        # 멤버 수와 관계없이 같은 수의 쿼리
+        small_study = Study.objects.create(category=self.study.category, author=self.user, name='작은 스터디')
+        StudyMembership.objects.create(user=self.user, study=small_study)
+        large_study = Study.objects.create(category=self.study.category, author=self.user, name='큰 스터디')
+        for index in range(20):
+            user = User.objects.create_user(
+                email=f'member{index}@test.com', password='password', type=User.TYPE_EMAIL, name=f'멤버{index}')
+            StudyMembership.objects.create(user=user, study=large_study)
+
+        small_schedule, small_context = self.create_schedule(small_study)
+        large_schedule, large_context = self.create_schedule(large_study)
+        self.assertEqual(small_schedule.attendance_set.count(), 1)
+        self.assertEqual(large_schedule.attendance_set.count(), 20)
+        self.assertEqual(len(small_context), len(large_context))
+
+    def test_update(self):
+        # 일정 수정 시에는 출석정보를 조회/생성하지 않음
+        attendances = list(Attendance.objects.filter(schedule=self.schedule).values())
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                f'/api/v1/study/schedules/{self.schedule.pk}/', {'subject': '수정된 일정'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['subject'], '수정된 일정')
+        table = Attendance._meta.db_table
+        self.assertFalse([query['sql'] for query in context.captured_queries if table in query['sql']])
+        self.assertEqual(list(Attendance.objects.filter(schedule=self.schedule).values()), attendances)
+
+
+class AttendanceCountsTest(AttendanceCountsTestMixin, RepresentationParityTest):
+    def get_schedule_counts(self):
+        return Schedule.objects.filter(pk=self.schedule.pk).values(*SCHEDULE_COUNT_FIELDS).get()
+
+    def assertScheduleCountsChanged(self, before, **changes):
+        expected = {**before, **{name: before[name] + value for name, value in changes.items()}}
+        self.assertEqual(self.get_schedule_counts(), expected)
+
+    def test_save(self):
+        user = StudyMembership.objects.get(study=self.study, is_withdraw=True).user
+        before = self.get_schedule_counts()
+        Attendance.objects.create(
+            user=user, schedule=self.schedule, vote=Attendance.VOTE_ATTEND, att=Attendance.VOTE_LATE)
+        self.assertScheduleCountsChanged(before, vote_attend_count=1, att_late_count=1)
+        self.assertCountsConsistent()
+
+    def test_change_vote(self):
+        attendance = Attendance.objects.filter(schedule=self.schedule, vote=Attendance.VOTE_ATTEND).first()
+        before = self.get_schedule_counts()
+        attendance.vote = Attendance.VOTE_ABSENT
+        attendance.save()
+        self.assertScheduleCountsChanged(before, vote_attend_count=-1, vote_absent_count=1)
+        # 값이 변경되지 않은 저장은 반영하지 않음
+        attendance.save()
+        self.assertScheduleCountsChanged(before, vote_attend_count=-1, vote_absent_count=1)
+        self.assertCountsConsistent()
+
+    def test_delete(self):
+        attendance = Attendance.objects.filter(schedule=self.schedule, vote=Attendance.VOTE_LATE).first()
+        before = self.get_schedule_counts()
+        attendance.delete()
+        self.assertScheduleCountsChanged(before, vote_late_count=-1, **(
+            {f'att_{attendance.att}_count': -1} if attendance.att else {}))
+        self.assertCountsConsistent()
+
+    def test_delete_schedule(self):
+        # 출석 수와 관계없이 같은 수의 쿼리
+        query_counts = []
+        for member_count in (1, 20):
+            study = Study.objects.create(category=self.study.category, author=self.user, name='스터디')
+            for index in range(member_count):
+                user = User.objects.create_user(
+                    email=f'member{member_count}-{index}@test.com', password='password', type=User.TYPE_EMAIL,
+                    name=f'멤버{index}',
+                )
+                StudyMembership.objects.create(user=user, study=study)
+            schedule = Schedule.objects.create(study=study, subject='일정')
+            for attendance in Attendance.objects.filter(schedule=schedule):
+                attendance.vote = Attendance.VOTE_ATTEND
+                attendance.save()
+            with CaptureQueriesContext(connection) as context:
+                schedule.delete()
+            query_counts.append(len(context))
+            self.assertFalse(Attendance.objects.filter(schedule_id=schedule.pk).exists())
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        # setUpTestData의 instance는 test간에 공유되므로 새로 조회한 instance를 삭제
+        Schedule.objects.get(pk=self.schedule.pk).delete()
+        self.assertCountsConsistent()
+
+    def test_refresh_schedule_counts(self):
+        expected = self.get_counts()
+        Schedule.objects.update(**{name: 100 for name in SCHEDULE_COUNT_FIELDS})
+        out = StringIO()
+        call_command('refresh_schedule_counts', study=self.study.pk, stdout=out)
+        self.assertIn('3개', out.getvalue())
+        self.assertEqual(self.get_counts(), expected)
+        # 다른 Study의 Schedule은 갱신하지 않음
+        self.assertFalse(Schedule.objects.exclude(study=self.study).exclude(vote_attend_count=100).exists())
+        self.assertEqual(Schedule.objects.refresh_attendance_counts(), Schedule.objects.count())
+        self.assertFalse(Schedule.objects.filter(vote_attend_count=100).exists())
+
+
+class StudyMembershipStatsTest(AttendanceCountsTestMixin, RepresentationParityTest):
+    def get_stats(self):
+        return StudyMembershipStats.objects.get(membership__user=self.user, membership__study=self.study)
+
+    def test_save(self):
+        attendance = Attendance.objects.get(schedule=self.schedule, user=self.user)
+        attendance.vote, attendance.att = '', ''
+        attendance.save()
+        stats = self.get_stats()
+        attendance.vote, attendance.att = Attendance.VOTE_LATE, Attendance.VOTE_LATE
+        attendance.save()
+        self.assertEqual(
+            model_to_dict(self.get_stats(), fields=STATS_COUNT_FIELDS),
+            {
+                **model_to_dict(stats, fields=STATS_COUNT_FIELDS),
+                'late_count': stats.late_count + 1,
+                'unvoted_count': stats.unvoted_count - 1,
+                'vote_compared_count': stats.vote_compared_count + 1,
+                'vote_match_count': stats.vote_match_count + 1,
+            },
+        )
+        attendance.att = Attendance.VOTE_ABSENT
+        attendance.save()
+        self.assertEqual(self.get_stats().vote_match_count, stats.vote_match_count)
+        self.assertCountsConsistent()
+
+    def test_delete(self):
+        attendance = Attendance.objects.get(schedule=self.schedule, user=self.user)
+        attendance.vote, attendance.att = '', Attendance.VOTE_ATTEND
+        attendance.save()
+        stats = self.get_stats()
+        attendance.delete()
+        self.assertEqual(self.get_stats().attend_count, stats.attend_count - 1)
+        self.assertEqual(self.get_stats().unvoted_count, stats.unvoted_count - 1)
+        self.assertCountsConsistent()
+
+    def test_delete_study(self):
+        # 멤버와 출석이 있는 Study를 삭제해도 삭제되는 멤버십의 통계를 다시 생성하지 않음
+        membership_pk_list = list(StudyMembership.objects.filter(study=self.study).values_list('pk', flat=True))
+        self.assertTrue(Attendance.objects.filter(schedule__study=self.study).exists())
+        with CaptureQueriesContext(connection) as context, \
+                mock.patch.object(StudyMembershipStats.objects, 'rebuild') as rebuild:
+            Study.objects.get(pk=self.study.pk).delete()
+        rebuild.assert_not_called()
+        connection.check_constraints()
+        table = StudyMembershipStats._meta.db_table
+        self.assertFalse([
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE')) and table in query['sql']
+        ])
+        self.assertFalse(StudyMembership.objects.filter(pk__in=membership_pk_list).exists())
+        self.assertFalse(StudyMembershipStats.objects.filter(membership_id__in=membership_pk_list).exists())
+        self.assertEqual(StudyMembershipStats.objects.count(), StudyMembership.objects.count())
+
+    def test_rebuild(self):
+        expected = self.get_counts()
+        StudyMembershipStats.objects.filter(membership__study=self.study).update(attend_count=100)
+        StudyMembershipStats.objects.filter(membership__user=self.user).delete()
+        self.assertEqual(StudyMembershipStats.objects.rebuild(study=self.study), 6)
+        self.assertEqual(self.get_counts(), expected)
+        # 통계가 없는 멤버십의 통계는 다시 생성
+        self.assertEqual(StudyMembershipStats.objects.rebuild(user=self.user), 3)
+        self.assertEqual(StudyMembershipStats.objects.count(), StudyMembership.objects.count())
+
+    def test_rebuild_command(self):
+        expected = self.get_counts()
+        StudyMembershipStats.objects.update(attend_count=100)
+        out = StringIO()
+        call_command('rebuild_membership_stats', study=self.study.pk, stdout=out)
+        self.assertIn('6개', out.getvalue())
+        self.assertEqual(self.get_counts(), expected)
+        # 다른 Study의 통계는 다시 생성하지 않음
+        self.assertFalse(StudyMembershipStats.objects.exclude(membership__study=self.study).exclude(
+            attend_count=100).exists())
+
+    def test_list(self):
+        response = APIClient().get(
+            '/api/v1/study/memberships/stats/', {'study': self.study.pk, 'user': self.user.pk})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 1)
+        stats = self.get_stats()
+        self.assertEqual(results[0]['membership'], stats.pk)
+        self.assertEqual(results[0]['study'], self.study.pk)
+        self.assertEqual(results[0]['lateCount'], stats.late_count)
+        self.assertEqual(results[0]['voteMatchRate'], stats.vote_match_rate)
+
+
+class AttendanceBulkUpdateTest(AttendanceCountsTestMixin, RepresentationParityTest):
+    def setUp(self):
+        self.client = APIClient()
+        self.path = f'/api/v1/study/schedules/{self.schedule.pk}/attendances/'
+
+    def patch(self, attendances):
+        return self.client.patch(self.path, {'attendances': attendances}, format='json')
+
+    def test_bulk_update(self):
+        attendances = list(Attendance.objects.filter(schedule=self.schedule).order_by('pk'))
+        data = [
+            {'pk': attendances[0].pk, 'att': Attendance.VOTE_ATTEND},
+            {'user': attendances[1].user_id, 'vote': Attendance.VOTE_LATE, 'att': Attendance.VOTE_ABSENT},
+            {'user': attendances[2].user_id, 'vote': '', 'att': ''},
+        ]
+        response = self.patch(data)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['pk'], self.schedule.pk)
+        attendance_dict = {item['pk']: item for item in response.data['attendance_set']}
+        self.assertEqual(attendance_dict[attendances[0].pk]['att'], Attendance.VOTE_ATTEND)
+        self.assertEqual(attendance_dict[attendances[1].pk]['vote'], Attendance.VOTE_LATE)
+        self.assertEqual(attendance_dict[attendances[2].pk]['att'], '')
+        self.assertCountsConsistent()
+
+    def test_query_count(self):
+        # 수정할 출석 수와 관계없이 같은 수의 쿼리
+        query_counts = []
+        for count in (1, None):
+            attendances = Attendance.objects.filter(schedule=self.schedule)[:count]
+            data = [
+                {'pk': attendance.pk, 'vote': Attendance.VOTE_ABSENT if attendance.vote else Attendance.VOTE_ATTEND}
+                for attendance in attendances
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.patch(data)
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(context))
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertCountsConsistent()
+
+    def test_invalid(self):
+        other = Attendance.objects.exclude(schedule=self.schedule).first()
+        attendance = Attendance.objects.filter(schedule=self.schedule).first()
+        att = Attendance.objects.get(schedule=self.schedule, user=self.user).att
+        # 요청이 성공했다면 변경되었을 값
+        new_att = Attendance.VOTE_ABSENT if att == Attendance.VOTE_LATE else Attendance.VOTE_LATE
+        for data, code in (
+                ([{'pk': other.pk, 'att': Attendance.VOTE_ATTEND}], 'attendanceNotInSchedule'),
+                ([{'pk': attendance.pk}, {'user': attendance.user_id}], 'attendanceDuplicated'),
+                ([{'att': Attendance.VOTE_ATTEND}], None),
+                ([{'pk': attendance.pk, 'att': 'unknown'}], None)):
+            with self.subTest(data=data):
+                # 오류가 있으면 다른 출석도 수정하지 않음
+                response = self.patch([{'user': self.user.pk, 'att': new_att}] + data)
+                self.assertEqual(response.status_code, 400)
+                if code:
+                    self.assertEqual(response.data['code'], code)
+        self.assertEqual(self.patch([]).status_code, 400)
+        self.assertEqual(Attendance.objects.get(schedule=self.schedule, user=self.user).att, att)
+        self.assertCountsConsistent()
+
+
+class StudyMembershipBulkCreateTest(RepresentationParityTest):
+    path = '/api/v1/study/memberships/bulk/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(
+                email=f'new{index}@test.com', password='password', type=User.TYPE_EMAIL, name=f'새유저{index}')
+            for index in range(2)
+        ] + [
+            User.objects.create_user(
+                email='kakao@test.com', username='kakao_user', password='password', type=User.TYPE_KAKAO)
+        ]
+        self.withdrawn = StudyMembership.objects.get(study=self.study, is_withdraw=True)
+
+    def post(self, user_pks=(), user_identifiers=(), **data):
+        return self.client.post(self.path, {
+            'study': self.study.pk, 'user_pks': list(user_pks), 'user_identifiers': list(user_identifiers), **data,
+        }, format='json')
+
+    def test_bulk_create(self):
+        response = self.post(
+            [self.users[0].pk, self.user.pk],
+            [self.users[1].email, self.users[2].username, self.withdrawn.user.email, self.users[0].email],
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data, {
+            'study': self.study.pk,
+            'created': [user.pk for user in self.users],
+            'reactivated': [self.withdrawn.user_id],
+            'existing': [self.user.pk],
+        })
+
+        joined = [user.pk for user in self.users] + [self.withdrawn.user_id]
+        self.assertEqual(
+            StudyMembership.objects.filter(study=self.study, user__in=joined, is_withdraw=False).count(), len(joined))
+        schedule_count = Schedule.objects.filter(study=self.study).count()
+        for user_pk in joined:
+            self.assertEqual(
+                Attendance.objects.filter(schedule__study=self.study, user=user_pk).count(), schedule_count)
+
+        stats = list(StudyMembershipStats.objects.filter(membership__study=self.study).values_list(
+            'membership', 'unvoted_count', 'attend_count'))
+        StudyMembershipStats.objects.rebuild(study=self.study)
+        self.assertEqual(stats, list(StudyMembershipStats.objects.filter(membership__study=self.study).values_list(
+            'membership', 'unvoted_count', 'attend_count')))
+
+    def test_role(self):
+        # 생성/재참여한 멤버십에만 role을 지정
+        response = self.post(
+            [self.users[0].pk, self.withdrawn.user_id, self.user.pk], role=StudyMembership.ROLE_SUB_MANAGER)
+        self.assertEqual(response.status_code, 201, response.data)
+        roles = dict(StudyMembership.objects.filter(study=self.study).values_list('user_id', 'role'))
+        self.assertEqual(roles[self.users[0].pk], StudyMembership.ROLE_SUB_MANAGER)
+        self.assertEqual(roles[self.withdrawn.user_id], StudyMembership.ROLE_SUB_MANAGER)
+        self.assertEqual(roles[self.user.pk], self.membership.role)
+
+    def test_numeric_username(self):
+        # 숫자로 된 username은 pk가 아닌 username으로 찾음
+        user = User.objects.create_user(
+            email=None, username=str(self.users[0].pk), password='password', type=User.TYPE_KAKAO)
+        response = self.post(user_identifiers=[user.username])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], [user.pk])
+
+    def test_concurrent_create(self):
+        # 기존 멤버십을 조회한 직후 다른 요청이 생성한 멤버십은 created가 아닌 existing
+        values_list = QuerySet.values_list
+        concurrent = []
+
+        def concurrent_values_list(queryset, *fields, **kwargs):
+            rows = values_list(queryset, *fields, **kwargs)
+            if queryset.model is StudyMembership and fields == ('user_id', 'is_withdraw') and not concurrent:
+                rows = list(rows)
+                concurrent.append(StudyMembership.objects.create(study=self.study, user=self.users[0]))
+            return rows
+
+        with mock.patch.object(QuerySet, 'values_list', concurrent_values_list):
+            response = self.post([user.pk for user in self.users])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], [user.pk for user in self.users[1:]])
+        self.assertEqual(response.data['existing'], [self.users[0].pk])
+
+    def test_query_count(self):
+        # 사용자 수와 관계없이 같은 수의 쿼리
+        query_counts = []
+        for users in (self.users[:1], self.users[1:]):
+            with CaptureQueriesContext(connection) as context:
+                response = self.post([user.pk for user in users])
+            self.assertEqual(response.status_code, 201)
+            query_counts.append(len(context))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_user_not_found(self):
+        for user_pks, user_identifiers, unknown in (
+            ([self.users[0].pk], ['unknown@test.com'], 'unknown@test.com'),
+            ([self.users[0].pk, 0], [], '0'),
+            ([], [], None),
+        ):
+            with self.subTest(user_pks=user_pks, user_identifiers=user_identifiers):
+                response = self.post(user_pks, user_identifiers)
+                self.assertEqual(response.status_code, 400)
+                if unknown:
+                    self.assertIn(unknown, response.data['message'])
+                self.assertFalse(StudyMembership.objects.filter(user=self.users[0]).exists())
+
+
+class SparseFieldsTest(RepresentationParityTest):
+    """
+    ?fields=로 선택한 필드만 표현하고, 선택되지 않은 관계는 불러오지 않는지 확인
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def prune(self, data, fields):
+        if isinstance(data, list):
+            return [self.prune(item, fields) for item in data]
+        if data is None or fields is None:
+            return data
+        return {name: self.prune(data[name], fields.get(name)) for name in data if name in fields}
+
+    def get(self, path, fields=None):
+        separator = '&' if '?' in path else '?'
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{path}{separator}fields={fields}' if fields else path)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, len(context)
+
+    def assertSparse(self, path, fields, expected_fields, results=False):
+        full, full_queries = self.get(path)
+        sparse, sparse_queries = self.get(path, fields)
+        if results:
+            full, sparse = full['results'], sparse['results']
+        self.assertEqual(sparse, self.prune(full, expected_fields))
+        return full_queries, sparse_queries
+
+    def test_membership_list(self):
+        path = '/api/v1/study/memberships/'
+        for values_plan in (True, False):
+            with self.subTest(values_plan=values_plan), \
+                    mock.patch.object(StudyMembershipListCreateAPIView, 'values_plan', values_plan):
+                full_queries, sparse_queries = self.assertSparse(
+                    f'{path}?expand=study,studyMemberships,studySchedules',
+                    'pk,study.name,studySchedules.subject,studySchedules.selfAttendance.vote',
+                    {'pk': None, 'study': {'name': None}, 'study_schedules': {'subject': None, 'self_attendance': {
+                        'vote': None}}},
+                    results=True,
+                )
+                # study_memberships를 불러오지 않음
+                self.assertLess(sparse_queries, full_queries)
+                self.assertSparse(path, 'pk,role', {'pk': None, 'role': None}, results=True)
+
+    def test_details(self):
+        self.assertSparse(f'/api/v1/study/memberships/{self.membership.pk}/', 'pk,attendanceSet.schedule.subject', {
+            'pk': None, 'attendance_set': {'schedule': {'subject': None}}})
+        self.assertSparse(
+            f'/api/v1/study/attendances/{self.attendance.pk}/?expand=study', 'pk,study.author.nickname,vote',
+            {'pk': None, 'study': {'author': {'nickname': None}}, 'vote': None},
+        )
+        self.assertSparse(f'/api/v1/study/schedules/{self.schedule.pk}/', 'subject,attendanceSet.user.pk', {
+            'subject': None, 'attendance_set': {'user': {'pk': None}}})
+        self.assertSparse('/api/v1/members/profile/', 'nickname,phoneNumber', {'nickname': None, 'phone_number': None})
+        self.assertSparse('/api/v1/study/dashboard/', 'user.pk,memberships.study.name', {
+            'user': {'pk': None}, 'memberships': {'study': {'name': None}}})
+
+    @override_settings(STUDY_DETAIL_CACHE_TIMEOUT=60)
+    def test_study_detail(self):
+        cache.clear()
+        path = f'/api/v1/study/{self.study.pk}/'
+        full_queries, sparse_queries = self.assertSparse(path, 'name,membershipSet.user.nickname', {
+            'name': None, 'membership_set': {'user': {'nickname': None}}})
+        # schedule_set과 membership_set의 attendance_set을 불러오지 않음
+        self.assertLess(sparse_queries, full_queries)
+        # 선택한 필드별로 cache됨
+        self.assertSparse(path, 'name,description', {'name': None, 'description': None})
+
+    def test_source_queryset_unchanged(self):
+        # 전체 필드 요청 후의 ?fields= 요청도 선택된 관계만 JOIN하도록 View.queryset의 select_related가 유지되어야 함
+        for view_class, path, fields in (
+            (StudyMembershipListCreateAPIView, '/api/v1/study/memberships/?expand=study', 'pk'),
+            (AttendanceRetrieveUpdateDestroyAPIView, f'/api/v1/study/attendances/{self.attendance.pk}/?expand=study',
+             'pk,vote'),
+        ):
+            with self.subTest(view=view_class.__name__):
+                select_related = copy.deepcopy(view_class.queryset.query.select_related)
+                _, sparse_queries = self.get(path, fields)
+                self.get(path)
+                self.assertEqual(self.get(path, fields)[1], sparse_queries)
+                self.assertEqual(view_class.queryset.query.select_related, select_related)
+
+    def test_parity(self):
+        self.assertParity(
+            StudyMembershipListCreateAPIView, '/api/v1/study/memberships/?fields=pk,user.email,study,studySchedules'
+            '&expand=study,studySchedules')
+        self.assertParity(StudyRetrieveUpdateDestroyAPIView, '/?fields=name,scheduleSet.selfAttendance', {
+            'pk': self.study.pk})
+
+    def test_invalid(self):
+        for fields in ('unknown', 'pk.name', 'study.unknown'):
+            with self.subTest(fields=fields):
+                response = self.client.get(f'/api/v1/study/memberships/?fields={fields}')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['code'], 'fieldsInvalid')
+
+
+class ExpandTest(RepresentationParityTest):
+    """
+    nested 관계는 ?expand=로 지정한 경우에만 표현하고 불러오는지 확인
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, len(context)
+
+    def test_membership_list(self):
+        path = f'/api/v1/study/memberships/?study={self.study.pk}'
+        data, queries = self.get(path)
+        for item in data['results']:
+            self.assertEqual(set(item), {'pk', 'is_withdraw', 'user', 'role', 'role_display', 'study'})
+            self.assertEqual(item['study'], self.study.pk)
+
+        expanded, expanded_queries = self.get(f'{path}&expand=study,studyMemberships,studySchedules')
+        self.assertLess(queries, expanded_queries)
+        item = expanded['results'][0]
+        self.assertEqual(item['study']['pk'], self.study.pk)
+        self.assertEqual(len(item['study_memberships']), self.study.membership_set.count())
+        self.assertEqual(len(item['study_schedules']), self.study.schedule_set.count())
+
+    def test_attendance_detail(self):
+        path = f'/api/v1/study/attendances/{self.attendance.pk}/'
+        data, queries = self.get(path)
+        self.assertEqual(data['study'], self.study.pk)
+        self.assertEqual(data['schedule'], self.schedule.pk)
+
+        expanded, expanded_queries = self.get(f'{path}?expand=study,schedule.study')
+        self.assertLess(queries, expanded_queries)
+        self.assertEqual(expanded['study']['author']['pk'], self.study.author_id)
+        self.assertEqual(expanded['schedule']['pk'], self.schedule.pk)
+        self.assertEqual(expanded['schedule']['study'], expanded['study'])
+
+        data, _ = self.get(f'{path}?expand=schedule')
+        self.assertEqual(data['schedule']['study'], self.study.pk)
+
+    def test_invalid(self):
+        for path in ('/api/v1/study/memberships/?expand=user', f'/api/v1/study/{self.study.pk}/?expand=author'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data['code'], 'expandInvalid')
 
-# Create your tests here.
@@ -11,8 +11,12 @@ urlpatterns = [
     path('<int:pk>/', apis.StudyRetrieveUpdateDestroyAPIView.as_view()),
     path('memberships/', apis.StudyMembershipListCreateAPIView.as_view()),
     path('memberships/<int:pk>/', apis.StudyMembershipRetrieveUpdateDestroyAPIView.as_view()),
+    path('memberships/stats/', apis.StudyMembershipStatsListAPIView.as_view()),
+    path('memberships/bulk/', apis.StudyMembershipBulkCreateAPIView.as_view()),
+    path('dashboard/', apis.DashboardAPIView.as_view()),
     path('schedules/', apis.ScheduleListCreateAPIView.as_view()),
     path('schedules/<int:pk>/', apis.ScheduleRetrieveUpdateDestroyAPIView.as_view()),
+    path('schedules/<int:pk>/attendances/', apis.ScheduleAttendanceBulkUpdateAPIView.as_view()),
     path('attendances/', apis.AttendanceListCreateAPIView.as_view()),
     path('attendances/<int:pk>/', apis.AttendanceRetrieveUpdateDestroyAPIView.as_view()),
 
@@ -0,0 +1,151 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import cache as default_cache
+from django.db import transaction
+
+__all__ = (
+    'LocalCache',
+    'VersionedCache',
+)
+
+
+class LocalCache:
+    """
+    프로세스 메모리의 LRU cache (최대 maxsize개, 항목별 timeout)
+    다른 프로세스의 변경/무효화는 반영되지 않으므로, 짧은 timeout으로 공유 cache(CACHES) 앞에서 사용
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        # callable일 경우 매번 호출 (settings를 사용하는 경우), 0 또는 None이면 저장하지 않음
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_timeout(self):
+        return self.timeout() if callable(self.timeout) else self.timeout
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        timeout = self.get_timeout()
+        if not timeout:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class VersionedCache:
+    """
+    key(ex: Study의 pk)별 version을 사용해, 해당 key의 모든 variant(ex: 요청한 user별 표현)를 한 번에 무효화하는 cache
+    Django cache framework만을 사용하므로 LocMemCache(테스트)와 공유 backend(Redis, Memcached 등) 모두에서 동작
+
+    만료된 항목을 여러 요청이 동시에 다시 계산하지 않도록(stampede), 한 요청만 lock을 얻어 계산하며
+        만료되었지만 남아있는 항목이 있으면: 다른 요청들은 이전 값을 사용 (stale_timeout동안 보관)
+        항목이 없으면(무효화 직후 등): 다른 요청들은 lock_timeout동안 계산된 값을 기다린 후, 없으면 직접 계산
+    """
+
+    def __init__(self, prefix, timeout, stale_timeout=60, lock_timeout=5, poll_interval=0.05, cache=None):
+        self.prefix = prefix
+        # callable일 경우 매번 호출 (settings를 사용하는 경우), 0 또는 None이면 사용하지 않음
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.cache = cache or default_cache
+
+    def get_timeout(self):
+        return self.timeout() if callable(self.timeout) else self.timeout
+
+    def get_version(self, key):
+        version_key = f'{self.prefix}:{key}:version'
+        version = self.cache.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.cache.add(version_key, version, None):
+                version = self.cache.get(version_key, version)
+        return version
+
+    def invalidate(self, key):
+        """
+        key의 version을 바꿔 모든 variant를 무효화 (이전 version의 항목은 timeout이 지나면 삭제됨)
+        transaction 내에서는 commit된 후에도 한 번 더 무효화 (commit 전에 다른 요청이 이전 값을 저장한 경우)
+        """
+        def invalidate():
+            self.cache.set(f'{self.prefix}:{key}:version', uuid.uuid4().hex, None)
+
+        invalidate()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(invalidate)
+
+    def get_or_set(self, key, variant, compute):
+        timeout = self.get_timeout()
+        if not timeout:
+            return compute()
+
+        data_key = f'{self.prefix}:{key}:{self.get_version(key)}:{variant}'
+        lock_key = f'{data_key}:lock'
+        entry = self.cache.get(data_key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                return value
+            locked = self.cache.add(lock_key, True, self.lock_timeout)
+            # 다른 요청이 다시 계산하는 중이면 만료된 값을 사용
+            if not locked:
+                return value
+        else:
+            locked = self.cache.add(lock_key, True, self.lock_timeout)
+            if not locked:
+                entry = self.wait(data_key)
+                if entry is not None:
+                    return entry[0]
+
+        try:
+            value = compute()
+            self.cache.set(data_key, (value, time.time() + timeout), timeout + self.stale_timeout)
+        finally:
+            if locked:
+                self.cache.delete(lock_key)
+        return value
+
+    def wait(self, data_key):
+        """
+        lock을 얻은 다른 요청이 data_key의 값을 저장할 때까지 최대 lock_timeout동안 대기
+        """
+        deadline = time.time() + self.lock_timeout
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self.cache.get(data_key)
+            if entry is not None:
+                return entry
+        return None
@@ -0,0 +1,25 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import pin_primary
+
+__all__ = (
+    'PrimaryPinMiddleware',
+)
+
+
+class PrimaryPinMiddleware:
+    """
+    데이터를 변경하는 요청이 성공하면, 요청한 user의 이후 읽기를 일정 시간동안 primary로 고정
+    (DRF의 인증 결과도 request.user에 반영되므로 Token인증 요청에도 적용됨)
+    View가 request.primary_pin을 지정하면 그 값을 사용 (ex: BatchAPIView는 하위 요청의 결과로 지정)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        modified = request.method not in SAFE_METHODS and response.status_code < 400
+        if getattr(request, 'primary_pin', modified):
+            pin_primary(getattr(request, 'user', None))
+        return response
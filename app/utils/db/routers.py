@@ -0,0 +1,81 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+__all__ = (
+    'use_replica',
+    'set_replica_enabled',
+    'is_replica_enabled',
+    'pin_primary',
+    'is_primary_pinned',
+    'PrimaryReplicaRouter',
+)
+
+PRIMARY_DB = 'default'
+PRIMARY_PIN_CACHE_KEY = 'db:primary-pin:{user_pk}'
+
+_state = threading.local()
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    with블록 내의 읽기 쿼리를 DATABASE_REPLICAS 중 하나로 보냄
+    """
+    previous = is_replica_enabled()
+    set_replica_enabled(enabled)
+    try:
+        yield
+    finally:
+        set_replica_enabled(previous)
+
+
+def set_replica_enabled(enabled):
+    _state.replica = enabled
+
+
+def is_replica_enabled():
+    return getattr(_state, 'replica', False)
+
+
+def pin_primary(user):
+    """
+    user가 데이터를 변경한 후 DATABASE_REPLICA_PIN_SECONDS동안은 해당 user의 읽기도 primary에서 처리
+    (replica의 복제 지연으로 자신이 변경한 내용이 보이지 않는 것을 방지)
+    """
+    if user is None or not user.is_authenticated or not settings.DATABASE_REPLICAS:
+        return
+    cache.set(PRIMARY_PIN_CACHE_KEY.format(user_pk=user.pk), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_primary_pinned(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return bool(cache.get(PRIMARY_PIN_CACHE_KEY.format(user_pk=user.pk)))
+
+
+class PrimaryReplicaRouter:
+    """
+    use_replica()가 활성화된 경우에만 읽기를 replica로 보내고, 나머지는 모두 primary(default)를 사용
+    primary에 열린 트랜잭션이 있으면 커밋되지 않은 내용을 읽어야 하므로 primary를 사용
+    """
+
+    def db_for_read(self, model, **hints):
+        if (is_replica_enabled() and settings.DATABASE_REPLICAS
+                and not connections[PRIMARY_DB].in_atomic_block):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primary와 replica는 같은 데이터를 가지므로 DB가 달라도 관계를 허용
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
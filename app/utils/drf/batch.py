@@ -0,0 +1,148 @@
+import json
+import logging
+from io import BytesIO
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import resolve, Resolver404
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import exceptions, generics, serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import errors
+from .exceptions import APIException
+
+__all__ = (
+    'BatchAPIView',
+)
+
+BATCH_METHODS = ('GET', 'POST', 'PATCH', 'DELETE')
+# 하위 요청에 전달하지 않는 header (인증은 batch 요청의 결과를 사용, 조건부 요청은 하위 요청별로 지정)
+EXCLUDED_META = ('HTTP_AUTHORIZATION', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_COOKIE')
+# 하위 요청의 응답에서 전달하는 header
+RESPONSE_HEADERS = ('ETag', 'Last-Modified')
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(BATCH_METHODS)
+    path = serializers.RegexField(r'^/api/', help_text='/api/로 시작하는 경로 (query string 포함)')
+    body = serializers.JSONField(required=False, help_text='요청 body (JSON)')
+    if_none_match = serializers.CharField(required=False, help_text='If-None-Match header')
+    if_modified_since = serializers.CharField(required=False, help_text='If-Modified-Since header')
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    """
+    BatchAPIView의 응답 항목 (문서화용)
+    """
+    status = serializers.IntegerField(help_text='HTTP 상태 코드')
+    headers = serializers.DictField(child=serializers.CharField(), help_text='ETag, Last-Modified')
+    body = serializers.JSONField(help_text='응답 body (304 등 body가 없으면 null)')
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, requests):
+        max_requests = self.context['view'].max_requests
+        if len(requests) > max_requests:
+            raise serializers.ValidationError(f'한 번에 최대 {max_requests}개의 요청을 보낼 수 있습니다')
+        return requests
+
+
+class BatchAPIView(generics.GenericAPIView):
+    """
+    여러 API 요청을 한 번의 HTTP 요청으로 처리
+    각 하위 요청은 URL resolver로 찾은 View에서 순서대로 (같은 프로세스, 같은 DB 연결로) 처리되며,
+    인증은 batch 요청에서 한 번만 처리해 하위 요청에 그대로 사용
+    하위 요청은 각각 독립적으로 처리됨 (하나가 실패해도 나머지는 처리되며, 하나의 transaction으로 묶이지 않음)
+        각 하위 요청은 별도의 transaction(batch 요청이 transaction 안에서 처리되면 savepoint)에서 처리되며,
+        예상하지 못한 예외가 발생한 하위 요청은 변경을 rollback하고 500으로 응답
+    """
+    serializer_class = BatchSerializer
+    max_requests = 20
+
+    @swagger_auto_schema(
+        operation_summary='Batch',
+        operation_description='여러 API 요청을 한 번에 처리 (응답의 responses는 요청의 requests와 같은 순서)',
+        responses={200: BatchResponseSerializer(many=True)},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        responses = []
+        modified = False
+        for item in serializer.validated_data['requests']:
+            status_code, headers, body = self.perform_request(request, item)
+            responses.append({
+                'status': status_code,
+                'headers': headers,
+                'body': body,
+            })
+            modified = modified or (item['method'] not in SAFE_METHODS and status_code < 400)
+        # 데이터를 변경한 하위 요청이 있을 때만 이후의 읽기를 primary로 고정 (PrimaryPinMiddleware)
+        request._request.primary_pin = modified
+        return Response({'responses': responses})
+
+    def get_sub_request(self, request, item):
+        path, _, query_string = item['path'].partition('?')
+        content = json.dumps(item['body']).encode() if 'body' in item else b''
+        environ = {key: value for key, value in request.META.items() if key not in EXCLUDED_META}
+        environ.update({
+            'REQUEST_METHOD': item['method'],
+            'PATH_INFO': path,
+            'QUERY_STRING': query_string,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(content)),
+            'HTTP_ACCEPT': 'application/json',
+            'wsgi.input': BytesIO(content),
+        })
+        for name in ('if_none_match', 'if_modified_since'):
+            if name in item:
+                environ[f'HTTP_{name.upper()}'] = item[name]
+
+        sub_request = WSGIRequest(environ)
+        # 하위 요청의 DRF Request는 인증 class를 다시 실행하지 않고 batch 요청의 인증 결과를 사용
+        # _force_auth_user/_force_auth_token은 DRF의 테스트용 hook (APIRequestFactory의 force_authenticate)으로,
+        # DRF 3.10의 Request.__init__(rest_framework/request.py 176행 부근)에서 ForcedAuthentication으로 사용됨
+        # DRF를 업데이트할 때 같은 속성을 사용하는지 확인해야 함
+        if request.user.is_authenticated:
+            sub_request._force_auth_user = request.user
+            sub_request._force_auth_token = request.auth
+        return sub_request
+
+    def get_error_response(self, exc):
+        # exception handler의 set_rollback()이 batch 요청 전체의 transaction(ATOMIC_REQUESTS)에 적용되지 않도록
+        # savepoint 안에서 실행
+        with transaction.atomic():
+            response = self.get_exception_handler()(exc, self.get_exception_handler_context())
+        return response.status_code, {}, response.data
+
+    def perform_request(self, request, item):
+        """
+        :return: (상태 코드, header, body)
+        """
+        sub_request = self.get_sub_request(request, item)
+        try:
+            match = resolve(sub_request.path_info)
+        except Resolver404:
+            match = None
+        if match is None or getattr(match.func, 'view_class', None) is BatchAPIView:
+            return self.get_error_response(exceptions.NotFound())
+
+        try:
+            with transaction.atomic():
+                response = match.func(sub_request, *match.args, **match.kwargs)
+                headers = {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)}
+                if response.streaming:
+                    body = json.loads(b''.join(response.streaming_content))
+                else:
+                    body = getattr(response, 'data', None)
+        except Exception:
+            logger.exception('Batch 하위 요청 처리 중 오류: %s %s', item['method'], item['path'])
+            return self.get_error_response(APIException(errors.BATCH_REQUEST_FAILED))
+        return response.status_code, headers, body
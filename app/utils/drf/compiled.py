@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from functools import lru_cache, partial
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+
+from .values import (
+    DISPLAY_SOURCE_RE,
+    PLAN_CACHE_SIZE,
+    VALUE,
+    NESTED,
+    MANY,
+    get_display_converter,
+    file_representation,
+    has_custom_representation,
+)
+
+__all__ = (
+    'SerializerPlan',
+    'get_serializer_plan',
+    'CompiledSerializerMixin',
+)
+
+
+def _chain_getter(attrs):
+    """
+    속성을 차례로 따라가며, 중간에 None이면 None
+    """
+    if len(attrs) == 1:
+        return attrgetter(attrs[0])
+
+    def getter(instance):
+        for attr in attrs:
+            if instance is None:
+                return None
+            instance = getattr(instance, attr)
+        return instance
+
+    return getter
+
+
+def _is_plain_attribute(model, attr):
+    """
+    model의 attr이 호출하지 않고 그대로 읽을 수 있는 속성(필드, property)인지 여부와, 관계필드일 경우 관계된 모델
+    """
+    if attr == 'pk':
+        return True, None
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return isinstance(getattr(model, attr, None), property), None
+    if field.one_to_one and not field.concrete:
+        # 역방향 OneToOne은 객체가 없으면 예외가 발생하므로 DRF의 get_attribute를 사용
+        return False, None
+    return True, field.related_model if field.is_relation else None
+
+
+def _get_attribute_getter(model, source_attrs):
+    """
+    DRF Field.get_attribute()와 같은 값을 돌려주는 함수
+    모델 필드/property만을 따라가는 경우 attrgetter, 그 외(메서드 호출 등)는 DRF의 get_attribute 사용
+    """
+    current = model
+    for attr in source_attrs:
+        plain, related_model = _is_plain_attribute(current, attr) if current else (False, None)
+        if not plain:
+            return partial(get_attribute, attrs=source_attrs)
+        current = related_model
+    return _chain_getter(source_attrs)
+
+
+def _resolve_model(model, attrs):
+    """
+    model에서 관계필드 attrs를 따라간 마지막 모델
+    """
+    for attr in attrs:
+        model = model._meta.get_field(attr).related_model
+    return model
+
+
+class SerializerPlan:
+    """
+    ModelSerializer.to_representation()을 클래스별로 한 번 컴파일한 계획
+    각 필드의 속성 getter, 선택지 표시값(get_*_display) 조회 테이블, nested serializer의 계획으로 구성되며
+    객체마다 필드 객체 생성, get_attribute(), get_*_display() 호출을 반복하지 않음
+
+    to_representation()을 재정의한 nested serializer는 Meta.representations로 같은 결과를 지정해야 함
+    """
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        representations = getattr(serializer.Meta, 'representations', {})
+        self.entries = []
+        for field_name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.entries.append(self._compile_field(
+                type(serializer), field_name, field, representations.get(field_name)))
+
+    def _compile_field(self, serializer_class, field_name, field, representation):
+        source_attrs = field.source_attrs
+        if field.source == '*':
+            getter = lambda instance: instance  # noqa: E731
+        else:
+            getter = _get_attribute_getter(self.model, source_attrs)
+
+        if isinstance(field, serializers.ListSerializer):
+            return MANY, field_name, getter, self._get_child_plan(field_name, field.child)
+        if isinstance(field, serializers.BaseSerializer):
+            return NESTED, field_name, getter, self._get_child_plan(field_name, field)
+        if isinstance(field, serializers.ManyRelatedField):
+            raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: 지원하지 않는 관계 필드')
+
+        if representation is not None:
+            return VALUE, field_name, getter, lambda request: representation
+
+        display = DISPLAY_SOURCE_RE.match(source_attrs[-1])
+        if display:
+            try:
+                model = _resolve_model(self.model, source_attrs[:-1])
+                model_field = model._meta.get_field(display.group(1))
+            except (FieldDoesNotExist, AttributeError):
+                model_field = None
+            if model_field is not None and model_field.choices:
+                # get_*_display() 대신 선택지 조회 테이블 사용
+                parent_getter = _chain_getter(source_attrs[:-1]) if len(source_attrs) > 1 else None
+                attname_getter = attrgetter(model_field.attname)
+                converter = get_display_converter(model_field)
+
+                def getter(instance):
+                    if parent_getter is not None:
+                        instance = parent_getter(instance)
+                        if instance is None:
+                            return None
+                    return converter(attname_getter(instance))
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            # 관계된 객체를 불러오지 않고 FK값(attname)을 그대로 사용
+            model = _resolve_model(self.model, source_attrs[:-1])
+            attname = model._meta.get_field(source_attrs[-1]).attname
+            getter = _chain_getter(source_attrs[:-1] + [attname])
+            return VALUE, field_name, getter, lambda request: None
+        if isinstance(field, serializers.RelatedField):
+            raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: 지원하지 않는 관계 필드')
+        if isinstance(field, serializers.FileField):
+            return self._compile_file_field(field_name, field, source_attrs, getter)
+        return VALUE, field_name, getter, lambda request: field.to_representation
+
+    def _compile_file_field(self, field_name, field, source_attrs, getter):
+        """
+        모델 FileField는 descriptor가 객체마다 FieldFile을 만들지 않도록 저장된 파일 이름을 읽고,
+        같은 이름의 파일은 요청 내에서 한 번만 FieldFile/URL로 변환
+        """
+        try:
+            model_field = _resolve_model(self.model, source_attrs[:-1])._meta.get_field(source_attrs[-1])
+        except (FieldDoesNotExist, AttributeError):
+            model_field = None
+        if not isinstance(model_field, models.FileField):
+            return VALUE, field_name, getter, lambda request: file_representation(field)(request)[0]
+
+        parent_getter = _chain_getter(source_attrs[:-1]) if len(source_attrs) > 1 else None
+        attname = model_field.attname
+
+        def name_getter(instance):
+            if parent_getter is not None:
+                instance = parent_getter(instance)
+                if instance is None:
+                    return None
+            if attname in instance.__dict__:
+                return instance.__dict__[attname]
+            return getattr(instance, attname)
+
+        def converter(value):
+            if isinstance(value, FieldFile):
+                return value
+            return model_field.attr_class(None, model_field, value)
+
+        return VALUE, field_name, name_getter, lambda request: file_representation(field, converter)(request)[0]
+
+    def _get_child_plan(self, field_name, child):
+        child_class = type(child)
+        if not isinstance(child, serializers.ModelSerializer):
+            raise ImproperlyConfigured(f'{field_name}: ModelSerializer가 아닌 nested serializer는 사용할 수 없음')
+        if has_custom_representation(child_class) and not getattr(child.Meta, 'representations', None):
+            raise ImproperlyConfigured(
+                f'{child_class.__name__}.to_representation()을 재정의한 경우 Meta.representations가 필요함')
+        return get_serializer_plan(child_class)
+
+    def bind(self, request=None):
+        """
+        request에 대한 표현 함수 (instance -> OrderedDict)
+        """
+        entries = []
+        for kind, field_name, getter, arg in self.entries:
+            if kind == VALUE:
+                entries.append((kind, field_name, getter, arg(request)))
+            else:
+                entries.append((kind, field_name, getter, arg.bind(request)))
+
+        def render(instance):
+            ret = OrderedDict()
+            for kind, field_name, getter, representation in entries:
+                attribute = getter(instance)
+                if attribute is None:
+                    ret[field_name] = None
+                elif kind == MANY:
+                    if isinstance(attribute, models.Manager):
+                        attribute = attribute.all()
+                    ret[field_name] = [representation(item) for item in attribute]
+                elif representation is None:
+                    ret[field_name] = attribute
+                else:
+                    ret[field_name] = representation(attribute)
+            return ret
+
+        return render
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_serializer_plan(serializer_class):
+    """
+    serializer_class에 대한 SerializerPlan (프로세스당 1회 생성 후 재사용)
+    """
+    return SerializerPlan(serializer_class())
+
+
+class CompiledSerializerMixin:
+    """
+    ModelSerializer의 to_representation()을 SerializerPlan으로 처리
+    many=True인 경우 ListSerializer의 child가 같은 request에 대한 표현 함수를 재사용
+    """
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        bound = getattr(self, '_bound_plan', None)
+        if bound is None or bound[0] is not request:
+            bound = self._bound_plan = (request, get_serializer_plan(type(self)).bind(request))
+        return bound[1](instance)
+
+    # SerializerPlan/ValuesPlan이 ModelSerializer와 같은 결과를 만드는 것으로 취급
+    to_representation.same_representation = True
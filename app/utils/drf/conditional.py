@@ -0,0 +1,97 @@
+import hashlib
+
+from django.db.models import Count, DateTimeField, IntegerField, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+__all__ = (
+    'related_state',
+    'ConditionalGetMixin',
+)
+
+
+def related_state(name, queryset, link, outer='pk', field='modified'):
+    """
+    queryset에서 link가 바깥 쿼리의 outer를 가리키는 행들의 최대 field값(modified)과 개수 Subquery
+    (개수는 최대 modified로 알 수 없는 삭제를 반영하기 위해 사용)
+
+    ex) Study별 Schedule 목록: related_state('schedule', Schedule.objects.all(), 'study')
+    """
+    queryset = queryset.filter(**{link: OuterRef(outer)}).order_by().values(link)
+    # filter된 queryset에서는 output_field를 추론하지 못하는 경우가 있으므로 지정 (field는 DateTimeField)
+    return {
+        f'{name}_modified': Subquery(
+            queryset.annotate(value=Max(field)).values('value'), output_field=DateTimeField()),
+        f'{name}_count': Subquery(queryset.annotate(value=Count('pk')).values('value'), output_field=IntegerField()),
+    }
+
+
+class ConditionalGetMixin:
+    """
+    GET 요청에 ETag를 지정하고, If-None-Match가 일치하면 Serializer를 실행하지 않고 304로 응답
+
+    ETag는 응답에 포함될 행들의 (pk, modified)와 get_conditional_annotations()의 값으로 만듦
+        상세 API: lookup_field로 찾은 1개의 행
+        목록 API: filter, pagination이 적용된 현재 페이지의 행
+    관계된 모델(nested serializer)의 변경은 get_conditional_annotations()에 modified와 개수를 지정해 반영
+    Last-Modified는 지정하지 않음 (최대 modified로는 행의 삭제, 페이지 간 이동과 1초 안의 변경을 알 수 없어
+    If-Modified-Since만 보낸 요청에 잘못된 304로 응답하게 됨)
+    """
+
+    def get_conditional_annotations(self):
+        """
+        {이름: expression} 응답에 영향을 주는 관계된 모델의 값
+        """
+        return {}
+
+    def get_conditional_state(self, request):
+        """
+        ETag를 만들 값 목록, 만들 수 없으면 None (일반 GET으로 처리)
+        """
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        annotations = self.get_conditional_annotations()
+        columns = ['pk', 'modified', *annotations]
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            rows = list(queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).values_list(*columns))
+            return rows or None
+
+        if self.paginator is None or getattr(self, 'is_streaming', lambda request: False)(request):
+            return None
+        ordering_columns = ()
+        if hasattr(self.paginator, 'get_ordering'):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            ordering_columns = [name.lstrip('-') for name in ordering if name.lstrip('-') not in columns]
+        page = self.paginate_queryset(queryset.values_list(*columns, *ordering_columns, named=True))
+        if page is None:
+            return None
+        return [tuple(row)[:len(columns)] for row in page] + [
+            getattr(self.paginator, 'has_next', None),
+            getattr(self.paginator, 'has_previous', None),
+        ]
+
+    def get_etag(self, request, state):
+        """
+        같은 행이라도 요청한 user(self_attendance 등), 경로(query parameter), 응답 형식별로 표현이 다름
+        """
+        key = repr((request.get_full_path(), request.accepted_media_type, request.user.pk, state))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        state = self.get_conditional_state(request)
+        if state is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(request, state)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            # 사용자별로 다른 응답이므로 공유 캐시에 저장하지 않고, 매번 validator로 확인
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+        return response
@@ -31,6 +31,26 @@ EMAIL_VERIFICATION_NOT_EXISTS = Error(
     '이메일 인증정보가 없는 경우',
 )
 
+# Sparse fieldsets (?fields=, ?expand=)
+FIELDS_INVALID = Error(
+    'fieldsInvalid',
+    '선택할 수 없는 필드가 포함되어 있습니다',
+    'fields에 존재하지 않는 필드나, nested serializer가 아닌 필드의 하위 필드가 포함된 경우',
+)
+
+EXPAND_INVALID = Error(
+    'expandInvalid',
+    '확장할 수 없는 필드가 포함되어 있습니다',
+    'expand에 확장할 수 없는(Meta.expandable_fields에 없는) 필드가 포함된 경우',
+)
+
+# Batch
+BATCH_REQUEST_FAILED = Error(
+    'batchRequestFailed',
+    '요청을 처리하는 중 오류가 발생했습니다',
+    'Batch의 하위 요청을 처리하는 중 예상하지 못한 오류(500)가 발생한 경우',
+)
+
 # Study
 STUDY_INVITE_TOKEN_INVALID = Error(
     'studyInviteTokenInvalid',
@@ -44,3 +64,15 @@ MEMBERSHIP_ALREADY_EXISTS = Error(
     '스터디멤버십이 이미 존재합니다',
     '스터디멤버십이 이미 존재할 경우',
 )
+
+# Attendance
+ATTENDANCE_NOT_IN_SCHEDULE = Error(
+    'attendanceNotInSchedule',
+    '일정에 속하지 않은 출석이 포함되어 있습니다',
+    '일괄 수정할 출석(pk 또는 user)이 해당 일정에 없는 경우',
+)
+ATTENDANCE_DUPLICATED = Error(
+    'attendanceDuplicated',
+    '같은 출석이 여러 번 포함되어 있습니다',
+    '일괄 수정할 출석 목록에 같은 출석(pk 또는 user)이 여러 번 포함된 경우',
+)
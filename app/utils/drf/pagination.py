@@ -0,0 +1,26 @@
+from rest_framework.pagination import CursorPagination as BaseCursorPagination
+
+
+class CursorPagination(BaseCursorPagination):
+    """
+    정렬 기준 필드를 커서로 사용하는 Pagination (OFFSET을 사용하지 않음)
+
+    View의 아래 속성으로 endpoint별 설정 가능
+        pagination_ordering: 커서의 기준이 되는 정렬 (기본값: 모델의 Meta.ordering, 없을 경우 '-pk')
+        max_page_size: page_size로 요청할 수 있는 최대값
+    """
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.max_page_size = getattr(view, 'max_page_size', self.max_page_size)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'pagination_ordering', None) or queryset.model._meta.ordering
+        if not ordering:
+            return super().get_ordering(request, queryset, view)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
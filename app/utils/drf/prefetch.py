@@ -0,0 +1,188 @@
+import copy
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .values import PLAN_CACHE_SIZE
+
+__all__ = (
+    'QueryPlan',
+    'get_query_plan',
+    'plan_queryset',
+    'refetch_instance',
+    'QueryPlanMixin',
+)
+
+
+class QueryPlan:
+    """
+    Serializer가 실제로 표현하는 관계(nested serializer, many related field)만을
+    select_related/prefetch_related로 불러오기 위한 계획
+
+    Serializer의 Meta에 prefetch_hooks를 지정하면, 모델 필드가 아닌 property(ex: Schedule.self_attendance)에
+    필요한 Prefetch를 request를 사용해 추가할 수 있음
+        prefetch_hooks = {
+            '<field name>': callable(request) -> Prefetch or None,
+        }
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.select_related = []
+        # (lookup, related model, child QueryPlan or None)
+        self.prefetch_related = []
+        # (lookup prefix, hook)
+        self.hooks = []
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related or self.hooks)
+
+    def get_prefetches(self, request=None):
+        prefetches = []
+        for lookup, model, child_plan in self.prefetch_related:
+            if child_plan:
+                queryset = child_plan.apply(model._default_manager.all(), request)
+                prefetches.append(Prefetch(lookup, queryset=queryset))
+            else:
+                prefetches.append(lookup)
+        for prefix, hook in self.hooks:
+            prefetch = hook(request)
+            if prefetch is None:
+                continue
+            if prefix:
+                prefetch = Prefetch(prefetch.prefetch_through, prefetch.queryset, prefetch.to_attr)
+                prefetch.add_prefix(prefix)
+            prefetches.append(prefetch)
+        return prefetches
+
+    def apply(self, queryset, request=None):
+        if self.select_related:
+            queryset = _add_select_related(queryset, self.select_related)
+        prefetches = self.get_prefetches(request)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+
+def _add_select_related(queryset, fields):
+    """
+    queryset.select_related(*fields)를 원본 queryset을 변경하지 않고 적용
+    Django 2.2의 QuerySet 복제는 select_related의 nested dict를 공유하므로, 그대로 추가하면
+    원본 queryset(View.queryset, Manager의 select_related 등)에도 관계가 추가되어 이후의 모든 요청에서 JOIN됨
+    """
+    queryset = queryset.all()
+    queryset.query.select_related = copy.deepcopy(queryset.query.select_related)
+    return queryset.select_related(*fields)
+
+
+def _resolve_relation(model, source_attrs):
+    """
+    source_attrs를 model의 관계필드로 따라가며 (lookup 단위 목록, 마지막 모델)을 리턴
+    모델의 관계필드가 아닌 값(property, method 등)을 만나면 None
+    """
+    relations = []
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation:
+            return None
+        relations.append((attr, field.many_to_many or field.one_to_many))
+        model = field.related_model
+    return relations, model
+
+
+def _build_plan(plan, serializer, prefix=''):
+    meta = getattr(serializer, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return plan
+    hooks = getattr(meta, 'prefetch_hooks', {})
+
+    for field_name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field_name in hooks:
+            plan.hooks.append((prefix[:-2], hooks[field_name]))
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+        elif isinstance(field, serializers.ManyRelatedField):
+            child = None
+        elif isinstance(field, serializers.BaseSerializer):
+            child = field
+        else:
+            continue
+
+        if field.source == '*':
+            continue
+        resolved = _resolve_relation(model, field.source_attrs)
+        if not resolved:
+            continue
+        relations, related_model = resolved
+
+        # 처음 만나는 many 관계까지는 select_related, 그 이후는 별도의 Prefetch queryset에서 처리
+        select_attrs = []
+        for attr, many in relations:
+            if many:
+                break
+            select_attrs.append(attr)
+        lookup = prefix + '__'.join(select_attrs)
+
+        if len(select_attrs) == len(relations):
+            plan.select_related.append(lookup)
+            if child is not None:
+                _build_plan(plan, child, prefix=lookup + '__')
+            continue
+
+        # many 관계 이후의 경로는 남은 관계들을 하나의 lookup으로 이어 Prefetch
+        prefetch_lookup = prefix + '__'.join(attr for attr, many in relations)
+        child_plan = None
+        if child is not None:
+            child_plan = _build_plan(QueryPlan(related_model), child)
+        if select_attrs:
+            plan.select_related.append(lookup)
+        plan.prefetch_related.append((prefetch_lookup, related_model, child_plan or None))
+    return plan
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_query_plan(serializer_class):
+    """
+    serializer_class에 대한 QueryPlan (프로세스당 1회 생성 후 재사용)
+    """
+    serializer = serializer_class()
+    return _build_plan(QueryPlan(serializer.Meta.model), serializer)
+
+
+def plan_queryset(queryset, serializer_class, request=None):
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return queryset
+    return get_query_plan(serializer_class).apply(queryset, request)
+
+
+def refetch_instance(instance, serializer_class, request=None):
+    """
+    생성/수정 직후의 instance를 serializer_class의 QueryPlan을 적용해 다시 불러옴
+    """
+    queryset = instance.__class__._default_manager.filter(pk=instance.pk)
+    return plan_queryset(queryset, serializer_class, request).get()
+
+
+class QueryPlanMixin:
+    """
+    GenericAPIView에서 get_serializer_class()로 선택된 Serializer가 필요로 하는 관계만 불러옴
+    """
+
+    def get_plan_serializer_class(self):
+        return self.get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == 'DELETE':
+            return queryset
+        return plan_queryset(queryset, self.get_plan_serializer_class(), self.request)
@@ -1,4 +1,218 @@
-from rest_framework.renderers import BrowsableAPIRenderer
+import re
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files import File
+from django.http import QueryDict
+from django.http.multipartparser import MultiPartParser as DjangoMultiPartParser, MultiPartParserError
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.settings import api_settings as camel_case_settings
+from djangorestframework_camel_case.util import camelize_re, underscore_to_camel, camel_to_underscore
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = (
+    'camelize',
+    'underscoreize',
+    'JSONEncoder',
+    'CamelCaseJSONRenderer',
+    'ORJSONRenderer',
+    'CamelCaseORJSONRenderer',
+    'CamelCaseJSONParser',
+    'ORJSONParser',
+    'CamelCaseORJSONParser',
+    'CamelCaseFormParser',
+    'CamelCaseMultiPartParser',
+    'BrowsableAPIRendererWithoutForms',
+)
+
+# 변환한 key를 기억하는 최대 개수 (요청 body의 key는 클라이언트가 정하므로 크기를 제한)
+KEY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def camelize_key(key):
+    return re.sub(camelize_re, underscore_to_camel, key)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def underscoreize_key(key, no_underscore_before_number=False):
+    return camel_to_underscore(key, no_underscore_before_number=no_underscore_before_number)
+
+
+def get_underscoreize_options():
+    """
+    REST_FRAMEWORK['JSON_UNDERSCOREIZE'] (없으면 djangorestframework_camel_case의 설정)
+    """
+    return getattr(settings, 'REST_FRAMEWORK', {}).get('JSON_UNDERSCOREIZE', camel_case_settings.JSON_UNDERSCOREIZE)
+
+
+def _is_iterable(data):
+    try:
+        iter(data)
+    except TypeError:
+        return False
+    return True
+
+
+def camelize(data):
+    """
+    djangorestframework_camel_case.util.camelize와 같은 결과
+    key마다 정규식을 실행하지 않고, 한 번 변환한 key(Serializer의 필드명)는 변환 결과를 재사용
+    """
+    if isinstance(data, dict):
+        new_dict = OrderedDict()
+        for key, value in data.items():
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if isinstance(key, str) and '_' in key:
+                key = camelize_key(key)
+            new_dict[key] = camelize(value)
+        return new_dict
+    if isinstance(data, (list, tuple)):
+        return [camelize(item) for item in data]
+    if isinstance(data, Promise):
+        return force_str(data)
+    if isinstance(data, (str, bytes, int, float)) or data is None:
+        return data
+    if _is_iterable(data):
+        return [camelize(item) for item in data]
+    return data
+
+
+def underscoreize(data, no_underscore_before_number=False):
+    """
+    djangorestframework_camel_case.util.underscoreize와 같은 결과 (변환한 key를 재사용)
+    """
+    if isinstance(data, dict):
+        items = data.lists() if isinstance(data, QueryDict) else data.items()
+        new_dict = {}
+        for key, value in items:
+            if isinstance(key, str):
+                key = underscoreize_key(key, no_underscore_before_number)
+            new_dict[key] = underscoreize(value, no_underscore_before_number)
+        if isinstance(data, QueryDict):
+            new_query = QueryDict(mutable=True)
+            for key, value in new_dict.items():
+                new_query.setlist(key, value)
+            return new_query
+        return new_dict
+    if isinstance(data, list):
+        return [underscoreize(item, no_underscore_before_number) for item in data]
+    if isinstance(data, (str, bytes, int, float, File)) or data is None:
+        return data
+    if _is_iterable(data):
+        return [underscoreize(item, no_underscore_before_number) for item in data]
+    return data
+
+
+def _underscoreize(data):
+    options = get_underscoreize_options()
+    return underscoreize(data, bool(options.get('no_underscore_before_number')))
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    DRF의 JSONEncoder에 PhoneNumber 추가 (PhoneNumberField serializer와 같은 표현)
+    """
+
+    def default(self, obj):
+        if isinstance(obj, PhoneNumber):
+            return str(obj)
+        return super().default(obj)
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    encoder_class = JSONEncoder
+
+    def render(self, data, *args, **kwargs):
+        return super().render(camelize(data), *args, **kwargs)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    orjson을 사용해 JSONRenderer와 같은 결과를 만드는 Renderer
+    datetime, date, UUID등은 orjson이 직접 변환하며, 그 외(timedelta, Decimal, PhoneNumber, lazy 문자열 등)는
+    encoder_class의 default()를 사용
+    orjson이 설치되지 않았거나 orjson이 표현할 수 없는 형식(indent가 2가 아닌 경우 등)은 JSONRenderer로 처리
+    """
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent not in (None, 2) or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=option)
+        except orjson.JSONEncodeError:
+            # orjson이 지원하지 않는 값(64bit를 넘는 정수 등)
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer와 같이 \u2028, \u2029는 escape
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class CamelCaseORJSONRenderer(CamelCaseJSONRenderer, ORJSONRenderer):
+    pass
+
+
+class CamelCaseJSONParser(parsers.JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        return _underscoreize(super().parse(stream, media_type, parser_context))
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    UTF-8 요청 body를 orjson으로 해석 (orjson이 없거나 다른 인코딩이면 JSONParser)
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class CamelCaseORJSONParser(CamelCaseJSONParser, ORJSONParser):
+    pass
+
+
+class CamelCaseFormParser(parsers.FormParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        return _underscoreize(super().parse(stream, media_type, parser_context))
+
+
+class CamelCaseMultiPartParser(parsers.MultiPartParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context['request']
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        try:
+            parser = DjangoMultiPartParser(meta, stream, request.upload_handlers, encoding)
+            data, files = parser.parse()
+        except MultiPartParserError as exc:
+            raise ParseError('Multipart form parse error - %s' % str(exc))
+        return parsers.DataAndFiles(_underscoreize(data), _underscoreize(files))
 
 
 class BrowsableAPIRendererWithoutForms(BrowsableAPIRenderer):
@@ -0,0 +1,24 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from utils.db.routers import use_replica, set_replica_enabled, is_primary_pinned
+
+__all__ = (
+    'ReplicaReadMixin',
+)
+
+
+class ReplicaReadMixin:
+    """
+    안전한 메서드(GET, HEAD, OPTIONS) 요청의 읽기를 replica에서 처리
+    인증은 primary에서 처리하며, 최근에 데이터를 변경한 user의 요청은 primary를 사용
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # 요청이 끝나면(예외 포함) 이전 상태로 복구
+        with use_replica(False):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_primary_pinned(request.user):
+            set_replica_enabled(True)
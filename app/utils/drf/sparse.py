@@ -0,0 +1,180 @@
+from functools import lru_cache
+
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from . import errors
+from .exceptions import ValidationError
+from .renderers import underscoreize_key, get_underscoreize_options
+
+__all__ = (
+    'parse_fields',
+    'get_sparse_serializer_class',
+    'get_expanded_serializer_class',
+    'SparseFieldsMixin',
+)
+
+SPARSE_CLASS_CACHE_SIZE = 256
+
+
+def parse_fields(value):
+    """
+    'pk,study.name,studySchedules' -> (('pk', None), ('study', (('name', None),)), ('study_schedules', None))
+    None은 필드 전체, 같은 필드를 전체와 일부로 함께 지정하면 전체
+    (cache의 key로 사용하도록 정렬된 tuple, 필드 이름은 camelCase도 허용)
+    """
+    no_underscore_before_number = bool(get_underscoreize_options().get('no_underscore_before_number'))
+    tree = {}
+    for path in value.split(','):
+        names = [underscoreize_key(name.strip(), no_underscore_before_number) for name in path.split('.')]
+        if not all(names):
+            continue
+        node = tree
+        for index, name in enumerate(names):
+            if index == len(names) - 1:
+                node[name] = None
+            elif node.get(name, {}) is not None:
+                node = node.setdefault(name, {})
+            else:
+                break
+
+    def freeze(node):
+        return None if node is None else tuple(sorted((name, freeze(child)) for name, child in node.items()))
+
+    return freeze(tree) or None
+
+
+def _get_serializer(field):
+    return field.child if isinstance(field, serializers.ListSerializer) else field
+
+
+def _sparse_field(field, fields):
+    """
+    nested serializer field를 같은 인자의 sparse serializer로 교체
+    """
+    if isinstance(field, serializers.ListSerializer):
+        child = field.child
+        sparse_child = get_sparse_serializer_class(type(child), fields)(*child._args, **child._kwargs)
+        return type(field)(*field._args, **{**field._kwargs, 'child': sparse_child})
+    return get_sparse_serializer_class(type(field), fields)(*field._args, **field._kwargs)
+
+
+@lru_cache(maxsize=SPARSE_CLASS_CACHE_SIZE)
+def get_sparse_serializer_class(serializer_class, fields):
+    """
+    serializer_class에서 fields(parse_fields()의 결과)에 지정된 필드만 표현하는 하위 클래스
+    QueryPlan, ValuesPlan, SerializerPlan은 클래스별로 만들어지므로, 선택된 필드의 관계만 불러오고 표현함
+    """
+    declared = serializer_class().fields
+    for name, child in fields:
+        field = declared.get(name)
+        if field is None or field.write_only:
+            raise ValidationError(errors.FIELDS_INVALID)
+        if child is not None:
+            if not isinstance(_get_serializer(field), serializers.Serializer):
+                raise ValidationError(errors.FIELDS_INVALID)
+            get_sparse_serializer_class(type(_get_serializer(field)), child)
+
+    selected = dict(fields)
+
+    def get_fields(self):
+        ret = super(sparse_class, self).get_fields()
+        for name in list(ret):
+            if name not in selected:
+                # 입력에만 사용되는 필드는 그대로 둠
+                if not ret[name].write_only:
+                    del ret[name]
+            elif selected[name] is not None:
+                ret[name] = _sparse_field(ret[name], selected[name])
+        return ret
+
+    sparse_class = type(serializer_class.__name__, (serializer_class,), {
+        '__module__': serializer_class.__module__,
+        'sparse_fields': fields,
+        'get_fields': get_fields,
+    })
+    return sparse_class
+
+
+def _expanded_field(serializer_class, name, expand):
+    """
+    Meta.expandable_fields의 (Serializer 또는 import 경로, 인자)로 만든 nested serializer field
+    """
+    nested_class, kwargs = serializer_class.Meta.expandable_fields[name]
+    if isinstance(nested_class, str):
+        nested_class = import_string(nested_class)
+    if expand is not None:
+        nested_class = get_expanded_serializer_class(nested_class, expand)
+    return nested_class(**kwargs)
+
+
+@lru_cache(maxsize=SPARSE_CLASS_CACHE_SIZE)
+def get_expanded_serializer_class(serializer_class, expand):
+    """
+    serializer_class에서 expand(parse_fields()의 결과)에 지정된 필드를 nested serializer로 표현하는 하위 클래스
+    확장할 수 있는 필드는 Serializer의 Meta에 지정 (확장하지 않으면 선언된 필드(pk 등)로 표현, 없으면 제외)
+        expandable_fields = {
+            '<field name>': (Serializer 또는 import 경로, Serializer의 인자),
+        }
+    """
+    expandable_fields = getattr(getattr(serializer_class, 'Meta', None), 'expandable_fields', {})
+    for name, child in expand:
+        if name not in expandable_fields:
+            raise ValidationError(errors.EXPAND_INVALID)
+        if child is not None:
+            _expanded_field(serializer_class, name, child)
+
+    def get_fields(self):
+        ret = super(expanded_class, self).get_fields()
+        for name, child in expand:
+            ret[name] = _expanded_field(serializer_class, name, child)
+        return ret
+
+    expanded_class = type(serializer_class.__name__, (serializer_class,), {
+        '__module__': serializer_class.__module__,
+        'expand': expand,
+        'get_fields': get_fields,
+    })
+    return expanded_class
+
+
+class SparseFieldsMixin:
+    """
+    GET 응답에서
+        ?expand=로 지정한 관계를 nested serializer로 표현 (ex: ?expand=study,schedule.study)
+        ?fields=로 지정한 필드만 표현 (ex: ?fields=pk,study.name, expand가 적용된 필드에서 선택)
+    Serializer 대신 get_expanded_serializer_class(), get_sparse_serializer_class()의 하위 클래스를 사용하므로
+    QueryPlanMixin, ValuesPlanMixin, StreamingListMixin도 표현되는 관계만 불러옴 (이 Mixin이 앞에 와야 함)
+    """
+    expand_query_param = 'expand'
+    fields_query_param = 'fields'
+
+    def get_query_fields(self, query_param):
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(query_param)
+        return parse_fields(value) if value else None
+
+    def get_expand(self):
+        return self.get_query_fields(self.expand_query_param)
+
+    def get_sparse_fields(self):
+        return self.get_query_fields(self.fields_query_param)
+
+    def get_representation_serializer_class(self, serializer_class):
+        expand, fields = self.get_expand(), self.get_sparse_fields()
+        if expand is not None:
+            serializer_class = get_expanded_serializer_class(serializer_class, expand)
+        if fields is not None:
+            serializer_class = get_sparse_serializer_class(serializer_class, fields)
+        return serializer_class
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_representation_serializer_class(self.get_serializer_class())
+        kwargs['context'] = self.get_serializer_context()
+        return serializer_class(*args, **kwargs)
+
+    def get_plan_serializer_class(self):
+        return self.get_representation_serializer_class(super().get_plan_serializer_class())
@@ -0,0 +1,87 @@
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
+from drf_yasg import openapi
+from rest_framework.renderers import JSONRenderer
+
+from utils.db.routers import use_replica, is_replica_enabled
+from utils.functions import chunks
+from .values import get_values_plan
+
+__all__ = (
+    'STREAM_PARAMETER',
+    'StreamingListMixin',
+)
+
+STREAM_PARAMETER = openapi.Parameter(
+    'stream', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+    description='true이면 페이지 없이 전체 목록을 JSON 배열로 스트리밍 (필터는 그대로 적용)',
+)
+
+
+class StreamingListMixin:
+    """
+    ListAPIView의 GET 목록을 ?stream=true로 요청하면 페이지 없이 전체 목록을 StreamingHttpResponse로 전송
+    queryset을 stream_chunk_size개씩 (PostgreSQL에서는 서버측 커서로) 불러와 chunk 단위로 표현/렌더링하므로
+    목록의 크기와 관계없이 메모리 사용량이 일정하며, 첫 chunk가 표현되는 즉시 응답을 시작함
+
+    ValuesPlanMixin과 함께 사용하면 chunk마다 ValuesPlan으로, 그 외에는 Serializer로 표현
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def is_streaming(self, request):
+        if request.query_params.get(self.stream_query_param, '').lower() not in ('true', '1'):
+            return False
+        # BrowsableAPIRenderer등 JSON이 아닌 형식은 일반 목록으로 응답
+        return isinstance(request.accepted_renderer, JSONRenderer)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # 페이지를 나눌 때와 같은 순서
+            queryset = queryset.order_by(*self.paginator.get_ordering(request, queryset, self))
+
+        if getattr(self, 'values_plan', False):
+            plan = get_values_plan(self.get_plan_serializer_class())
+            items = plan.get_queryset(queryset).iterator(chunk_size=self.stream_chunk_size)
+
+            def represent(chunk):
+                return plan.render(chunk, request)
+        else:
+            # iterator()는 prefetch_related를 처리하지 않으므로 chunk마다 불러옴
+            lookups = queryset._prefetch_related_lookups
+            items = queryset.iterator(chunk_size=self.stream_chunk_size)
+
+            def represent(chunk):
+                prefetch_related_objects(chunk, *lookups)
+                return self.get_serializer(chunk, many=True).data
+
+        renderer = request.accepted_renderer
+        renderer_context = self.get_renderer_context()
+
+        def render(chunk):
+            # '[...]'에서 배열의 괄호를 제외한 부분
+            return renderer.render(represent(chunk), request.accepted_media_type, renderer_context).strip()[1:-1]
+
+        return StreamingHttpResponse(
+            self.stream(items, render, is_replica_enabled()),
+            content_type=renderer.media_type,
+        )
+
+    def stream(self, items, render, replica):
+        # 응답 본문은 View의 dispatch()가 끝난 후 전송되므로, 요청 처리중의 replica 사용 여부를 유지
+        with use_replica(replica):
+            yield b'['
+            first = True
+            for chunk in chunks(items, self.stream_chunk_size):
+                content = render(chunk)
+                if not content:
+                    continue
+                if not first:
+                    yield b','
+                first = False
+                yield content
+            yield b']'
@@ -0,0 +1,330 @@
+import re
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import FileField
+from django.utils.encoding import force_str
+from phonenumber_field.modelfields import PhoneNumberField
+from phonenumber_field.phonenumber import to_python
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+__all__ = (
+    'ValuesPlan',
+    'get_values_plan',
+    'ValuesPlanMixin',
+)
+
+DISPLAY_SOURCE_RE = re.compile(r'^get_(\w+)_display$')
+# Serializer 클래스별 계획(QueryPlan, ValuesPlan, SerializerPlan)을 보관할 최대 수
+# (?fields=로 만든 Serializer(utils.drf.sparse)도 포함되므로 제한)
+PLAN_CACHE_SIZE = 1024
+
+# entry 종류 (MANY는 SerializerPlan(utils.drf.compiled)에서 사용)
+VALUE, NESTED, RELATED, MANY = 'value', 'nested', 'related', 'many'
+
+
+def _file_converter(field):
+    return lambda value: field.attr_class(None, field, value)
+
+
+def _phone_number_converter(field):
+    return lambda value: to_python(value, region=field.region)
+
+
+# values()로 불러온 DB값을 모델 객체의 속성값과 같은 형태로 변환 (descriptor가 하는 변환)
+ATTRIBUTE_CONVERTERS = (
+    (FileField, _file_converter),
+    (PhoneNumberField, _phone_number_converter),
+)
+
+
+def _get_attribute_converter(model_field):
+    for field_class, converter in ATTRIBUTE_CONVERTERS:
+        if isinstance(model_field, field_class):
+            return converter(model_field)
+    return None
+
+
+def get_display_converter(model_field):
+    choices = dict(model_field.flatchoices)
+    return lambda value: force_str(choices.get(value, value), strings_only=True)
+
+
+def has_custom_representation(serializer_class):
+    """
+    serializer_class의 to_representation()이 ModelSerializer와 다른 결과를 만드는지 여부
+    (같은 결과를 만드는 재정의는 함수에 same_representation = True를 지정)
+    """
+    to_representation = serializer_class.to_representation
+    return not (
+        to_representation is serializers.ModelSerializer.to_representation
+        or getattr(to_representation, 'same_representation', False)
+    )
+
+
+def file_representation(field, converter=None):
+    """
+    serializers.FileField.to_representation과 같은 결과 (request를 사용해 절대 URL을 만듦)
+    같은 파일(ex: 기본 프로필 이미지)은 요청 내에서 한 번만 변환
+    """
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    def bind(request):
+        def representation(value):
+            if not value:
+                return None
+            if not use_url:
+                return value.name
+            try:
+                url = value.url
+            except AttributeError:
+                return None
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        cache = {}
+
+        def cached_representation(value):
+            if value not in cache:
+                cache[value] = representation(converter(value) if converter else value)
+            return cache[value]
+
+        return cached_representation, None
+
+    return bind
+
+
+class _Relation:
+    """
+    행(row)마다 별도의 쿼리로 불러와야 하는 관계 (역방향/many 관계, Meta.values_hooks)
+    """
+
+    def __init__(self, key_index, plan, many, get_queryset):
+        self.key_index = key_index
+        self.plan = plan
+        self.many = many
+        # callable(request) -> (queryset, 부모의 key와 비교할 lookup) or None
+        self.get_queryset = get_queryset
+
+    def load(self, rows, request):
+        """
+        :return: {부모의 key: 표현된 값 목록}
+        """
+        result = defaultdict(list)
+        keys = {row[self.key_index] for row in rows}
+        keys.discard(None)
+        resolved = self.get_queryset(request) if keys else None
+        if resolved is None:
+            return result
+        queryset, link = resolved
+        child_rows = list(
+            queryset.filter(**{f'{link}__in': keys}).prefetch_related(None).values_list(*self.plan.columns, link))
+        for row, item in zip(child_rows, self.plan.render(child_rows, request)):
+            result[row[-1]].append(item)
+        return result
+
+
+class ValuesPlan:
+    """
+    ModelSerializer와 같은 결과를 모델 객체를 만들지 않고 .values_list()의 결과(tuple)로 표현하기 위한 계획
+    정방향 관계(ForeignKey)의 nested serializer는 JOIN으로 같은 행에서, 역방향(many) 관계는 별도의 쿼리 1회로 불러옴
+
+    모델 필드가 아닌 값은 Serializer의 Meta에 지정
+        values_hooks = {
+            '<field name>': callable(request) -> (queryset, 부모의 pk와 비교할 lookup) or None,
+        }
+        representations = {
+            '<field name>': callable(속성값) -> 표현값 (to_representation을 재정의한 경우),
+        }
+    """
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.columns = []
+        self.relations = []
+        self._column_indexes = {}
+        self.entries = self._compile(serializer, self.model, '')
+
+    def column(self, lookup):
+        if lookup not in self._column_indexes:
+            self._column_indexes[lookup] = len(self.columns)
+            self.columns.append(lookup)
+        return self._column_indexes[lookup]
+
+    def _compile(self, serializer, model, prefix):
+        serializer_class = type(serializer)
+        meta = serializer.Meta
+        hooks = getattr(meta, 'values_hooks', {})
+        representations = getattr(meta, 'representations', {})
+        if has_custom_representation(serializer_class) and not representations:
+            raise ImproperlyConfigured(
+                f'{serializer_class.__name__}.to_representation()을 재정의한 경우 Meta.representations가 필요함')
+
+        entries = []
+        for field_name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field_name in hooks:
+                entries.append(self._compile_relation(field_name, field, prefix + 'pk', hooks[field_name]))
+                continue
+            if field.source == '*':
+                raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: source="*"는 사용할 수 없음')
+            entries.append(self._compile_field(
+                serializer_class, field_name, field, model, prefix, representations.get(field_name)))
+        return entries
+
+    def _compile_relation(self, field_name, field, key_lookup, get_queryset):
+        many = isinstance(field, serializers.ListSerializer)
+        child = field.child if many else field
+        if not isinstance(child, serializers.ModelSerializer):
+            raise ImproperlyConfigured(f'{field_name}: ModelSerializer가 아닌 관계는 사용할 수 없음')
+        relation = _Relation(self.column(key_lookup), get_values_plan(type(child)), many, get_queryset)
+        self.relations.append(relation)
+        return RELATED, field_name, relation.key_index, len(self.relations) - 1, many
+
+    def _compile_field(self, serializer_class, field_name, field, model, prefix, representation):
+        lookup = prefix
+        source_attrs = field.source_attrs
+        for index, attr in enumerate(source_attrs):
+            last = index == len(source_attrs) - 1
+            display = DISPLAY_SOURCE_RE.match(attr) if last else None
+            try:
+                if attr == 'pk':
+                    model_field = model._meta.pk
+                else:
+                    model_field = model._meta.get_field(display.group(1) if display else attr)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{field_name}: 모델 필드가 아닌 값은 Meta.values_hooks가 필요함')
+
+            if display:
+                converter = get_display_converter(model_field)
+                return self._value_entry(field_name, field, lookup + model_field.name, converter, representation)
+            if model_field.is_relation and (model_field.one_to_many or model_field.many_to_many):
+                if not last or not isinstance(field, serializers.ListSerializer):
+                    raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: 지원하지 않는 관계')
+                related_model = model_field.related_model
+                link = model_field.field.name
+
+                def get_queryset(request, related_model=related_model, link=link):
+                    return related_model._default_manager.all(), link
+
+                return self._compile_relation(field_name, field, lookup + 'pk', get_queryset)
+            if not last:
+                if not model_field.is_relation:
+                    raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: 지원하지 않는 source')
+                lookup += attr + '__'
+                model = model_field.related_model
+                continue
+
+            if model_field.is_relation and isinstance(field, serializers.BaseSerializer):
+                nested_prefix = lookup + attr + '__'
+                return (
+                    NESTED, field_name, self.column(nested_prefix + 'pk'),
+                    self._compile(field, model_field.related_model, nested_prefix),
+                )
+            if model_field.is_relation:
+                if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None:
+                    raise ImproperlyConfigured(f'{serializer_class.__name__}.{field_name}: 지원하지 않는 관계 필드')
+                return VALUE, field_name, self.column(lookup + attr), lambda request: (None, None)
+            return self._value_entry(
+                field_name, field, lookup + attr, _get_attribute_converter(model_field), representation)
+
+    def _value_entry(self, field_name, field, lookup, converter, representation):
+        """
+        bind(request) -> (DB값을 속성값으로 바꾸는 converter, 속성값의 표현 함수)
+        """
+        if representation is not None:
+            bind = lambda request: (converter, representation)  # noqa: E731
+        elif isinstance(field, serializers.FileField):
+            bind = file_representation(field, converter)
+        else:
+            bind = lambda request: (converter, field.to_representation)  # noqa: E731
+        return VALUE, field_name, self.column(lookup), bind
+
+    def _bind(self, entries, request):
+        bound = []
+        for entry in entries:
+            kind = entry[0]
+            if kind == VALUE:
+                kind, field_name, index, bind = entry
+                bound.append((kind, field_name, index) + bind(request))
+            elif kind == NESTED:
+                kind, field_name, index, child_entries = entry
+                bound.append((kind, field_name, index, self._bind(child_entries, request), None))
+            else:
+                bound.append(entry)
+        return bound
+
+    def get_queryset(self, queryset, *extra_columns):
+        """
+        queryset을 이 계획의 column들을 가진 named values_list로 변환
+        (CursorPagination이 정렬 기준 필드를 속성으로 읽을 수 있도록 extra_columns를 뒤에 추가)
+        """
+        columns = self.columns + [column for column in extra_columns if column not in self._column_indexes]
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def render(self, rows, request=None):
+        related = [relation.load(rows, request) for relation in self.relations]
+        entries = self._bind(self.entries, request)
+        return [self._render_row(entries, row, related) for row in rows]
+
+    def _render_row(self, entries, row, related):
+        ret = OrderedDict()
+        for kind, field_name, index, arg, representation in entries:
+            value = row[index]
+            if kind == VALUE:
+                # arg: DB값을 속성값으로 바꾸는 converter, representation: 속성값의 표현 함수
+                if arg is not None:
+                    value = arg(value)
+                ret[field_name] = None if value is None else (representation(value) if representation else value)
+            elif kind == NESTED:
+                # arg: nested serializer의 entry 목록
+                ret[field_name] = None if value is None else self._render_row(arg, row, related)
+            else:
+                # arg: 관계의 순서, representation: many 여부
+                items = related[arg].get(value, [])
+                if representation:
+                    ret[field_name] = items
+                else:
+                    ret[field_name] = items[0] if items else None
+        return ret
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_values_plan(serializer_class):
+    """
+    serializer_class에 대한 ValuesPlan (프로세스당 1회 생성 후 재사용)
+    """
+    return ValuesPlan(serializer_class())
+
+
+class ValuesPlanMixin:
+    """
+    ListAPIView의 GET 목록을 모델 객체 없이 ValuesPlan으로 표현 (values_plan = False로 사용하지 않음)
+    """
+    values_plan = True
+
+    def get_plan_serializer_class(self):
+        return self.get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_plan:
+            return super().list(request, *args, **kwargs)
+        plan = get_values_plan(self.get_plan_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering_columns = ()
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            ordering_columns = [name.lstrip('-') for name in ordering]
+        queryset = plan.get_queryset(queryset, *ordering_columns)
+
+        page = self.paginate_queryset(queryset)
+        data = plan.render(page if page is not None else list(queryset), request)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
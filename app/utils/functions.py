@@ -1,7 +1,20 @@
 import re
+from itertools import islice
 
 from djangorestframework_camel_case.util import camelize_re, underscore_to_camel
 
 
 def underscore_to_camelcase(value):
     return re.sub(camelize_re, underscore_to_camel, value)
+
+
+def chunks(iterable, size):
+    """
+    iterable을 size개씩 나눈 list들 (전체 목록을 메모리에 만들지 않음)
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,77 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.test import override_settings
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as PackageCamelCaseJSONRenderer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from study.apis import StudyRetrieveUpdateDestroyAPIView
+from study.models import Study, Attendance
+from study.serializers import AttendanceSerializer
+from utils.drf.prefetch import plan_queryset
+from utils.drf.renderers import (
+    camelize,
+    CamelCaseJSONRenderer,
+    CamelCaseORJSONRenderer,
+    ORJSONRenderer,
+    orjson,
+)
+
+RENDERERS = (
+    ('djangorestframework_camel_case', PackageCamelCaseJSONRenderer),
+    ('CamelCaseJSONRenderer', CamelCaseJSONRenderer),
+    ('CamelCaseORJSONRenderer', CamelCaseORJSONRenderer),
+)
+# camelCase 변환을 제외한 JSON 인코딩만의 비교
+ENCODERS = (
+    ('JSONRenderer', JSONRenderer),
+    ('ORJSONRenderer', ORJSONRenderer),
+)
+
+
+class Command(BaseCommand):
+    help = 'Study 상세, Attendance 목록 응답으로 JSON 렌더러들의 속도를 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--study', type=int, help='응답으로 사용할 Study(pk), 없으면 멤버가 가장 많은 Study')
+        parser.add_argument('--attendances', type=int, default=5000, help='Attendance 목록의 길이')
+        parser.add_argument('--repeat', type=int, default=20, help='렌더러별 반복 횟수')
+
+    def handle(self, *args, **options):
+        if options['study']:
+            study = Study.objects.filter(pk=options['study']).first()
+        else:
+            study = Study.objects.annotate(
+                member_count=Count('membership_set', filter=Q(membership_set__is_withdraw=False)),
+            ).order_by('-member_count').first()
+        if study is None:
+            raise CommandError('Study가 없습니다')
+        if orjson is None:
+            self.stdout.write('orjson이 설치되지 않아 CamelCaseORJSONRenderer는 JSONRenderer로 동작합니다')
+
+        # APIRequestFactory의 요청 host(testserver)로 절대 URL을 만들 수 있도록 허용
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            request = APIRequestFactory().get(f'/api/v1/study/{study.pk}/')
+            response = StudyRetrieveUpdateDestroyAPIView.as_view()(request, pk=study.pk)
+            queryset = plan_queryset(Attendance.objects.all(), AttendanceSerializer)[:options['attendances']]
+            attendances = AttendanceSerializer(queryset, many=True, context={'request': request}).data
+
+        for title, data in ((f'Study 상세 ({study.pk})', response.data), ('Attendance 목록', attendances)):
+            self.stdout.write(title)
+            self.benchmark(data, RENDERERS, options['repeat'])
+            self.benchmark(camelize(data), ENCODERS, options['repeat'])
+
+    def benchmark(self, data, renderers, repeat):
+        results = set()
+        for name, renderer_class in renderers:
+            renderer = renderer_class()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                content = renderer.render(data)
+            seconds = (time.perf_counter() - started) / repeat
+            results.add(content)
+            self.stdout.write(f'  {name}: {seconds * 1000:.2f}ms ({len(content)} bytes)')
+        if len(results) != 1:
+            raise CommandError('렌더링 결과가 다릅니다')
@@ -0,0 +1,218 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from members.models import User
+from study.models import (
+    StudyCategory,
+    StudyIcon,
+    Study,
+    StudyMembership,
+    Schedule,
+    Attendance,
+    StudyMembershipStats,
+)
+from utils.functions import chunks
+
+CATEGORY_NAMES = ('개발', '디자인', '기획', '어학', '자격증')
+ICON_NAMES = ('책', '노트북', '연필', '전구', '지구본')
+# (값, 비율), 빈 문자열은 투표하지 않은 경우
+VOTE_WEIGHTS = (
+    (Attendance.VOTE_ATTEND, 70),
+    (Attendance.VOTE_LATE, 10),
+    (Attendance.VOTE_ABSENT, 10),
+    ('', 10),
+)
+# 실제 참석 결과가 사전 투표와 같을 확률
+ATT_MATCH_RATE = 0.8
+
+
+class Command(BaseCommand):
+    help = '부하 재현을 위한 대량의 User/Study/StudyMembership/Schedule/Attendance 데이터 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='생성할 User 수')
+        parser.add_argument('--studies', type=int, default=1000, help='생성할 Study 수')
+        parser.add_argument('--min-members', type=int, default=3, help='Study별 최소 멤버 수')
+        parser.add_argument('--max-members', type=int, default=300, help='Study별 최대 멤버 수')
+        parser.add_argument(
+            '--skew', type=float, default=1.2,
+            help='Study 크기 분포(파레토 분포의 alpha), 작을수록 소수의 큰 Study에 멤버가 몰림')
+        parser.add_argument('--min-schedules', type=int, default=5, help='Study별 최소 Schedule 수')
+        parser.add_argument('--max-schedules', type=int, default=100, help='Study별 최대 Schedule 수')
+        parser.add_argument('--withdraw-rate', type=float, default=0.1, help='탈퇴한 멤버십 비율')
+        parser.add_argument('--deleted-rate', type=float, default=0.02, help='삭제(탈퇴)된 User 비율')
+        parser.add_argument('--batch-size', type=int, default=5000, help='bulk_create 한 번에 저장할 객체 수')
+        parser.add_argument('--password', default='password', help='생성되는 모든 User의 비밀번호')
+        parser.add_argument('--seed', type=int, help='random seed')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.batch_size = options['batch_size']
+        self.random = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        # FK 제약조건 검사를 저장이 끝날 때까지 미룸
+        with connection.constraint_checks_disabled(), transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+            user_pk_list = self.create_users()
+            study_pk_list = self.create_studies(user_pk_list)
+            members_dict = self.create_memberships(user_pk_list, study_pk_list)
+            schedules_dict = self.create_schedules(members_dict)
+            self.create_attendances(members_dict, schedules_dict)
+
+            # bulk_create는 Schedule.save(), Attendance signal을 거치지 않으므로 집계값을 한 번에 다시 계산
+            self.log('Schedule 출석 수 계산', Schedule.objects.refresh_attendance_counts())
+            self.log('스터디멤버십 출석 통계 생성', StudyMembershipStats.objects.rebuild(batch_size=self.batch_size))
+        connection.check_constraints()
+        self.log('완료', f'{time.perf_counter() - started:.1f}초')
+
+    def log(self, title, value):
+        self.stdout.write(f'{title}: {value}')
+
+    def bulk_insert(self, model, objs):
+        """
+        objs를 batch_size씩 나누어 저장 (전체 목록을 메모리에 만들지 않음)
+        """
+        count = 0
+        for chunk in chunks(objs, self.batch_size):
+            model._base_manager.bulk_create(chunk)
+            count += len(chunk)
+        self.log(f'{model._meta.verbose_name} 생성', count)
+
+    def bulk_create(self, model, objs):
+        """
+        bulk_insert후 새로 생성된 pk목록을 리턴
+        (bulk_create가 pk를 돌려주지 않는 DB도 있으므로, 저장 전 최대 pk보다 큰 pk를 조회)
+        """
+        last_pk = model._base_manager.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+        self.bulk_insert(model, objs)
+        return list(model._base_manager.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+
+    def create_users(self):
+        password = make_password(self.options['password'])
+        prefix = f'dataset{int(time.time())}'
+        deleted_rate = self.options['deleted_rate']
+
+        def users():
+            for index in range(self.options['users']):
+                email = f'{prefix}_{index}@example.com'
+                user = User(
+                    username=email, email=email, password=password, type=User.TYPE_EMAIL,
+                    name=f'유저{index}', nickname=f'닉네임{index}',
+                )
+                if self.random.random() < deleted_rate:
+                    user.is_deleted = True
+                    user.deleted_username, user.deleted_email = user.username, user.email
+                    user.username, user.email = f'deleted_{prefix}_{index}', None
+                yield user
+
+        return self.bulk_create(User, users())
+
+    def create_studies(self, user_pk_list):
+        if not StudyCategory.objects.exists():
+            StudyCategory.objects.bulk_create([StudyCategory(name=name) for name in CATEGORY_NAMES])
+        categories = list(StudyCategory.objects.all())
+        if not StudyIcon.objects.exists():
+            StudyIcon.objects.bulk_create([StudyIcon(name=name) for name in ICON_NAMES])
+        icons = list(StudyIcon.objects.all())
+
+        def studies():
+            for index in range(self.options['studies']):
+                yield Study(
+                    category=self.random.choice(categories),
+                    icon=self.random.choice(icons),
+                    author_id=self.random.choice(user_pk_list),
+                    name=f'스터디{index}',
+                )
+
+        return self.bulk_create(Study, studies())
+
+    def get_member_count(self, user_count):
+        """
+        파레토 분포를 사용해, 대부분은 작고 일부만 매우 큰 Study의 멤버 수
+        """
+        min_members, max_members = self.options['min_members'], self.options['max_members']
+        member_count = int(min_members * self.random.paretovariate(self.options['skew']))
+        return max(min_members, min(member_count, max_members, user_count))
+
+    def create_memberships(self, user_pk_list, study_pk_list):
+        """
+        :return: {study_pk: [탈퇴하지 않은 멤버의 user_pk, ...]}
+        """
+        withdraw_rate = self.options['withdraw_rate']
+        members_dict = {}
+
+        def memberships():
+            for study_pk in study_pk_list:
+                member_pk_list = self.random.sample(user_pk_list, self.get_member_count(len(user_pk_list)))
+                members_dict[study_pk] = []
+                for index, user_pk in enumerate(member_pk_list):
+                    is_withdraw = index > 0 and self.random.random() < withdraw_rate
+                    if not is_withdraw:
+                        members_dict[study_pk].append(user_pk)
+                    yield StudyMembership(
+                        user_id=user_pk,
+                        study_id=study_pk,
+                        is_withdraw=is_withdraw,
+                        role=StudyMembership.ROLE_MAIN_MANAGER if index == 0 else StudyMembership.ROLE_NORMAL,
+                    )
+
+        self.bulk_insert(StudyMembership, memberships())
+        return members_dict
+
+    def create_schedules(self, members_dict):
+        """
+        :return: {study_pk: [(schedule_pk, 이미 진행된 일정 여부), ...]}
+        """
+        now = timezone.now()
+        min_schedules, max_schedules = self.options['min_schedules'], self.options['max_schedules']
+        schedule_list = []
+
+        def schedules():
+            for study_pk in members_dict:
+                schedule_count = self.random.randint(min_schedules, max_schedules)
+                # 마지막 몇 개의 일정은 아직 진행되지 않은 일정
+                first_start_at = now - timedelta(weeks=schedule_count - self.random.randint(1, 3))
+                for index in range(schedule_count):
+                    start_at = first_start_at + timedelta(weeks=index)
+                    schedule_list.append((study_pk, start_at < now))
+                    yield Schedule(
+                        study_id=study_pk,
+                        subject=f'{index + 1}주차',
+                        location='강남역',
+                        vote_end_at=start_at - timedelta(days=1),
+                        start_at=start_at,
+                        studying_time=timedelta(hours=2),
+                    )
+
+        schedule_pk_list = self.bulk_create(Schedule, schedules())
+        schedules_dict = {}
+        for schedule_pk, (study_pk, is_past) in zip(schedule_pk_list, schedule_list):
+            schedules_dict.setdefault(study_pk, []).append((schedule_pk, is_past))
+        return schedules_dict
+
+    def create_attendances(self, members_dict, schedules_dict):
+        votes, weights = zip(*VOTE_WEIGHTS)
+        choices = [value for value, display in Attendance.CHOICES_VOTE]
+
+        def attendances():
+            for study_pk, schedule_list in schedules_dict.items():
+                for schedule_pk, is_past in schedule_list:
+                    for user_pk in members_dict[study_pk]:
+                        vote = self.random.choices(votes, weights)[0]
+                        att = ''
+                        if is_past:
+                            att = vote if vote and self.random.random() < ATT_MATCH_RATE \
+                                else self.random.choice(choices)
+                        yield Attendance(user_id=user_pk, schedule_id=schedule_pk, vote=vote, att=att)
+
+        self.bulk_insert(Attendance, attendances())
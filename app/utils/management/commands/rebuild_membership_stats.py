@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from study.models import StudyMembershipStats
+
+
+class Command(BaseCommand):
+    help = 'StudyMembershipStats(스터디멤버십 출석 통계)를 Attendance목록으로부터 다시 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--study', type=int, help='특정 Study(pk)의 멤버십만 다시 생성')
+
+    def handle(self, *args, **options):
+        filters = {}
+        if options['study']:
+            filters['study_id'] = options['study']
+        count = StudyMembershipStats.objects.rebuild(**filters)
+        self.stdout.write(f'{count}개의 스터디멤버십 출석 통계를 생성했습니다')
@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from study.models import Schedule
+
+
+class Command(BaseCommand):
+    help = 'Schedule의 사전 투표/실제 참석 수를 Attendance목록으로부터 다시 계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--study', type=int, help='특정 Study(pk)의 Schedule만 다시 계산')
+
+    def handle(self, *args, **options):
+        filters = {}
+        if options['study']:
+            filters['study_id'] = options['study']
+        count = Schedule.objects.refresh_attendance_counts(**filters)
+        self.stdout.write(f'{count}개의 Schedule 출석 수를 갱신했습니다')
@@ -0,0 +1,669 @@
+import json
+import os
+import threading
+import time
+from datetime import timedelta, datetime, date
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipUnless, mock
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models.signals import post_init
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from djangorestframework_camel_case import util as camel_case_util
+from phonenumber_field.phonenumber import to_python
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from members.authentication import token_local_cache, CachedTokenAuthentication
+from members.models import User
+from members.urls import members_patterns, auth_patterns
+from study.models import (
+    StudyCategory,
+    StudyIcon,
+    Study,
+    StudyMembership,
+    Schedule,
+    Attendance,
+    StudyInviteToken,
+)
+from study.apis import StudyListCreateAPIView, StudyRetrieveUpdateDestroyAPIView
+from study.urls import urlpatterns as study_patterns
+from utils.cache import VersionedCache
+from utils.db.routers import (
+    PrimaryReplicaRouter,
+    use_replica,
+    is_replica_enabled,
+    pin_primary,
+    is_primary_pinned,
+)
+from utils.drf import errors
+from utils.drf.pagination import CursorPagination
+from utils.drf.renderers import (
+    camelize,
+    underscoreize,
+    CamelCaseJSONRenderer,
+    CamelCaseORJSONRenderer,
+    CamelCaseJSONParser,
+    CamelCaseORJSONParser,
+    orjson,
+)
+
+# 각 API별 최대 쿼리 수 (인증/비인증 요청 모두에 적용)
+API_QUERY_BUDGETS = {
+    'GET study/category/': 3,
+    'GET study/icons/': 3,
+    'GET study/': 4,
+    'GET study/token/<str:token>/': 10,
+    'GET study/<int:pk>/': 10,
+    'GET study/memberships/': 8,
+    'GET study/memberships/<int:pk>/': 8,
+    'GET study/memberships/stats/': 3,
+    'GET study/dashboard/': 5,
+    'POST study/memberships/bulk/': 16,
+    'GET study/schedules/': 6,
+    'GET study/schedules/<int:pk>/': 6,
+    'PATCH study/schedules/<int:pk>/attendances/': 18,
+    'GET study/attendances/': 5,
+    'GET study/attendances/<int:pk>/': 5,
+    'POST study/invite-token/': 6,
+    'POST study/memberships/token/': 20,
+    'POST members/': 8,
+    'GET members/<int:pk>/': 2,
+    'GET members/profile/': 2,
+    'POST members/available/': 2,
+    'POST auth/token/': 15,
+}
+# 모든 API에 적용되는 최대 응답시간(초)
+API_SECONDS_BUDGET = 2
+# 저장된 기준값(API_BASELINE_PATH)보다 쿼리 수, 불러온 객체 수, 응답 크기가 이 비율 이상 늘어나면 실패
+API_REGRESSION_RATE = 0.2
+API_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_baseline.json')
+# 값이 있으면 측정 결과를 API_BASELINE_PATH에 저장
+API_BASELINE_UPDATE = bool(os.environ.get('API_BASELINE_UPDATE'))
+# 값(파일 경로)이 있으면 측정 결과를 해당 파일에 저장 (기준값은 변경하지 않음)
+API_BUDGET_REPORT = os.environ.get('API_BUDGET_REPORT')
+
+
+def get_route_keys():
+    """
+    study.urls, members.urls의 모든 URL pattern
+    """
+    route_keys = []
+    for prefix, patterns in (
+            ('study/', study_patterns),
+            ('members/', members_patterns[0]),
+            ('auth/', auth_patterns[0])):
+        for pattern in patterns:
+            if isinstance(pattern, URLPattern):
+                route_keys.append(prefix + str(pattern.pattern))
+    return route_keys
+
+
+class APIBudgetTest(TestCase):
+    """
+    실제와 비슷한 분포의 데이터에서 모든 API를 호출해
+    쿼리 수, 불러온 모델 객체 수, 응답시간, 응답크기를 측정하고 예산/기준값과 비교
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = StudyCategory.objects.create(name='개발')
+        icon = StudyIcon.objects.create(name='python')
+        users = [
+            User.objects.create_user(
+                email=f'user{index}@test.com', password='password', type=User.TYPE_EMAIL,
+                name=f'유저{index}', nickname=f'닉네임{index}', phone_number='010-1234-5678',
+            )
+            for index in range(60)
+        ]
+        users[-1].delete()
+
+        # 멤버 수가 많은 스터디 1개와, 멤버 수가 적은 스터디 여러 개
+        studies = []
+        start_at = timezone.now()
+        for study_index, (member_count, schedule_count) in enumerate([(40, 10)] + [(3, 2)] * 10):
+            study = Study.objects.create(
+                category=category, icon=icon, author=users[0], name=f'스터디{study_index}')
+            studies.append(study)
+            for index, user in enumerate(users[:member_count]):
+                StudyMembership.objects.create(
+                    user=user, study=study, is_withdraw=index % 10 == 9,
+                    role=StudyMembership.ROLE_MAIN_MANAGER if index == 0 else StudyMembership.ROLE_NORMAL,
+                )
+            for index in range(schedule_count):
+                Schedule.objects.create(
+                    study=study, subject=f'일정{index}',
+                    start_at=start_at + timedelta(days=index), studying_time=timedelta(hours=2),
+                )
+        choices = [value for value, display in Attendance.CHOICES_VOTE]
+        for index, attendance in enumerate(Attendance.objects.all()):
+            attendance.vote = choices[index % 3]
+            attendance.att = choices[index % 2]
+            attendance.save()
+
+        cls.user = users[0]
+        cls.study = studies[0]
+        # 인증된 유저(users[0])가 참여하지 않은 스터디
+        cls.other_study = Study.objects.create(category=category, author=users[1], name='다른 스터디')
+        StudyMembership.objects.create(user=users[1], study=cls.other_study)
+        cls.membership = StudyMembership.objects.filter(study=cls.study).last()
+        cls.schedule = Schedule.objects.filter(study=cls.study).last()
+        cls.attendance = Attendance.objects.filter(schedule=cls.schedule).last()
+        cls.invite_token = StudyInviteToken.objects.create(study=cls.study)
+        cls.other_invite_token = StudyInviteToken.objects.create(study=cls.other_study)
+        cls.token = Token.objects.create(user=cls.user)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = {}
+        try:
+            with open(API_BASELINE_PATH) as f:
+                cls.baseline = json.load(f)
+        except FileNotFoundError:
+            cls.baseline = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if API_BASELINE_UPDATE:
+            with open(API_BASELINE_PATH, 'wt') as f:
+                json.dump(cls.results, f, indent=2, sort_keys=True)
+        if API_BUDGET_REPORT:
+            with open(API_BUDGET_REPORT, 'wt') as f:
+                json.dump(cls.results, f, indent=2, sort_keys=True)
+        super().tearDownClass()
+
+    def get_requests(self):
+        """
+        {'<method> <route>': (path, data)}
+        """
+        user = User.objects.exclude(pk=self.user.pk).last()
+        return {
+            'GET study/category/': ('/api/v1/study/category/', None),
+            'GET study/icons/': ('/api/v1/study/icons/', None),
+            'GET study/': ('/api/v1/study/', None),
+            'GET study/token/<str:token>/': (f'/api/v1/study/token/{self.invite_token.key}/', None),
+            'GET study/<int:pk>/': (f'/api/v1/study/{self.study.pk}/', None),
+            'GET study/memberships/': (f'/api/v1/study/memberships/?study={self.study.pk}', None),
+            'GET study/memberships/<int:pk>/': (f'/api/v1/study/memberships/{self.membership.pk}/', None),
+            'GET study/memberships/stats/': (f'/api/v1/study/memberships/stats/?study={self.study.pk}', None),
+            'GET study/dashboard/': ('/api/v1/study/dashboard/', None),
+            'POST study/memberships/bulk/': ('/api/v1/study/memberships/bulk/', {
+                'study': self.other_study.pk,
+                'user_identifiers': list(User.objects.values_list('email', flat=True)[:30]),
+            }),
+            'GET study/schedules/': (f'/api/v1/study/schedules/?study={self.study.pk}', None),
+            'GET study/schedules/<int:pk>/': (f'/api/v1/study/schedules/{self.schedule.pk}/', None),
+            'PATCH study/schedules/<int:pk>/attendances/': (
+                f'/api/v1/study/schedules/{self.schedule.pk}/attendances/',
+                {'attendances': [
+                    {'pk': pk, 'att': Attendance.VOTE_LATE, 'vote': Attendance.VOTE_LATE}
+                    for pk in self.schedule.attendance_set.values_list('pk', flat=True)
+                ]},
+            ),
+            'GET study/attendances/': (f'/api/v1/study/attendances/?schedule={self.schedule.pk}', None),
+            'GET study/attendances/<int:pk>/': (f'/api/v1/study/attendances/{self.attendance.pk}/', None),
+            'POST study/invite-token/': ('/api/v1/study/invite-token/', {'study': self.study.pk}),
+            'POST study/memberships/token/': (
+                '/api/v1/study/memberships/token/', {'key': self.other_invite_token.key}),
+            'POST members/': ('/api/v1/members/', {
+                'email': 'new@test.com', 'password1': 'password', 'password2': 'password',
+                'type': User.TYPE_EMAIL,
+            }),
+            'GET members/<int:pk>/': (f'/api/v1/members/{user.pk}/', None),
+            'GET members/profile/': ('/api/v1/members/profile/', None),
+            'POST members/available/': (
+                '/api/v1/members/available/', {'attributeName': 'nickname', 'value': '닉네임1'}),
+            'POST auth/token/': ('/api/v1/auth/token/', {'username': user.username, 'password': 'password'}),
+        }
+
+    def measure(self, method, path, data, authenticated):
+        # cache(Study 상세, Token인증 등)되지 않은 경우를 측정
+        cache.clear()
+        token_local_cache.clear()
+        client = APIClient()
+        if authenticated:
+            client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        instances = []
+
+        def count_instance(sender, instance, **kwargs):
+            instances.append(sender)
+
+        post_init.connect(count_instance)
+        try:
+            with transaction.atomic(), CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = getattr(client, method.lower())(path, data, format='json')
+                seconds = time.perf_counter() - started
+                transaction.set_rollback(True)
+        finally:
+            post_init.disconnect(count_instance)
+
+        self.assertLess(response.status_code, 500, response.content)
+        return {
+            'queries': len(context),
+            'instances': len(instances),
+            'seconds': round(seconds, 4),
+            'bytes': len(response.content),
+        }
+
+    def test_all_routes_have_budget(self):
+        budget_routes = {key.split(' ', 1)[1] for key in API_QUERY_BUDGETS}
+        self.assertEqual(set(get_route_keys()), budget_routes)
+
+    def test_budgets(self):
+        for key, (path, data) in self.get_requests().items():
+            method = key.split(' ', 1)[0]
+            for authenticated in (False, True):
+                result_key = f'{key} ({"authenticated" if authenticated else "anonymous"})'
+                with self.subTest(result_key):
+                    result = self.measure(method, path, data, authenticated)
+                    self.results[result_key] = result
+
+                    self.assertLessEqual(result['queries'], API_QUERY_BUDGETS[key], result)
+                    self.assertLessEqual(result['seconds'], API_SECONDS_BUDGET, result)
+                    if API_BASELINE_UPDATE or result_key not in self.baseline:
+                        continue
+                    for name in ('queries', 'instances', 'bytes'):
+                        limit = self.baseline[result_key][name] * (1 + API_REGRESSION_RATE)
+                        self.assertLessEqual(result[name], limit, f'{name}: {result} (baseline: {limit})')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        cache.clear()
+
+    def test_read_from_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Study), 'default')
+
+    def test_read_from_replica(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Study), 'replica')
+            self.assertEqual(self.router.db_for_write(Study), 'default')
+            with use_replica(False):
+                self.assertEqual(self.router.db_for_read(Study), 'default')
+            self.assertTrue(is_replica_enabled())
+        self.assertFalse(is_replica_enabled())
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_read_from_primary_without_replicas(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Study), 'default')
+
+    def test_pin_primary(self):
+        user = User(pk=1)
+        self.assertFalse(is_primary_pinned(user))
+        pin_primary(user)
+        self.assertTrue(is_primary_pinned(user))
+        self.assertFalse(is_primary_pinned(User(pk=2)))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'DATABASES에 replica가 없음')
+class ReplicaReadTest(TransactionTestCase):
+    """
+    replica가 primary와 같은 DB를 가리키는 경우(TEST MIRROR)에만 실행
+    (replica는 primary의 트랜잭션 내용을 볼 수 없으므로 TransactionTestCase 사용)
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.category = StudyCategory.objects.create(name='개발')
+        self.users = [
+            User.objects.create_user(
+                email=f'user{index}@test.com', password='password', type=User.TYPE_EMAIL,
+                name=f'유저{index}', nickname=f'닉네임{index}',
+            )
+            for index in range(2)
+        ]
+        self.clients = []
+        for user in self.users:
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+            self.clients.append(client)
+
+    def count_queries(self, method, path, data=None, client=None):
+        """
+        :return: (response, replica에서 실행된 쿼리 수)
+        """
+        client = client or APIClient()
+        with CaptureQueriesContext(connections[settings.DATABASE_REPLICAS[0]]) as context:
+            response = getattr(client, method)(path, data, format='json')
+        self.assertFalse(is_replica_enabled())
+        return response, len(context)
+
+    def test_safe_method_reads_from_replica(self):
+        response, replica_queries = self.count_queries('get', '/api/v1/study/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica_queries, 0)
+
+    def test_write_uses_primary(self):
+        response, replica_queries = self.count_queries(
+            'post', '/api/v1/study/', {'category': self.category.pk, 'name': '스터디'}, self.clients[0])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(replica_queries, 0)
+
+    def test_read_after_write_sticks_to_primary(self):
+        self.count_queries('post', '/api/v1/study/', {'category': self.category.pk, 'name': '스터디'}, self.clients[0])
+
+        # 데이터를 변경한 user는 primary, 다른 user는 replica
+        response, replica_queries = self.count_queries('get', '/api/v1/study/', client=self.clients[0])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(replica_queries, 0)
+        response, replica_queries = self.count_queries('get', '/api/v1/study/', client=self.clients[1])
+        self.assertGreater(replica_queries, 0)
+
+        # 고정 시간이 지나면 다시 replica
+        cache.clear()
+        response, replica_queries = self.count_queries('get', '/api/v1/study/', client=self.clients[0])
+        self.assertGreater(replica_queries, 0)
+
+
+class CamelCaseTest(SimpleTestCase):
+    data = {
+        'study_membership': [
+            {'user_id': 1, 'img_profile': None, 'address_1': 'a', 'vote_display': gettext_lazy('참석')},
+            ('attend_count', {'late_count': 2}),
+        ],
+        gettext_lazy('is_withdraw'): True,
+        1: 'int key',
+    }
+
+    def test_camelize(self):
+        self.assertEqual(camelize(self.data), camel_case_util.camelize(self.data))
+
+    def test_underscoreize(self):
+        data = camel_case_util.camelize(self.data)
+        data.pop('isWithdraw')
+        for options in ({}, {'no_underscore_before_number': True}):
+            with self.subTest(options):
+                self.assertEqual(
+                    underscoreize(data, **options), camel_case_util.underscoreize(data, **options))
+
+    def test_underscoreize_query_dict(self):
+        data = QueryDict('userId=1&userId=2&value1A=3')
+        self.assertEqual(underscoreize(data), camel_case_util.underscoreize(data))
+
+    def test_parser_uses_settings_option(self):
+        parser = CamelCaseJSONParser()
+        for no_underscore_before_number, expected in ((True, 'value1_a'), (False, 'value_1a')):
+            rest_framework = dict(settings.REST_FRAMEWORK, JSON_UNDERSCOREIZE={
+                'no_underscore_before_number': no_underscore_before_number,
+            })
+            with self.subTest(no_underscore_before_number), override_settings(REST_FRAMEWORK=rest_framework):
+                self.assertEqual(parser.parse(BytesIO(b'{"value1A": 1}')), {expected: 1})
+
+
+@skipUnless(orjson, 'orjson이 설치되지 않음')
+class ORJSONRendererTest(SimpleTestCase):
+    def get_data(self):
+        now = timezone.now()
+        return {
+            'created': now,
+            'local_created': timezone.localtime(now),
+            'naive': datetime(2019, 12, 1, 19, 30),
+            'date': date(2019, 12, 1),
+            'studying_time': timedelta(hours=2, minutes=30),
+            'price': Decimal('1.50'),
+            'uuid': uuid4(),
+            'phone_number': to_python('010-1234-5678', region='KR'),
+            'lazy': gettext_lazy('참석'),
+            'separator': 'line\u2028paragraph\u2029',
+            'nested': [{'user_id': 1, 'is_withdraw': False}, ('tuple', None, 1.5)],
+            1: 'int key',
+        }
+
+    def test_render(self):
+        data = self.get_data()
+        for accepted_media_type in (None, 'application/json; indent=2', 'application/json; indent=4'):
+            with self.subTest(accepted_media_type):
+                self.assertEqual(
+                    CamelCaseORJSONRenderer().render(data, accepted_media_type),
+                    CamelCaseJSONRenderer().render(data, accepted_media_type),
+                )
+
+    def test_render_without_orjson(self):
+        data = self.get_data()
+        with mock.patch('utils.drf.renderers.orjson', None):
+            content = CamelCaseORJSONRenderer().render(data)
+        self.assertEqual(content, CamelCaseJSONRenderer().render(data))
+
+    def test_parse(self):
+        content = json.dumps({'userId': 1, 'scheduleSet': [{'voteEndAt': '2019-12-01'}], 'name': '스터디'}).encode()
+        expected = CamelCaseJSONParser().parse(BytesIO(content))
+        self.assertEqual(CamelCaseORJSONParser().parse(BytesIO(content)), expected)
+        with mock.patch('utils.drf.renderers.orjson', None):
+            self.assertEqual(CamelCaseORJSONParser().parse(BytesIO(content)), expected)
+
+
+class VersionedCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.versioned_cache = VersionedCache('test', timeout=60, lock_timeout=0.5, poll_interval=0.01)
+        self.computed = []
+
+    def compute(self, value='value'):
+        def compute():
+            self.computed.append(value)
+            return value
+        return compute
+
+    def get_data_key(self, key, variant):
+        return f'test:{key}:{self.versioned_cache.get_version(key)}:{variant}'
+
+    def test_get_or_set(self):
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute()), 'value')
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute()), 'value')
+        self.versioned_cache.get_or_set(1, 'user:1', self.compute())
+        self.versioned_cache.get_or_set(2, 'public', self.compute())
+        self.assertEqual(len(self.computed), 3)
+
+    def test_invalidate(self):
+        self.versioned_cache.get_or_set(1, 'public', self.compute())
+        self.versioned_cache.get_or_set(2, 'public', self.compute())
+        self.versioned_cache.invalidate(1)
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute('new')), 'new')
+        self.assertEqual(self.versioned_cache.get_or_set(2, 'public', self.compute('new')), 'value')
+
+    def test_disabled(self):
+        self.versioned_cache.timeout = lambda: 0
+        self.versioned_cache.get_or_set(1, 'public', self.compute())
+        self.versioned_cache.get_or_set(1, 'public', self.compute())
+        self.assertEqual(len(self.computed), 2)
+
+    def test_stale_while_locked(self):
+        # 다른 요청이 다시 계산하는 동안에는 만료된 값을 사용
+        data_key = self.get_data_key(1, 'public')
+        cache.set(data_key, ('stale', time.time() - 1))
+        cache.add(f'{data_key}:lock', True)
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute()), 'stale')
+        self.assertEqual(self.computed, [])
+
+        cache.delete(f'{data_key}:lock')
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute()), 'value')
+        self.assertIsNone(cache.get(f'{data_key}:lock'))
+
+    def test_wait_while_locked(self):
+        # 값이 없으면 lock을 얻은 요청이 저장할 때까지 대기
+        data_key = self.get_data_key(1, 'public')
+        cache.add(f'{data_key}:lock', True)
+        timer = threading.Timer(0.05, cache.set, (data_key, ('computed', time.time() + 60)))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'public', self.compute()), 'computed')
+        self.assertEqual(self.computed, [])
+
+        # lock_timeout이 지나도록 저장되지 않으면 직접 계산하며, 다른 요청의 lock은 삭제하지 않음
+        data_key = self.get_data_key(1, 'user:1')
+        cache.add(f'{data_key}:lock', True)
+        self.assertEqual(self.versioned_cache.get_or_set(1, 'user:1', self.compute()), 'value')
+        self.assertEqual(self.computed, ['value'])
+        self.assertTrue(cache.get(f'{data_key}:lock'))
+
+
+class CursorPaginationTest(TestCase):
+    path = '/api/v1/study/'
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email='user@test.com', password='password', type=User.TYPE_EMAIL, name='유저')
+        category = StudyCategory.objects.create(name='개발')
+        # pagination_ordering(name)에 같은 값이 여러 번 포함되도록 지정
+        Study.objects.bulk_create([
+            Study(category=category, author=user, name=f'스터디{index % 4}') for index in range(11)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def walk(self, path):
+        """
+        next 커서를 따라간 후 previous 커서로 되돌아오며 각 방향의 pk목록을 리턴
+        """
+        forward, backward, pages = [], [], []
+        while path:
+            data = self.client.get(path).json()
+            forward += [item['pk'] for item in data['results']]
+            pages.append(data)
+            path = data['next']
+        path = pages[-1]['previous']
+        while path:
+            data = self.client.get(path).json()
+            backward = [item['pk'] for item in data['results']] + backward
+            path = data['previous']
+        return forward, backward, len(pages)
+
+    def test_cursor(self):
+        # Meta.ordering(-pk)을 기준으로 중복, 누락 없이 모든 항목을 순서대로 리턴
+        expected = list(Study.objects.order_by('-pk').values_list('pk', flat=True))
+        forward, backward, page_count = self.walk(f'{self.path}?page_size=3')
+        self.assertEqual(forward, expected)
+        self.assertEqual(backward, expected[:-(len(expected) % 3)])
+        self.assertEqual(page_count, 4)
+
+    def test_pagination_ordering(self):
+        expected = list(Study.objects.order_by('name', 'pk').values_list('pk', flat=True))
+        with mock.patch.object(StudyListCreateAPIView, 'pagination_ordering', ('name', 'pk'), create=True):
+            forward, backward, page_count = self.walk(f'{self.path}?page_size=3')
+        self.assertEqual(forward, expected)
+        self.assertEqual(backward, expected[:-(len(expected) % 3)])
+
+    def test_max_page_size(self):
+        self.assertEqual(len(self.client.get(f'{self.path}?page_size=5').json()['results']), 5)
+        with mock.patch.object(CursorPagination, 'max_page_size', 4):
+            self.assertEqual(len(self.client.get(f'{self.path}?page_size=5').json()['results']), 4)
+        # View별 max_page_size
+        with mock.patch.object(StudyListCreateAPIView, 'max_page_size', 2, create=True):
+            self.assertEqual(len(self.client.get(f'{self.path}?page_size=5').json()['results']), 2)
+        with mock.patch.object(CursorPagination, 'page_size', 3):
+            self.assertEqual(len(self.client.get(self.path).json()['results']), 3)
+
+
+class BatchAPITest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='user@test.com', password='password', type=User.TYPE_EMAIL, name='유저', nickname='닉네임')
+        cls.category = StudyCategory.objects.create(name='개발')
+        cls.study = Study.objects.create(category=cls.category, author=cls.user, name='스터디')
+        StudyMembership.objects.create(
+            user=cls.user, study=cls.study, role=StudyMembership.ROLE_MAIN_MANAGER)
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        token_local_cache.clear()
+        CachedTokenAuthentication.stats.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def batch(self, *requests):
+        response = self.client.post('/api/v1/batch/', {'requests': list(requests)}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['responses']
+
+    def test_same_as_individual_requests(self):
+        paths = (f'/api/v1/study/{self.study.pk}/', '/api/v1/members/profile/', '/api/v1/study/memberships/')
+        responses = self.batch(*[{'method': 'GET', 'path': path} for path in paths])
+        # 인증은 batch 요청에서 한 번만 처리
+        self.assertEqual(sum(CachedTokenAuthentication.stats.values()), 1)
+        for path, item in zip(paths, responses):
+            self.assertEqual(item['status'], 200)
+            self.assertEqual(item['body'], self.client.get(path).json())
+
+    def test_stream(self):
+        responses = self.batch({'method': 'GET', 'path': '/api/v1/study/memberships/?stream=true'})
+        response = self.client.get('/api/v1/study/memberships/?stream=true')
+        self.assertEqual(responses[0]['body'], json.loads(b''.join(response.streaming_content)))
+
+    def test_conditional(self):
+        responses = self.batch({'method': 'GET', 'path': f'/api/v1/study/{self.study.pk}/'})
+        etag = responses[0]['headers']['ETag']
+        responses = self.batch({'method': 'GET', 'path': f'/api/v1/study/{self.study.pk}/', 'ifNoneMatch': etag})
+        self.assertEqual(responses[0]['status'], 304)
+        self.assertIsNone(responses[0]['body'])
+
+    def test_write(self):
+        responses = self.batch(
+            {'method': 'PATCH', 'path': f'/api/v1/study/{self.study.pk}/', 'body': {'name': '변경'}},
+            {'method': 'GET', 'path': f'/api/v1/study/{self.study.pk}/'},
+        )
+        self.assertEqual([item['status'] for item in responses], [200, 200])
+        self.assertEqual(responses[1]['body']['name'], '변경')
+
+    def test_error(self):
+        # 예외가 발생한 하위 요청만 rollback하고 500으로 응답하며, 앞뒤의 하위 요청은 그대로 처리
+        perform_update = StudyRetrieveUpdateDestroyAPIView.perform_update
+
+        def failing_perform_update(view, serializer):
+            perform_update(view, serializer)
+            if serializer.instance.name == '실패':
+                raise IntegrityError
+
+        path = f'/api/v1/study/{self.study.pk}/'
+        with mock.patch.object(StudyRetrieveUpdateDestroyAPIView, 'perform_update', failing_perform_update), \
+                self.assertLogs('utils.drf.batch', 'ERROR'):
+            responses = self.batch(
+                {'method': 'PATCH', 'path': path, 'body': {'name': '변경'}},
+                {'method': 'PATCH', 'path': path, 'body': {'name': '실패'}},
+                {'method': 'GET', 'path': path},
+            )
+        self.assertEqual([item['status'] for item in responses], [200, 500, 200])
+        self.assertEqual(responses[1]['body']['code'], errors.BATCH_REQUEST_FAILED.code)
+        self.assertEqual(responses[2]['body']['name'], '변경')
+        self.study.refresh_from_db()
+        self.assertEqual(self.study.name, '변경')
+
+    def test_anonymous(self):
+        self.client.credentials()
+        responses = self.batch(
+            {'method': 'GET', 'path': '/api/v1/members/profile/'},
+            {'method': 'GET', 'path': '/api/v1/study/category/'},
+        )
+        self.assertEqual([item['status'] for item in responses], [401, 200])
+
+    def test_not_found(self):
+        responses = self.batch(
+            {'method': 'GET', 'path': '/api/v1/unknown/'},
+            {'method': 'POST', 'path': '/api/v1/batch/', 'body': {'requests': []}},
+        )
+        self.assertEqual([item['status'] for item in responses], [404, 404])
+
+    def test_invalid(self):
+        for requests in ([], [{'method': 'GET', 'path': '/admin/'}], [{'method': 'GET', 'path': '/api/v1/'}] * 21):
+            with self.subTest(requests=requests[:1]):
+                response = self.client.post('/api/v1/batch/', {'requests': requests}, format='json')
+                self.assertEqual(response.status_code, 400)